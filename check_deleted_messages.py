@@ -39,7 +39,8 @@ async def check_messages():
     # Build DSN and load signals from database
     db_dsn = build_database_dsn()
     signal_db = SignalDatabase(db_dsn)
-    await signal_db.connect()
+    if not await signal_db.connect():
+        raise RuntimeError("Could not connect to or migrate the signal database")
     
     try:
         # Get recent signals
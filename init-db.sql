@@ -18,6 +18,22 @@ CREATE TABLE IF NOT EXISTS raw_telegram_messages (
     is_parsed BOOLEAN DEFAULT FALSE,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     ingested_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    -- Derived message type so queries can use an index instead of LIKE scans
+    message_kind TEXT GENERATED ALWAYS AS (
+        CASE WHEN raw_text LIKE '%APE SIGNAL DETECTED%' THEN 'signal'
+             WHEN raw_text ILIKE '%profit alert%' THEN 'profit_alert' END
+    ) STORED,
+    -- Parsed message fields, written on insert by the bot (NULL otherwise)
+    parsed_token_symbol TEXT,
+    parsed_token_address TEXT,
+    parsed_initial_fdv DOUBLE PRECISION,
+    parsed_current_fdv DOUBLE PRECISION,
+    parsed_multiplier DOUBLE PRECISION,
+    -- NULL unless reply_to_msg_id is a plain integer, so odd values can't fail inserts
+    parsed_reply_to BIGINT GENERATED ALWAYS AS (
+        CASE WHEN raw_json->>'reply_to_msg_id' ~ '^[0-9]{1,18}$'
+             THEN (raw_json->>'reply_to_msg_id')::bigint END
+    ) STORED,
     
     -- Unique constraint to prevent duplicates
     UNIQUE(telegram_message_id, telegram_chat_id)
@@ -30,6 +46,12 @@ CREATE INDEX IF NOT EXISTS idx_raw_telegram_chat_id
     ON raw_telegram_messages(telegram_chat_id);
 CREATE INDEX IF NOT EXISTS idx_raw_telegram_source_bot 
     ON raw_telegram_messages(source_bot);
+CREATE INDEX IF NOT EXISTS idx_raw_telegram_kind
+    ON raw_telegram_messages(chat_title, message_kind, message_timestamp DESC);
+-- Profit alerts are joined to signals on the reply_to_msg_id in raw_json
+CREATE INDEX IF NOT EXISTS idx_raw_telegram_alert_reply_to
+    ON raw_telegram_messages(chat_title, parsed_reply_to)
+    WHERE message_kind = 'profit_alert';
 
 -- ==============================================================================
 -- Channel State Table - Tracks sync cursors per channel
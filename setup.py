@@ -0,0 +1,27 @@
+"""
+Optional ahead-of-time compilation of the message-parsing hot path.
+
+Project metadata lives in pyproject.toml; this shim only exists so the
+signal parsers can be compiled with mypyc. Compilation is opt-in:
+
+    pip install "mypy>=1.8.0"
+    SOLANA_BOT_MYPYC=1 pip install --no-build-isolation -e .
+
+Without the environment variable the package installs as pure Python.
+"""
+
+import os
+
+from setuptools import setup
+
+# Modules on the per-message parsing path. Both are compiled together so that
+# calls from MessageParser into the concrete parsers and models stay native.
+MYPYC_MODULES = ["src/parsers.py", "src/models.py"]
+
+ext_modules = []
+if os.environ.get("SOLANA_BOT_MYPYC") == "1":
+    from mypyc.build import mypycify
+
+    ext_modules = mypycify(MYPYC_MODULES, opt_level="3")
+
+setup(ext_modules=ext_modules)
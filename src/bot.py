@@ -632,11 +632,7 @@ class TradingBot:
 
                 # Update risk manager with new position
                 if self._risk_manager:
-                    open_positions = [
-                        p for p in self._state.positions.values()
-                        if p.is_open or p.is_partially_sold
-                    ]
-                    self._risk_manager.update_positions(open_positions)
+                    self._risk_manager.on_position_opened(position)
 
             except (DuplicatePositionError, MaxPositionsReachedError) as e:
                 logger.warning(f"Could not add position: {e}")
@@ -832,12 +828,9 @@ class TradingBot:
                             "🛑 Circuit breaker activated! Trading halted."
                         )
 
-                # Update positions tracking
-                open_positions = [
-                    p for p in self._state.positions.values()
-                    if p.is_open or p.is_partially_sold
-                ]
-                self._risk_manager.update_positions(open_positions)
+                # Update positions tracking (partial sells keep full exposure)
+                if position.is_closed:
+                    self._risk_manager.on_position_closed(position)
     
     def get_status(self) -> dict[str, Any]:
         """
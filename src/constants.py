@@ -37,15 +37,19 @@ PROFIT_ALERT_INDICATORS: Final[tuple[str, ...]] = (
 # Regex Patterns
 # ==============================================================================
 
+# Patterns are searched across whole Telegram messages, so each one is kept
+# free of overlapping repetitions to keep matching linear in message length.
+
 # Token symbol extraction pattern (matches: "Token: - $SYMBOL" or "Token: $SYMBOL")
-TOKEN_SYMBOL_PATTERN: Final[str] = r'Token:\s*-?\s*\$(\w+)'
+TOKEN_SYMBOL_PATTERN: Final[str] = r'Token:\s*(?:-\s*)?\$(\w+)'
 
 # Solana address extraction pattern (base58, 32-44 chars)
 # Matches addresses preceded by backticks or tree characters
-TOKEN_ADDRESS_PATTERN: Final[str] = r'[`├└]\s*([1-9A-HJ-NP-Za-km-z]{32,44})'
+TOKEN_ADDRESS_PATTERN: Final[str] = r'[`├└]\s*([1-9A-HJ-NP-Za-km-z]{32,44})\b'
 
 # Multiplier extraction pattern (matches: "2.5X", "**3X**", etc.)
-MULTIPLIER_PATTERN: Final[str] = r'\*?\*?([\d.]+)\s*X\*?\*?'
+# The lookbehind only lets a match start at the beginning of a number.
+MULTIPLIER_PATTERN: Final[str] = r'(?<![\d.])([\d.]+)\s*X'
 
 # ==============================================================================
 # File Paths
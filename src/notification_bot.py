@@ -482,7 +482,10 @@ class NotificationBot:
                     f"{counts.get('total_profit_alerts', 0)} alerts"
                 )
             else:
-                logger.warning("Signal database connection failed, using local tracking only")
+                logger.error(
+                    "Signal database unavailable (connection or schema migration failed), "
+                    "using local tracking only"
+                )
         
         # Resolve notification channel
         if self._notification_channel:
@@ -2177,6 +2180,9 @@ class NotificationBot:
         period_str = f"{days}d" if days else "all"
         filename = f"compare_{period_str}_{timestamp}.json"
         
+        # One reference time for every token's age
+        now_utc = datetime.now(timezone.utc)
+        
         # Build JSON structure optimized for AI analysis
         json_data = {
             "metadata": {
@@ -2207,7 +2213,7 @@ class NotificationBot:
                     "symbol": r.signal.token_symbol,
                     "address": r.signal.token_address,
                     "signal_timestamp": r.signal.timestamp.isoformat(),
-                    "age_hours": round(r.signal.age_hours, 1),
+                    "age_hours": round(r.signal.age_hours_from(now_utc), 1),
                     "initial_fdv": r.signal.initial_fdv,
                     "signal": {
                         "has_profit_alert": r.has_profit_alert,
@@ -2700,8 +2706,9 @@ class NotificationBot:
             # Process messages in chronological order (oldest first)
             messages_to_process.reverse()
             
-            new_signals = 0
-            new_alerts = 0
+            # Collect rows and write them in bulk after the scan
+            signals_batch = []
+            alerts_batch = []
             
             for message in messages_to_process:
                 text = message.text
@@ -2709,22 +2716,8 @@ class NotificationBot:
                 
                 # Check if it's a signal
                 if SIGNAL_PATTERN.search(text):
-                    symbol_match = TOKEN_PATTERN.search(text)
-                    address_match = ADDRESS_PATTERN.search(text)
-                    
-                    if symbol_match and address_match:
-                        symbol = symbol_match.group(1)
-                        address = address_match.group(0)
-                        
-                        inserted = await self._signal_db.insert_signal(
-                            message_id=message.id,
-                            token_symbol=symbol,
-                            token_address=address,
-                            signal_time=msg_time,
-                            raw_text=text,
-                        )
-                        if inserted:
-                            new_signals += 1
+                    if TOKEN_PATTERN.search(text) and ADDRESS_PATTERN.search(text):
+                        signals_batch.append((message.id, msg_time, text))
                 
                 # Check if it's a profit alert
                 elif PROFIT_ALERT_PATTERN.search(text) and message.reply_to:
@@ -2734,15 +2727,18 @@ class NotificationBot:
                     if mult_match and reply_to_id:
                         multiplier = float(mult_match.group(1))
                         
-                        inserted = await self._signal_db.insert_profit_alert(
-                            message_id=message.id,
-                            reply_to_msg_id=reply_to_id,
-                            multiplier=multiplier,
-                            alert_time=msg_time,
-                            raw_text=text,
-                        )
-                        if inserted:
-                            new_alerts += 1
+                        alerts_batch.append((message.id, reply_to_id, multiplier, msg_time, text))
+            
+            new_signals = await self._signal_db.insert_signals_bulk(signals_batch)
+            new_alerts = await self._signal_db.insert_profit_alerts_bulk(alerts_batch)
+            if new_signals is None or new_alerts is None:
+                # Leave the cursor alone so the next sync retries these messages
+                await self._send_to_admin(
+                    "❌ *Sync failed*\n\n"
+                    "Could not store the fetched messages. The cursor was not moved, "
+                    "so the next sync will retry them."
+                )
+                return
             
             # Update cursor AFTER successful processing
             await self._signal_db.update_channel_cursor(
@@ -2863,8 +2859,9 @@ class NotificationBot:
             # Process messages in chronological order (oldest first)
             messages_to_process.reverse()
             
-            new_signals = 0
-            new_alerts = 0
+            # Collect rows and write them in bulk after the scan
+            signals_batch = []
+            alerts_batch = []
             
             for message in messages_to_process:
                 text = message.text
@@ -2872,22 +2869,8 @@ class NotificationBot:
                 
                 # Check if it's a signal
                 if SIGNAL_PATTERN.search(text):
-                    symbol_match = TOKEN_PATTERN.search(text)
-                    address_match = ADDRESS_PATTERN.search(text)
-                    
-                    if symbol_match and address_match:
-                        symbol = symbol_match.group(1)
-                        address = address_match.group(0)
-                        
-                        inserted = await self._signal_db.insert_signal(
-                            message_id=message.id,
-                            token_symbol=symbol,
-                            token_address=address,
-                            signal_time=msg_time,
-                            raw_text=text,
-                        )
-                        if inserted:
-                            new_signals += 1
+                    if TOKEN_PATTERN.search(text) and ADDRESS_PATTERN.search(text):
+                        signals_batch.append((message.id, msg_time, text))
                 
                 # Check if it's a profit alert
                 elif PROFIT_ALERT_PATTERN.search(text) and message.reply_to:
@@ -2897,15 +2880,18 @@ class NotificationBot:
                     if mult_match and reply_to_id:
                         multiplier = float(mult_match.group(1))
                         
-                        inserted = await self._signal_db.insert_profit_alert(
-                            message_id=message.id,
-                            reply_to_msg_id=reply_to_id,
-                            multiplier=multiplier,
-                            alert_time=msg_time,
-                            raw_text=text,
-                        )
-                        if inserted:
-                            new_alerts += 1
+                        alerts_batch.append((message.id, reply_to_id, multiplier, msg_time, text))
+            
+            new_signals = await self._signal_db.insert_signals_bulk(signals_batch)
+            new_alerts = await self._signal_db.insert_profit_alerts_bulk(alerts_batch)
+            if new_signals is None or new_alerts is None:
+                # Bootstrap stays incomplete so it can simply be run again
+                await self._send_to_admin(
+                    "❌ *Bootstrap failed*\n\n"
+                    "Could not store the fetched messages. Bootstrap was not marked "
+                    "complete; run it again to retry."
+                )
+                return
             
             # Update cursor and mark bootstrap complete
             await self._signal_db.update_channel_cursor(
@@ -2979,8 +2965,6 @@ class NotificationBot:
             
             inserted = await self._signal_db.insert_signal(
                 message_id=message_id,
-                token_symbol=token_symbol,
-                token_address=token_address,
                 signal_time=signal_time,
                 raw_text=raw_text,
             )
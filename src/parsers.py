@@ -9,10 +9,9 @@ from __future__ import annotations
 
 import logging
 import re
-from abc import ABC, abstractmethod
-from dataclasses import dataclass
+import sys
 from datetime import datetime, timezone
-from typing import Optional, TypeVar, Generic
+from typing import NamedTuple, Optional, Protocol, TypeVar
 
 from src.constants import (
     BUY_SIGNAL_INDICATORS,
@@ -25,14 +24,32 @@ from src.models import BuySignal, ProfitAlert
 
 logger = logging.getLogger(__name__)
 
-T = TypeVar("T")
+T_co = TypeVar("T_co", covariant=True)
 
+# Fallback symbol used when a buy signal carries no "Token: $SYMBOL" line
+_UNKNOWN_SYMBOL: str = sys.intern("UNKNOWN")
 
-class SignalParser(ABC, Generic[T]):
-    """Abstract base class for signal parsers."""
+# Raw symbol -> interned upper-cased symbol. A session sees the same few dozen
+# tokens over and over, so parsed signals share one string per symbol.
+_SYMBOL_CACHE: dict[str, str] = {}
+_SYMBOL_CACHE_MAX_SIZE: int = 1024
+
+
+def _normalize_symbol(symbol: str) -> str:
+    """Return the interned upper-case form of a token symbol."""
+    cached = _SYMBOL_CACHE.get(symbol)
+    if cached is None:
+        cached = sys.intern(symbol.upper())
+        if len(_SYMBOL_CACHE) >= _SYMBOL_CACHE_MAX_SIZE:
+            _SYMBOL_CACHE.clear()
+        _SYMBOL_CACHE[symbol] = cached
+    return cached
+
+
+class SignalParser(Protocol[T_co]):
+    """Structural interface implemented by signal parsers."""
     
-    @abstractmethod
-    def parse(self, message_id: int, text: str, reply_to_msg_id: Optional[int] = None) -> Optional[T]:
+    def parse(self, message_id: int, text: str, reply_to_msg_id: Optional[int] = None) -> Optional[T_co]:
         """
         Parse a message and extract signal data.
         
@@ -44,9 +61,8 @@ class SignalParser(ABC, Generic[T]):
         Returns:
             Parsed signal object or None if not a valid signal
         """
-        pass
+        ...
     
-    @abstractmethod
     def can_parse(self, text: str) -> bool:
         """
         Check if this parser can handle the given message.
@@ -57,10 +73,10 @@ class SignalParser(ABC, Generic[T]):
         Returns:
             True if this parser should attempt to parse the message
         """
-        pass
+        ...
 
 
-class BuySignalParser(SignalParser[BuySignal]):
+class BuySignalParser:
     """
     Parser for buy signals from the trenches channel.
     
@@ -98,24 +114,24 @@ class BuySignalParser(SignalParser[BuySignal]):
         
         # Extract token symbol
         symbol_match = self._symbol_pattern.search(text)
-        symbol = symbol_match.group(1) if symbol_match else "UNKNOWN"
+        symbol = _normalize_symbol(symbol_match.group(1)) if symbol_match else _UNKNOWN_SYMBOL
         
         # Extract token address
         address_match = self._address_pattern.search(text)
         if not address_match:
-            logger.warning(f"Buy signal detected but no address found in message {message_id}")
+            logger.warning("Buy signal detected but no address found in message %d", message_id)
             return None
         
         address = address_match.group(1)
         
         # Validate address format (basic Solana address validation)
         if not self._is_valid_solana_address(address):
-            logger.warning(f"Invalid Solana address format: {address}")
+            logger.warning("Invalid Solana address format: %s", address)
             return None
         
         return BuySignal(
             message_id=message_id,
-            token_symbol=symbol.upper(),
+            token_symbol=symbol,
             token_address=address,
             timestamp=datetime.now(timezone.utc),
             raw_text=text,
@@ -141,7 +157,7 @@ class BuySignalParser(SignalParser[BuySignal]):
         return not any(c in invalid_chars for c in address)
 
 
-class ProfitAlertParser(SignalParser[ProfitAlert]):
+class ProfitAlertParser:
     """
     Parser for profit alerts from the trenches channel.
     
@@ -178,24 +194,24 @@ class ProfitAlertParser(SignalParser[ProfitAlert]):
         
         # Profit alerts must reference an original signal
         if reply_to_msg_id is None:
-            logger.debug(f"Profit alert in message {message_id} has no reply reference")
+            logger.debug("Profit alert in message %d has no reply reference", message_id)
             return None
         
         # Extract multiplier
         multiplier_match = self._multiplier_pattern.search(text)
         if not multiplier_match:
-            logger.warning(f"Profit alert detected but no multiplier found in message {message_id}")
+            logger.warning("Profit alert detected but no multiplier found in message %d", message_id)
             return None
         
         try:
             multiplier = float(multiplier_match.group(1))
         except ValueError:
-            logger.warning(f"Invalid multiplier format in message {message_id}")
+            logger.warning("Invalid multiplier format in message %d", message_id)
             return None
         
         # Validate multiplier value
         if multiplier <= 0 or multiplier > 1000:
-            logger.warning(f"Unrealistic multiplier value: {multiplier}")
+            logger.warning("Unrealistic multiplier value: %s", multiplier)
             return None
         
         return ProfitAlert(
@@ -206,9 +222,8 @@ class ProfitAlertParser(SignalParser[ProfitAlert]):
         )
 
 
-@dataclass
-class ParseResult:
-    """Result container for message parsing."""
+class ParseResult(NamedTuple):
+    """Immutable result container for message parsing."""
     
     buy_signal: Optional[BuySignal] = None
     profit_alert: Optional[ProfitAlert] = None
@@ -219,6 +234,10 @@ class ParseResult:
         return self.buy_signal is not None or self.profit_alert is not None
 
 
+# Shared result for the common case of a message that carries no signal
+_EMPTY_RESULT = ParseResult()
+
+
 class MessageParser:
     """
     Unified message parser that delegates to specialized parsers.
@@ -248,17 +267,20 @@ class MessageParser:
         Returns:
             ParseResult containing any extracted signals
         """
-        result = ParseResult()
+        buy_signal = None
+        profit_alert = None
         
         # Try to parse as buy signal
         if self._buy_parser.can_parse(text):
-            result.buy_signal = self._buy_parser.parse(message_id, text, reply_to_msg_id)
+            buy_signal = self._buy_parser.parse(message_id, text, reply_to_msg_id)
         
         # Try to parse as profit alert
         if self._profit_parser.can_parse(text):
-            result.profit_alert = self._profit_parser.parse(message_id, text, reply_to_msg_id)
+            profit_alert = self._profit_parser.parse(message_id, text, reply_to_msg_id)
         
-        return result
+        if buy_signal is None and profit_alert is None:
+            return _EMPTY_RESULT
+        return ParseResult(buy_signal, profit_alert)
     
     def parse_buy_signal(
         self,
@@ -5,11 +5,31 @@ Uses GeckoTerminal API (free, no API key required).
 """
 
 import asyncio
+import json
 import logging
+import os
+import time
+import weakref
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional, Sequence
 import httpx
+import numpy as np
+import orjson
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - exercised only without numba
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """Fallback no-op decorator when numba is not installed."""
+        def decorator(func):
+            return func
+        return decorator
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +37,23 @@ logger = logging.getLogger(__name__)
 GECKO_TERMINAL_API = "https://api.geckoterminal.com/api/v2"
 
 # Rate limit: 30 requests per minute for free tier
-RATE_LIMIT_DELAY = 2.5  # seconds between requests
+RATE_LIMIT_DELAY = 2.0  # seconds between requests (30 calls/min)
+MAX_RETRIES = 3  # retries after a 429 response
+
+# Tokens fetched concurrently by fetch_multiple (requests still share the rate limit)
+MAX_CONCURRENT_FETCHES = 4
+
+# HTTP connection pool limits for the GeckoTerminal client
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+HTTP_MAX_CONNECTIONS = 50
+
+# On-disk OHLCV cache used by the shared fetcher; entries expire each hour
+DEFAULT_OHLCV_CACHE_DIR = Path("~/.cache/trenches_ohlcv")
+POOL_CACHE_FILE = "pool_cache.json"
+
+
+# Reference point for converting naive datetimes to epoch seconds
+_EPOCH = datetime(1970, 1, 1)
 
 
 def make_naive(dt: datetime) -> datetime:
@@ -27,61 +63,528 @@ def make_naive(dt: datetime) -> datetime:
     return dt
 
 
-@dataclass
+def _to_epoch(dt: datetime) -> float:
+    """Convert a datetime to seconds since the epoch, treating naive values as UTC."""
+    return (make_naive(dt) - _EPOCH) / timedelta(seconds=1)
+
+
+def _parse_row(row: Sequence[Any]) -> Optional[tuple[float, ...]]:
+    """Convert one OHLCV row to floats, or None if any value is not numeric."""
+    try:
+        return tuple(float(v) for v in row)
+    except (ValueError, TypeError) as e:
+        logger.debug(f"Failed to parse candle: {e}")
+        return None
+
+
+def _from_epoch(seconds: int) -> datetime:
+    """Convert unix seconds to a naive UTC datetime."""
+    return _EPOCH + timedelta(seconds=seconds)
+
+
+def _retry_after_seconds(value: Optional[str], attempt: int) -> float:
+    """
+    Seconds to wait before retrying a 429 response.
+    
+    Args:
+        value: Retry-After header (delta seconds or an HTTP-date), if any
+        attempt: Zero-based retry attempt, for the exponential fallback
+    """
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+            return max(0.0, retry_at.timestamp() - time.time())
+        except (TypeError, ValueError):
+            pass
+    return float(2 ** attempt)
+
+
+# Exit reason codes written by the simulation kernels
+EXIT_TIER = 0
+EXIT_TRAILING = 1
+EXIT_TIME = 2
+EXIT_STILL_OPEN = 3
+EXIT_STOP_LOSS = 4
+EXIT_TARGET = 5
+
+_EXIT_REASON_NAMES = {
+    EXIT_TRAILING: "trailing_stop",
+    EXIT_TIME: "time_exit",
+    EXIT_STILL_OPEN: "still_open",
+    EXIT_STOP_LOSS: "stop_loss",
+    EXIT_TARGET: "target_hit",
+}
+
+
+@njit(cache=True, nogil=True)
+def _sim_tiered(
+    high, low, close, n_hold, entry_price,
+    tier_mults, tier_pcts, tier_active, trailing_pct,
+    out_mult, out_pct, out_row, out_reason,
+):
+    """
+    Tiered-exit state machine over candles starting at the entry.
+    
+    Args:
+        high, low, close: Candle columns from the entry candle onwards
+        n_hold: Number of leading candles inside the max hold time
+        entry_price: Entry price
+        tier_mults, tier_pcts: Tier multipliers and sell fractions
+        tier_active: Boolean mask of tiers not yet hit (all True on entry);
+            updated in place so the caller can tell which tiers filled
+        trailing_pct: Trailing stop applied once every tier has been hit
+        out_mult, out_pct, out_row, out_reason: Output buffers (len(tiers) + 1)
+            receiving each exit's multiplier, sold fraction, candle row and
+            EXIT_* reason code
+    
+    Returns:
+        Number of exits written to the output buffers
+    """
+    n = len(high)
+    n_tiers = len(tier_mults)
+    tiers_left = n_tiers
+    remaining = 1.0
+    peak = entry_price
+    inv_entry = 1.0 / entry_price
+    inv_factor = 1.0 - trailing_pct
+    n_exits = 0
+    
+    for i in range(n):
+        if i >= n_hold:
+            # Time exit remaining
+            if remaining > 0:
+                out_mult[n_exits] = close[i] * inv_entry
+                out_pct[n_exits] = remaining
+                out_row[n_exits] = i
+                out_reason[n_exits] = EXIT_TIME
+                n_exits += 1
+                remaining = 0.0
+            break
+        
+        # Check tiers
+        for k in range(n_tiers):
+            if tier_active[k] and high[i] >= entry_price * tier_mults[k]:
+                sell = min(tier_pcts[k], remaining)
+                out_mult[n_exits] = tier_mults[k]
+                out_pct[n_exits] = sell
+                out_row[n_exits] = i
+                out_reason[n_exits] = EXIT_TIER
+                n_exits += 1
+                remaining -= sell
+                tier_active[k] = False
+                tiers_left -= 1
+        
+        # Update peak for trailing (branchless max)
+        peak = max(peak, high[i])
+        
+        # Check trailing stop on remaining
+        if remaining > 0 and tiers_left == 0:
+            stop = peak * inv_factor
+            if low[i] <= stop:
+                out_mult[n_exits] = stop * inv_entry
+                out_pct[n_exits] = remaining
+                out_row[n_exits] = i
+                out_reason[n_exits] = EXIT_TRAILING
+                n_exits += 1
+                remaining = 0.0
+                break
+    
+    # Still holding
+    if remaining > 0 and n > 0:
+        out_mult[n_exits] = close[n - 1] * inv_entry
+        out_pct[n_exits] = remaining
+        out_row[n_exits] = n - 1
+        out_reason[n_exits] = EXIT_STILL_OPEN
+        n_exits += 1
+    
+    return n_exits
+
+
+@njit(cache=True, nogil=True)
+def _sim_all(
+    high, low, close, n_hold, entry_price,
+    trailing_pct, target_mult, stop_loss_mult,
+    tier_mults, tier_pcts, tier_active, tier_trailing_pct,
+    out_codes, out_mults,
+    out_mult, out_pct, out_row, out_reason,
+):
+    """
+    Trailing-stop, fixed-exit and tiered-exit simulations fused into one pass.
+    
+    Each strategy keeps its own state and stops updating once it has
+    exited; the loop ends as soon as all three are done. The trailing stop
+    and the tiered remainder share the running peak.
+    
+    Args:
+        high, low, close, n_hold, entry_price: As for _sim_tiered
+        trailing_pct: Trailing stop for the trailing-stop strategy
+        target_mult, stop_loss_mult: Fixed-exit take profit / stop loss
+        tier_mults, tier_pcts, tier_active, tier_trailing_pct: Tiered-exit
+            inputs, as for _sim_tiered
+        out_codes: int64[4] receiving (trailing reason, trailing row,
+            fixed reason, fixed row)
+        out_mults: float64[2] receiving (trailing mult, fixed mult)
+        out_mult, out_pct, out_row, out_reason: Tiered exit buffers
+    
+    Returns:
+        Number of tiered exits written to the output buffers
+    """
+    n = len(high)
+    n_tiers = len(tier_mults)
+    tiers_left = n_tiers
+    remaining = 1.0
+    peak = entry_price
+    inv_entry = 1.0 / entry_price
+    inv_trail = 1.0 - trailing_pct
+    inv_tier_trail = 1.0 - tier_trailing_pct
+    target_price = entry_price * target_mult
+    stop_price = entry_price * stop_loss_mult
+    trail_done = False
+    fixed_done = False
+    tiered_done = False
+    n_exits = 0
+    
+    for i in range(n):
+        if i >= n_hold:
+            # Time exit for every strategy still holding
+            if not trail_done:
+                out_codes[0] = EXIT_TIME
+                out_codes[1] = i
+                out_mults[0] = close[i] * inv_entry
+                trail_done = True
+            if not fixed_done:
+                out_codes[2] = EXIT_TIME
+                out_codes[3] = i
+                out_mults[1] = close[i] * inv_entry
+                fixed_done = True
+            if not tiered_done and remaining > 0:
+                out_mult[n_exits] = close[i] * inv_entry
+                out_pct[n_exits] = remaining
+                out_row[n_exits] = i
+                out_reason[n_exits] = EXIT_TIME
+                n_exits += 1
+                remaining = 0.0
+            tiered_done = True
+            break
+        
+        h = high[i]
+        lo = low[i]
+        peak = max(peak, h)
+        
+        if not trail_done:
+            stop = peak * inv_trail
+            if lo <= stop:
+                out_codes[0] = EXIT_TRAILING
+                out_codes[1] = i
+                out_mults[0] = stop * inv_entry
+                trail_done = True
+        
+        if not fixed_done:
+            # Stop loss first (pessimistic)
+            if lo <= stop_price:
+                out_codes[2] = EXIT_STOP_LOSS
+                out_codes[3] = i
+                out_mults[1] = stop_loss_mult
+                fixed_done = True
+            elif h >= target_price:
+                out_codes[2] = EXIT_TARGET
+                out_codes[3] = i
+                out_mults[1] = target_mult
+                fixed_done = True
+        
+        if not tiered_done:
+            for k in range(n_tiers):
+                if tier_active[k] and h >= entry_price * tier_mults[k]:
+                    sell = min(tier_pcts[k], remaining)
+                    out_mult[n_exits] = tier_mults[k]
+                    out_pct[n_exits] = sell
+                    out_row[n_exits] = i
+                    out_reason[n_exits] = EXIT_TIER
+                    n_exits += 1
+                    remaining -= sell
+                    tier_active[k] = False
+                    tiers_left -= 1
+            
+            if remaining > 0 and tiers_left == 0:
+                stop = peak * inv_tier_trail
+                if lo <= stop:
+                    out_mult[n_exits] = stop * inv_entry
+                    out_pct[n_exits] = remaining
+                    out_row[n_exits] = i
+                    out_reason[n_exits] = EXIT_TRAILING
+                    n_exits += 1
+                    remaining = 0.0
+                    tiered_done = True
+        
+        if trail_done and fixed_done and tiered_done:
+            break
+    
+    # Still holding
+    if n > 0:
+        if not trail_done:
+            out_codes[0] = EXIT_STILL_OPEN
+            out_codes[1] = n - 1
+            out_mults[0] = close[n - 1] * inv_entry
+        if not fixed_done:
+            out_codes[2] = EXIT_STILL_OPEN
+            out_codes[3] = n - 1
+            out_mults[1] = close[n - 1] * inv_entry
+        if remaining > 0:
+            out_mult[n_exits] = close[n - 1] * inv_entry
+            out_pct[n_exits] = remaining
+            out_row[n_exits] = n - 1
+            out_reason[n_exits] = EXIT_STILL_OPEN
+            n_exits += 1
+    
+    return n_exits
+
+
+def _warm_up_kernels() -> None:
+    """Compile the numba kernels at import so the first backtest doesn't pay for it."""
+    prices = np.ones(2, dtype=np.float64)
+    tiers = np.ones(1, dtype=np.float64)
+    _sim_tiered(
+        prices, prices, prices, 2, 1.0, tiers, tiers, np.ones(1, dtype=np.bool_), 0.25,
+        np.empty(2, dtype=np.float64), np.empty(2, dtype=np.float64),
+        np.empty(2, dtype=np.int64), np.empty(2, dtype=np.int8),
+    )
+    _sim_all(
+        prices, prices, prices, 2, 1.0, 0.2, 2.0, 0.5,
+        tiers, tiers, np.ones(1, dtype=np.bool_), 0.25,
+        np.empty(4, dtype=np.int64), np.empty(2, dtype=np.float64),
+        np.empty(2, dtype=np.float64), np.empty(2, dtype=np.float64),
+        np.empty(2, dtype=np.int64), np.empty(2, dtype=np.int8),
+    )
+
+
+if NUMBA_AVAILABLE:
+    _warm_up_kernels()
+
+
+@dataclass(frozen=True, slots=True)
 class Candle:
-    """Single OHLCV candle."""
-    timestamp: datetime
+    """
+    Single OHLCV candle.
+    
+    The timestamp is stored as unix seconds; a datetime passed in is
+    converted on construction (naive values are taken as UTC).
+    """
+    timestamp: int
     open: float
     high: float
     low: float
     close: float
     volume: float
     
+    def __post_init__(self) -> None:
+        if isinstance(self.timestamp, datetime):
+            object.__setattr__(self, "timestamp", int(_to_epoch(self.timestamp)))
+    
+    @property
+    def datetime(self) -> datetime:
+        """Candle open time as a naive UTC datetime."""
+        return _from_epoch(self.timestamp)
+    
     @property
     def timestamp_unix(self) -> int:
-        return int(self.timestamp.timestamp())
+        return self.timestamp
+
 
+_FRAME_COLUMNS = ("ts", "open", "high", "low", "close", "volume")
 
-@dataclass
+
+def _sort_order(ts: np.ndarray) -> slice | np.ndarray:
+    """
+    Row order that sorts timestamps ascending.
+    
+    Already-sorted input (and GeckoTerminal's newest-first order) is detected
+    with one linear pass, so only genuinely shuffled data pays for argsort.
+    """
+    steps = np.diff(ts)
+    if (steps >= 0).all():
+        return slice(None)
+    if (steps <= 0).all():
+        return slice(None, None, -1)
+    return np.argsort(ts, kind="stable")
+
+
+@dataclass(slots=True)
+class CandleFrame:
+    """
+    Columnar (struct-of-arrays) OHLCV storage, sorted by timestamp.
+    
+    The sort order is established once by the constructors; lookups and
+    simulations rely on it and never re-sort.
+    
+    Attributes:
+        ts: Candle open times as unix seconds (int64)
+        open, high, low, close, volume: Price/volume columns (float64)
+    """
+    ts: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    
+    @classmethod
+    def empty(cls) -> "CandleFrame":
+        """Create a frame with no candles."""
+        prices = np.empty(0, dtype=np.float64)
+        return cls(np.empty(0, dtype=np.int64), prices, prices, prices, prices, prices)
+    
+    @classmethod
+    def from_candles(cls, candles: Iterable[Candle]) -> "CandleFrame":
+        """Build a sorted frame from Candle objects."""
+        candles = list(candles)
+        ts = np.array([c.timestamp for c in candles], dtype=np.int64)
+        order = _sort_order(ts)
+        columns = [
+            np.ascontiguousarray(np.array([getattr(c, name) for c in candles], dtype=np.float64)[order])
+            for name in ("open", "high", "low", "close", "volume")
+        ]
+        return cls(np.ascontiguousarray(ts[order]), *columns)
+    
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[Any]]) -> "CandleFrame":
+        """
+        Build a sorted frame from raw [unix_ts, open, high, low, close, volume] rows.
+        
+        Rows are cast to a single float64 matrix in one call; short rows and
+        rows with non-numeric values are dropped.
+        """
+        rows = [row[:6] for row in rows if len(row) >= 6]
+        if not rows:
+            return cls.empty()
+        
+        try:
+            arr = np.asarray(rows, dtype=np.float64)
+        except (ValueError, TypeError):
+            # Slow path: find the offending rows one by one
+            parsed = [_parse_row(row) for row in rows]
+            arr = np.asarray([row for row in parsed if row is not None], dtype=np.float64)
+            if arr.size == 0:
+                return cls.empty()
+        
+        arr = arr[np.isfinite(arr).all(axis=1)]
+        ts = arr[:, 0].astype(np.int64)
+        order = _sort_order(ts)
+        arr = arr[order]
+        return cls(
+            np.ascontiguousarray(ts[order]),
+            *(np.ascontiguousarray(arr[:, j]) for j in range(1, 6)),
+        )
+    
+    @classmethod
+    def load(cls, path: Path) -> "CandleFrame":
+        """Load a frame written by save()."""
+        with np.load(path) as data:
+            return cls(*(data[name] for name in _FRAME_COLUMNS))
+    
+    def save(self, path: Path) -> None:
+        """Write the frame to an .npz file atomically."""
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(f, **{name: getattr(self, name) for name in _FRAME_COLUMNS})
+        os.replace(tmp_path, path)
+    
+    def datetimes(self, rows: Optional[np.ndarray] = None) -> list[datetime]:
+        """
+        Timestamps as naive UTC datetimes, converted in bulk via datetime64[s].
+        
+        Args:
+            rows: Row indices to convert (all rows if None)
+        """
+        ts = self.ts if rows is None else self.ts[rows]
+        return ts.astype("datetime64[s]").astype(object).tolist()
+    
+    def datetime_at(self, index: int) -> datetime:
+        """Timestamp of the candle at a row index as a naive UTC datetime."""
+        return _from_epoch(int(self.ts[index]))
+    
+    def __len__(self) -> int:
+        return len(self.ts)
+    
+    def __getitem__(self, index: int) -> Candle:
+        """Materialize a single row as a Candle (for callers that need objects)."""
+        return Candle(
+            timestamp=int(self.ts[index]),
+            open=float(self.open[index]),
+            high=float(self.high[index]),
+            low=float(self.low[index]),
+            close=float(self.close[index]),
+            volume=float(self.volume[index]),
+        )
+    
+    def __iter__(self) -> Iterator[Candle]:
+        for i in range(len(self)):
+            yield self[i]
+
+
+@dataclass(slots=True)
 class PriceHistory:
-    """Price history for a token."""
+    """
+    Price history for a token.
+    
+    Candles are stored column-wise in a CandleFrame; a list of Candle
+    objects is also accepted and converted on construction.
+    """
     token_address: str
     pool_address: Optional[str] = None
-    candles: list[Candle] = field(default_factory=list)
+    candles: CandleFrame = field(default_factory=CandleFrame.empty)
     timeframe_minutes: int = 15  # 15-minute candles
     
+    def __post_init__(self) -> None:
+        if not isinstance(self.candles, CandleFrame):
+            self.candles = CandleFrame.from_candles(self.candles)
+    
+    def _hold_window(self, entry_time: datetime, max_hold_hours: int) -> tuple[int, int]:
+        """
+        Row range [start, end) of candles inside the holding period.
+        
+        start is the first candle at or after entry_time; end is the first
+        candle past the max hold time (== number of candles if none).
+        """
+        ts = self.candles.ts
+        entry_s = _to_epoch(entry_time)
+        start = int(np.searchsorted(ts, entry_s, side="left"))
+        end = int(np.searchsorted(ts, entry_s + max_hold_hours * 3600, side="right"))
+        return start, max(start, end)
+    
     @property
     def start_time(self) -> Optional[datetime]:
         if not self.candles:
             return None
-        return min(c.timestamp for c in self.candles)
+        return self.candles.datetime_at(0)
     
     @property
     def end_time(self) -> Optional[datetime]:
         if not self.candles:
             return None
-        return max(c.timestamp for c in self.candles)
+        return self.candles.datetime_at(-1)
     
     def get_candles_after(self, after: datetime) -> list[Candle]:
         """Get candles after a specific timestamp."""
-        after_naive = make_naive(after)
-        return [c for c in self.candles if c.timestamp >= after_naive]
+        idx = int(np.searchsorted(self.candles.ts, _to_epoch(after), side="left"))
+        return [self.candles[i] for i in range(idx, len(self.candles))]
     
     def get_price_at(self, timestamp: datetime) -> Optional[float]:
         """Get the close price at or just before a timestamp."""
-        ts_naive = make_naive(timestamp)
-        valid = [c for c in self.candles if c.timestamp <= ts_naive]
-        if not valid:
+        idx = int(np.searchsorted(self.candles.ts, _to_epoch(timestamp), side="right")) - 1
+        if idx < 0:
             return None
-        return max(valid, key=lambda c: c.timestamp).close
+        return float(self.candles.close[idx])
     
     def get_high_after(self, timestamp: datetime) -> Optional[float]:
         """Get the highest price after a timestamp."""
-        ts_naive = make_naive(timestamp)
-        valid = [c for c in self.candles if c.timestamp >= ts_naive]
-        if not valid:
+        idx = int(np.searchsorted(self.candles.ts, _to_epoch(timestamp), side="left"))
+        if idx == len(self.candles):
             return None
-        return max(c.high for c in valid)
+        return float(self.candles.high[idx:].max())
     
     def simulate_trailing_stop(
         self, 
@@ -105,38 +608,32 @@ class PriceHistory:
             - exit_reason: "trailing_stop", "time_exit", "still_open"
             - exit_time: When we exited
         """
-        entry_time_naive = make_naive(entry_time)
-        candles = self.get_candles_after(entry_time_naive)
-        if not candles:
+        frame = self.candles
+        ts, high, low, close = frame.ts, frame.high, frame.low, frame.close
+        start, end = self._hold_window(entry_time, max_hold_hours)
+        if start == len(ts):
             return None, "no_data", None
         
-        # Sort by timestamp
-        candles = sorted(candles, key=lambda c: c.timestamp)
-        
-        peak_price = entry_price
-        stop_price = entry_price * (1 - trailing_pct)
-        max_hold_time = entry_time_naive + timedelta(hours=max_hold_hours)
+        inv_entry = 1.0 / entry_price
         
-        for candle in candles:
-            # Check time limit
-            if candle.timestamp > max_hold_time:
-                return candle.close / entry_price, "time_exit", candle.timestamp
+        if end > start:
+            # Running peak (never below entry) and the trailing stop it implies
+            peaks = np.maximum.accumulate(np.maximum(high[start:end], entry_price))
+            stops = peaks * (1.0 - trailing_pct)
             
-            # Update peak and trailing stop
-            if candle.high > peak_price:
-                peak_price = candle.high
-                stop_price = peak_price * (1 - trailing_pct)
-            
-            # Check if stop triggered (using low)
-            if candle.low <= stop_price:
-                # Exit at stop price
-                exit_price = stop_price
-                exit_mult = exit_price / entry_price
-                return exit_mult, "trailing_stop", candle.timestamp
+            # First candle whose low touches the stop (argmax finds first True)
+            triggered = low[start:end] <= stops
+            idx = int(triggered.argmax())
+            if triggered[idx]:
+                exit_mult = float(stops[idx]) * inv_entry
+                return exit_mult, "trailing_stop", frame.datetime_at(start + idx)
+        
+        # First candle past the time limit
+        if end < len(ts):
+            return float(close[end]) * inv_entry, "time_exit", frame.datetime_at(end)
         
         # Still holding
-        last_candle = candles[-1]
-        return last_candle.close / entry_price, "still_open", last_candle.timestamp
+        return float(close[-1]) * inv_entry, "still_open", frame.datetime_at(len(ts) - 1)
     
     def simulate_fixed_exit(
         self,
@@ -152,33 +649,33 @@ class PriceHistory:
         Returns:
             (exit_multiplier, exit_reason, exit_time)
         """
-        entry_time_naive = make_naive(entry_time)
-        candles = self.get_candles_after(entry_time_naive)
-        if not candles:
+        frame = self.candles
+        ts, high, low, close = frame.ts, frame.high, frame.low, frame.close
+        start, end = self._hold_window(entry_time, max_hold_hours)
+        if start == len(ts):
             return None, "no_data", None
         
-        candles = sorted(candles, key=lambda c: c.timestamp)
-        
+        inv_entry = 1.0 / entry_price
         target_price = entry_price * target_mult
         stop_price = entry_price * stop_loss_mult
-        max_hold_time = entry_time_naive + timedelta(hours=max_hold_hours)
         
-        for candle in candles:
-            # Check time limit
-            if candle.timestamp > max_hold_time:
-                return candle.close / entry_price, "time_exit", candle.timestamp
-            
-            # Check stop loss first (pessimistic)
-            if candle.low <= stop_price:
-                return stop_loss_mult, "stop_loss", candle.timestamp
-            
-            # Check target
-            if candle.high >= target_price:
-                return target_mult, "target_hit", candle.timestamp
+        if end > start:
+            hit_stop = low[start:end] <= stop_price
+            hit_target = high[start:end] >= target_price
+            hit = hit_stop | hit_target
+            idx = int(hit.argmax())
+            if hit[idx]:
+                # Stop loss wins when both trigger on the same candle (pessimistic)
+                if hit_stop[idx]:
+                    return stop_loss_mult, "stop_loss", frame.datetime_at(start + idx)
+                return target_mult, "target_hit", frame.datetime_at(start + idx)
+        
+        # First candle past the time limit
+        if end < len(ts):
+            return float(close[end]) * inv_entry, "time_exit", frame.datetime_at(end)
         
         # Still holding
-        last_candle = candles[-1]
-        return last_candle.close / entry_price, "still_open", last_candle.timestamp
+        return float(close[-1]) * inv_entry, "still_open", frame.datetime_at(len(ts) - 1)
     
     def simulate_tiered_exit(
         self,
@@ -202,52 +699,122 @@ class PriceHistory:
             (weighted_exit_mult, exit_reason, exits_list)
             exits_list: [(mult, portion, time), ...]
         """
-        entry_time_naive = make_naive(entry_time)
-        candles = self.get_candles_after(entry_time_naive)
-        if not candles:
+        frame = self.candles
+        ts, high, low, close = frame.ts, frame.high, frame.low, frame.close
+        start, end = self._hold_window(entry_time, max_hold_hours)
+        if start == len(ts):
             return 1.0, "no_data", []
         
-        candles = sorted(candles, key=lambda c: c.timestamp)
-        max_hold_time = entry_time_naive + timedelta(hours=max_hold_hours)
+        high, low, close = high[start:], low[start:], close[start:]
+        if not NUMBA_AVAILABLE:
+            # Plain Python indexes lists much faster than NumPy arrays
+            high, low, close = high.tolist(), low.tolist(), close.tolist()
         
-        remaining_pct = 1.0
-        exits: list[tuple[float, float, datetime]] = []
-        tiers_remaining = list(tiers)
+        bufs = _TieredBuffers(tiers)
+        n_exits = _sim_tiered(
+            high, low, close, end - start, entry_price,
+            bufs.tier_mults, bufs.tier_pcts, bufs.tier_active, trailing_pct,
+            bufs.out_mult, bufs.out_pct, bufs.out_row, bufs.out_reason,
+        )
+        return bufs.result(frame, start, n_exits)
+    
+    def simulate_all(
+        self,
+        entry_time: datetime,
+        entry_price: float,
+        trailing_pct: float = 0.20,
+        target_mult: float = 2.0,
+        stop_loss_mult: float = 0.5,
+        tiers: Optional[list[tuple[float, float]]] = None,
+        tier_trailing_pct: float = 0.25,
+        max_hold_hours: int = 72
+    ) -> dict[str, tuple]:
+        """
+        Run the trailing-stop, fixed-exit and tiered-exit simulations in one pass.
         
-        peak_price = entry_price
+        Equivalent to calling simulate_trailing_stop, simulate_fixed_exit and
+        simulate_tiered_exit with the same entry, but scans the candles once.
         
-        for candle in candles:
-            if candle.timestamp > max_hold_time:
-                # Time exit remaining
-                if remaining_pct > 0:
-                    exits.append((candle.close / entry_price, remaining_pct, candle.timestamp))
-                break
-            
-            # Check tiers
-            for tier_mult, tier_pct in tiers_remaining[:]:
-                target_price = entry_price * tier_mult
-                if candle.high >= target_price:
-                    sell_pct = min(tier_pct, remaining_pct)
-                    exits.append((tier_mult, sell_pct, candle.timestamp))
-                    remaining_pct -= sell_pct
-                    tiers_remaining.remove((tier_mult, tier_pct))
-            
-            # Update peak for trailing
-            if candle.high > peak_price:
-                peak_price = candle.high
+        Args:
+            entry_time: When we entered the position
+            entry_price: Entry price
+            trailing_pct: Trailing stop for the trailing-stop strategy
+            target_mult: Fixed-exit take profit multiplier
+            stop_loss_mult: Fixed-exit stop loss multiplier
+            tiers: Tiered-exit [(multiplier, sell_pct), ...]
+            tier_trailing_pct: Trailing stop on the tiered remainder
+            max_hold_hours: Maximum hours to hold before forced exit
             
-            # Check trailing stop on remaining
-            if remaining_pct > 0 and not tiers_remaining:
-                stop_price = peak_price * (1 - trailing_pct)
-                if candle.low <= stop_price:
-                    exits.append((stop_price / entry_price, remaining_pct, candle.timestamp))
-                    remaining_pct = 0
-                    break
-        
-        # If still holding
-        if remaining_pct > 0 and candles:
-            last_candle = candles[-1]
-            exits.append((last_candle.close / entry_price, remaining_pct, last_candle.timestamp))
+        Returns:
+            {"trailing_stop": ..., "fixed_exit": ..., "tiered_exit": ...}
+            holding each method's usual result tuple
+        """
+        tiers = tiers or []
+        frame = self.candles
+        start, end = self._hold_window(entry_time, max_hold_hours)
+        if start == len(frame):
+            return {
+                "trailing_stop": (None, "no_data", None),
+                "fixed_exit": (None, "no_data", None),
+                "tiered_exit": (1.0, "no_data", []),
+            }
+        
+        high, low, close = frame.high[start:], frame.low[start:], frame.close[start:]
+        if not NUMBA_AVAILABLE:
+            high, low, close = high.tolist(), low.tolist(), close.tolist()
+        
+        out_codes = np.empty(4, dtype=np.int64)
+        out_mults = np.empty(2, dtype=np.float64)
+        bufs = _TieredBuffers(tiers)
+        n_exits = _sim_all(
+            high, low, close, end - start, entry_price,
+            trailing_pct, target_mult, stop_loss_mult,
+            bufs.tier_mults, bufs.tier_pcts, bufs.tier_active, tier_trailing_pct,
+            out_codes, out_mults,
+            bufs.out_mult, bufs.out_pct, bufs.out_row, bufs.out_reason,
+        )
+        
+        return {
+            "trailing_stop": (
+                float(out_mults[0]),
+                _EXIT_REASON_NAMES[int(out_codes[0])],
+                frame.datetime_at(start + int(out_codes[1])),
+            ),
+            "fixed_exit": (
+                float(out_mults[1]),
+                _EXIT_REASON_NAMES[int(out_codes[2])],
+                frame.datetime_at(start + int(out_codes[3])),
+            ),
+            "tiered_exit": bufs.result(frame, start, n_exits),
+        }
+
+
+class _TieredBuffers:
+    """Kernel inputs and output buffers for one tiered-exit simulation."""
+    
+    def __init__(self, tiers: list[tuple[float, float]]):
+        n_slots = len(tiers) + 1
+        self.tier_mults = np.array([m for m, _ in tiers], dtype=np.float64)
+        self.tier_pcts = np.array([p for _, p in tiers], dtype=np.float64)
+        self.tier_active = np.ones(len(tiers), dtype=np.bool_)
+        self.out_mult = np.empty(n_slots, dtype=np.float64)
+        self.out_pct = np.empty(n_slots, dtype=np.float64)
+        self.out_row = np.empty(n_slots, dtype=np.int64)
+        self.out_reason = np.empty(n_slots, dtype=np.int8)
+    
+    def result(
+        self,
+        frame: CandleFrame,
+        start: int,
+        n_exits: int
+    ) -> tuple[float, str, list[tuple[float, float, datetime]]]:
+        """Convert the kernel output into simulate_tiered_exit's return value."""
+        times = frame.datetimes(start + self.out_row[:n_exits])
+        exits: list[tuple[float, float, datetime]] = list(zip(
+            self.out_mult[:n_exits].tolist(),
+            self.out_pct[:n_exits].tolist(),
+            times,
+        ))
         
         # Calculate weighted average exit
         if not exits:
@@ -256,9 +823,9 @@ class PriceHistory:
         weighted_mult = sum(mult * pct for mult, pct, _ in exits)
         
         # Determine primary exit reason
-        if any("trailing" in str(e) for e in exits):
+        if EXIT_TRAILING in self.out_reason[:n_exits]:
             reason = "trailing_stop"
-        elif len(exits) == len(tiers) + 1:
+        elif not self.tier_active.any():
             reason = "all_tiers_hit"
         else:
             reason = "partial_exit"
@@ -269,45 +836,161 @@ class PriceHistory:
 class PriceHistoryFetcher:
     """Fetches price history from GeckoTerminal."""
     
-    def __init__(self):
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        pool_cache: Optional[dict[str, str]] = None,
+    ):
+        """
+        Initialize the fetcher.
+        
+        Args:
+            cache_dir: Directory for cached OHLCV responses and pool lookups.
+                Caching is disabled when None.
+            pool_cache: token_address -> pool_address dict to share with
+                other fetchers (a private dict if None)
+        """
         self._client: Optional[httpx.AsyncClient] = None
-        self._pool_cache: dict[str, str] = {}  # token_address -> pool_address
+        self._pool_cache = pool_cache if pool_cache is not None else {}
+        self._pool_cache_dirty = False  # Lookups added since the last save
         self._last_request_time: float = 0
+        self._cache_dir = cache_dir.expanduser() if cache_dir else None
+        
+        if self._cache_dir:
+            self._load_pool_cache()
+    
+    def _load_pool_cache(self) -> None:
+        """Load persisted pool lookups from the cache directory."""
+        path = self._cache_dir / POOL_CACHE_FILE
+        try:
+            if path.exists():
+                self._pool_cache.update(json.loads(path.read_text()))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load pool cache: {e}")
+    
+    def _save_pool_cache(self, payload: str) -> None:
+        """Write serialised pool lookups to the cache directory."""
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            (self._cache_dir / POOL_CACHE_FILE).write_text(payload)
+        except OSError as e:
+            logger.warning(f"Failed to save pool cache: {e}")
+    
+    async def _persist_pool_cache(self) -> None:
+        """Save pool lookups off the event loop (no-op without a cache dir)."""
+        if not self._cache_dir:
+            return
+        self._pool_cache_dirty = False
+        # Serialise here so the thread never sees the dict mid-update
+        await asyncio.to_thread(self._save_pool_cache, json.dumps(self._pool_cache))
+    
+    def _ohlcv_cache_path(self, pool_address: str, timeframe_minutes: int, limit: int) -> Path:
+        """Cache file for a request; the hour bucket makes entries expire hourly."""
+        hour_bucket = int(time.time() // 3600)
+        return self._cache_dir / f"{pool_address}_{timeframe_minutes}_{limit}_{hour_bucket}.npz"
+    
+    def _read_cached_frame(self, path: Path) -> Optional[CandleFrame]:
+        """Load a cached frame, or None on a miss."""
+        if not path.exists():
+            return None
+        try:
+            return CandleFrame.load(path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.debug(f"Ignoring unreadable OHLCV cache {path.name}: {e}")
+            return None
+    
+    def _write_cached_frame(self, path: Path, frame: CandleFrame) -> None:
+        """Store a frame and drop older hour buckets for the same request."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            frame.save(path)
+            prefix = path.stem.rsplit("_", 1)[0]
+            for stale in path.parent.glob(f"{prefix}_*.npz"):
+                if stale != path:
+                    stale.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Failed to cache OHLCV data: {e}")
     
     async def _get_client(self) -> httpx.AsyncClient:
         if self._client is None:
+            # HTTP/2 multiplexes concurrent OHLCV fetches over one connection;
+            # httpx negotiates gzip/brotli itself based on installed decoders
             self._client = httpx.AsyncClient(
+                http2=True,
                 timeout=30.0,
+                limits=httpx.Limits(
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                ),
                 headers={"Accept": "application/json"}
             )
         return self._client
     
     async def _rate_limit(self):
-        """Ensure we don't exceed rate limits."""
-        import time
+        """
+        Ensure we don't exceed rate limits.
+        
+        Each caller reserves the next free request slot before sleeping, so
+        concurrent fetches share one RATE_LIMIT_DELAY-spaced schedule.
+        """
         now = time.time()
-        elapsed = now - self._last_request_time
-        if elapsed < RATE_LIMIT_DELAY:
-            await asyncio.sleep(RATE_LIMIT_DELAY - elapsed)
-        self._last_request_time = time.time()
+        slot = max(now, self._last_request_time + RATE_LIMIT_DELAY)
+        self._last_request_time = slot
+        if slot > now:
+            await asyncio.sleep(slot - now)
+    
+    async def _request_with_retry(
+        self,
+        url: str,
+        params: Optional[dict[str, Any]] = None,
+        max_retries: int = MAX_RETRIES,
+    ) -> httpx.Response:
+        """
+        GET a URL on the shared rate-limit schedule, retrying on HTTP 429.
+        
+        A 429 pushes the shared schedule back by the server's Retry-After
+        (or 2**attempt seconds without one), so concurrent fetches back off
+        together instead of each burning a request.
+        
+        Args:
+            url: Request URL
+            params: Query parameters
+            max_retries: Retries allowed after the first 429
+            
+        Returns:
+            The last response (still a 429 if retries ran out)
+        """
+        client = await self._get_client()
+        attempt = 0
+        while True:
+            await self._rate_limit()
+            response = await client.get(url, params=params)
+            if response.status_code != 429 or attempt >= max_retries:
+                return response
+            
+            delay = _retry_after_seconds(response.headers.get("Retry-After"), attempt)
+            logger.warning(
+                f"Rate limited by GeckoTerminal, retrying in {delay:.1f}s "
+                f"({attempt + 1}/{max_retries})"
+            )
+            resume = time.time() + delay - RATE_LIMIT_DELAY
+            self._last_request_time = max(self._last_request_time, resume)
+            attempt += 1
     
     async def get_pool_address(self, token_address: str) -> Optional[str]:
         """Get the main pool address for a token."""
         if token_address in self._pool_cache:
             return self._pool_cache[token_address]
         
-        await self._rate_limit()
-        client = await self._get_client()
-        
         try:
             url = f"{GECKO_TERMINAL_API}/networks/solana/tokens/{token_address}/pools"
-            response = await client.get(url)
+            response = await self._request_with_retry(url)
             
             if response.status_code != 200:
                 logger.warning(f"Failed to get pools for {token_address}: {response.status_code}")
                 return None
             
-            data = response.json()
+            data = orjson.loads(response.content)
             pools = data.get("data", [])
             
             if not pools:
@@ -335,6 +1018,7 @@ class PriceHistoryFetcher:
             
             if best_pool:
                 self._pool_cache[token_address] = best_pool
+                self._pool_cache_dirty = True
             
             return best_pool
             
@@ -367,8 +1051,17 @@ class PriceHistoryFetcher:
                 logger.warning(f"No pool found for {token_address}")
                 return None
         
-        await self._rate_limit()
-        client = await self._get_client()
+        cache_path = None
+        if self._cache_dir:
+            cache_path = self._ohlcv_cache_path(pool_address, timeframe_minutes, limit)
+            frame = await asyncio.to_thread(self._read_cached_frame, cache_path)
+            if frame is not None:
+                return PriceHistory(
+                    token_address=token_address,
+                    pool_address=pool_address,
+                    candles=frame,
+                    timeframe_minutes=timeframe_minutes
+                )
         
         try:
             # GeckoTerminal uses aggregate parameter for timeframe
@@ -379,39 +1072,27 @@ class PriceHistoryFetcher:
                 "limit": limit
             }
             
-            response = await client.get(url, params=params)
+            response = await self._request_with_retry(url, params=params)
             
             if response.status_code != 200:
                 logger.warning(f"OHLCV fetch failed for {pool_address}: {response.status_code}")
                 return None
             
-            data = response.json()
+            data = orjson.loads(response.content)
             ohlcv_list = data.get("data", {}).get("attributes", {}).get("ohlcv_list", [])
             
             if not ohlcv_list:
                 return None
             
             # Parse candles: [timestamp, open, high, low, close, volume]
-            candles = []
-            for item in ohlcv_list:
-                if len(item) >= 6:
-                    try:
-                        candle = Candle(
-                            timestamp=datetime.fromtimestamp(item[0]),
-                            open=float(item[1]),
-                            high=float(item[2]),
-                            low=float(item[3]),
-                            close=float(item[4]),
-                            volume=float(item[5])
-                        )
-                        candles.append(candle)
-                    except (ValueError, TypeError) as e:
-                        logger.debug(f"Failed to parse candle: {e}")
+            frame = CandleFrame.from_rows(ohlcv_list)
+            if cache_path is not None:
+                await asyncio.to_thread(self._write_cached_frame, cache_path, frame)
             
             return PriceHistory(
                 token_address=token_address,
                 pool_address=pool_address,
-                candles=candles,
+                candles=frame,
                 timeframe_minutes=timeframe_minutes
             )
             
@@ -440,41 +1121,81 @@ class PriceHistoryFetcher:
         """
         results = {}
         total = len(token_addresses)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
         
-        for i, address in enumerate(token_addresses):
-            try:
-                history = await self.fetch_ohlcv(
-                    address, 
-                    timeframe_minutes=timeframe_minutes,
-                    limit=limit
-                )
+        async def fetch_one(address: str) -> tuple[str, Optional[PriceHistory]]:
+            async with semaphore:
+                try:
+                    history = await self.fetch_ohlcv(
+                        address,
+                        timeframe_minutes=timeframe_minutes,
+                        limit=limit
+                    )
+                    if history:
+                        logger.debug(f"Fetched {len(history.candles)} candles for {address}")
+                    else:
+                        logger.debug(f"No data for {address}")
+                    return address, history
+                except Exception as e:
+                    logger.error(f"Failed to fetch {address}: {e}")
+                    return address, None
+        
+        tasks = [asyncio.create_task(fetch_one(address)) for address in token_addresses]
+        try:
+            for done, next_result in enumerate(asyncio.as_completed(tasks), start=1):
+                address, history = await next_result
                 if history:
                     results[address] = history
-                    logger.debug(f"Fetched {len(history.candles)} candles for {address}")
-                else:
-                    logger.debug(f"No data for {address}")
-            except Exception as e:
-                logger.error(f"Failed to fetch {address}: {e}")
-            
-            if progress_callback:
-                await progress_callback(i + 1, total)
+                if progress_callback:
+                    await progress_callback(done, total)
+        finally:
+            for task in tasks:
+                task.cancel()
         
-        return results
+        # The shared fetcher is never closed, so save new lookups as we go
+        if self._pool_cache_dirty:
+            await self._persist_pool_cache()
+        
+        # Keep the caller's ordering regardless of completion order
+        return {address: results[address] for address in token_addresses if address in results}
     
     async def close(self):
-        """Close the HTTP client."""
+        """Close the HTTP client and persist pool lookups."""
+        await self._persist_pool_cache()
         if self._client:
             await self._client.aclose()
             self._client = None
+    
+    async def __aenter__(self) -> "PriceHistoryFetcher":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
 
 
-# Singleton instance
-_fetcher: Optional[PriceHistoryFetcher] = None
+# Pool lookups outlive any one fetcher; they are the expensive state to rebuild
+_pool_cache: dict[str, str] = {}
+
+# One fetcher per event loop, since an httpx client is bound to the loop it
+# first ran on. Entries go away with their loop.
+_fetchers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, PriceHistoryFetcher]" = (
+    weakref.WeakKeyDictionary()
+)
 
 
 def get_price_fetcher() -> PriceHistoryFetcher:
-    """Get or create the price history fetcher."""
-    global _fetcher
-    if _fetcher is None:
-        _fetcher = PriceHistoryFetcher()
-    return _fetcher
+    """
+    Get or create the price history fetcher for the running event loop.
+    
+    Must be called from a coroutine. Fetchers for different loops share the
+    pool-address cache.
+    """
+    loop = asyncio.get_running_loop()
+    fetcher = _fetchers.get(loop)
+    if fetcher is None:
+        fetcher = PriceHistoryFetcher(
+            cache_dir=DEFAULT_OHLCV_CACHE_DIR,
+            pool_cache=_pool_cache,
+        )
+        _fetchers[loop] = fetcher
+    return fetcher
@@ -11,10 +11,28 @@ Provides comprehensive risk management for the trading bot including:
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass, field
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field, fields
 from datetime import datetime, timezone, timedelta
 from enum import Enum
-from typing import TYPE_CHECKING, Optional, Tuple, List
+from functools import lru_cache
+from typing import TYPE_CHECKING, NamedTuple, Optional, Sequence, Tuple, List
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - exercised only without numba
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback no-op decorator when numba is not installed."""
+        def decorator(func):
+            return func
+        return decorator
 
 if TYPE_CHECKING:
     from src.models import Position
@@ -33,7 +51,7 @@ class StopLossType(str, Enum):
         return self.value
 
 
-@dataclass
+@dataclass(slots=True)
 class StopLossConfig:
     """Configuration for stop loss behavior."""
     enabled: bool = True
@@ -53,7 +71,7 @@ class StopLossConfig:
     atr_multiplier: float = 2.0  # Stop at entry - (ATR * multiplier)
 
 
-@dataclass
+@dataclass(slots=True)
 class PositionSizingConfig:
     """Configuration for dynamic position sizing."""
     enabled: bool = True
@@ -75,7 +93,7 @@ class PositionSizingConfig:
     high_volatility_reduction: float = 0.5  # Reduce by 50% in high vol
 
 
-@dataclass
+@dataclass(slots=True)
 class CircuitBreakerConfig:
     """Configuration for circuit breakers."""
     enabled: bool = True
@@ -89,8 +107,14 @@ class CircuitBreakerConfig:
     # Cooldown period after circuit breaker triggers
     cooldown_minutes: int = 60
 
+    # Rolling drawdown: trigger when cumulative PnL falls more than
+    # rolling_drawdown_limit_pct of capital below its high over the last
+    # rolling_window trades (0 disables)
+    rolling_window: int = 0
+    rolling_drawdown_limit_pct: float = 0.05
 
-@dataclass
+
+@dataclass(slots=True)
 class RiskConfig:
     """Complete risk management configuration."""
     stop_loss: StopLossConfig = field(default_factory=StopLossConfig)
@@ -103,17 +127,171 @@ class RiskConfig:
     max_hold_time_hours: int = 72  # Force exit after 72 hours
 
 
-@dataclass
+# Stop codes used by stop evaluation, in evaluation priority order
+STOP_DISABLED = -1
+STOP_NONE = 0
+STOP_FIXED = 1
+STOP_TRAILING = 2
+STOP_TIME = 3
+STOP_ATR = 4
+
+_STOP_CODE_TYPES: Tuple[Optional[StopLossType], ...] = (
+    None,
+    StopLossType.FIXED_PERCENTAGE,
+    StopLossType.TRAILING,
+    StopLossType.TIME_BASED,
+    StopLossType.ATR_BASED,
+)
+
+
+@njit(cache=True, nogil=True)
+def _eval_stops(
+    current, peak, hold_hours, atr,
+    fixed_enabled, fixed_level, trail_activation, trail_retention,
+    time_limit_hours, atr_mult,
+):
+    """
+    Stop loss rules for one position, in evaluation priority order.
+
+    The fixed, trailing and ATR rules are all "current at or below a level",
+    so they are fused into one comparison against the highest active level;
+    which rule fired is only worked out once something has.
+
+    Args:
+        current, peak: Current and peak multipliers
+        hold_hours: Hours held
+        atr: ATR, or NaN to skip the ATR stop
+        fixed_enabled: Whether the fixed percentage stop applies
+        fixed_level, trail_activation, trail_retention, time_limit_hours,
+            atr_mult: Precomputed config values
+
+    Returns:
+        (STOP_* code, stop level that was breached; ATR level for STOP_ATR)
+    """
+    if not fixed_enabled:
+        fixed_level = -np.inf
+    trail_level = peak * trail_retention if peak >= trail_activation else -np.inf
+    atr_level = 1.0 - atr * atr_mult
+    if atr_level != atr_level:  # NaN ATR: no ATR stop
+        atr_level = -np.inf
+    time_hit = hold_hours >= time_limit_hours and current < 1.0
+
+    if current <= max(fixed_level, trail_level, atr_level):
+        # Report the highest-priority rule that fired
+        if current <= fixed_level:
+            return STOP_FIXED, fixed_level
+        if current <= trail_level:
+            return STOP_TRAILING, trail_level
+        if time_hit:
+            return STOP_TIME, 1.0
+        return STOP_ATR, atr_level
+    if time_hit:
+        return STOP_TIME, 1.0
+    return STOP_NONE, 0.0
+
+
+if NUMBA_AVAILABLE:
+    # Compile at import so the first evaluation doesn't pay for it
+    _eval_stops(1.0, 1.0, 0.0, np.nan, True, 0.75, 1.5, 0.8, 24.0, 2.0)
+
+
+def _stop_reason(
+    code: int,
+    current_multiplier: float,
+    peak_multiplier: float = 1.0,
+    hold_hours: float = 0.0,
+    atr_stop_level: float = 0.0,
+) -> str:
+    """Human-readable reason for a triggered stop code."""
+    if code == STOP_FIXED:
+        loss_pct = (1.0 - current_multiplier) * 100
+        return f"Fixed stop loss triggered at {current_multiplier:.2f}X ({loss_pct:.1f}% loss)"
+    if code == STOP_TRAILING:
+        drop_pct = ((peak_multiplier - current_multiplier) / peak_multiplier) * 100
+        return f"Trailing stop triggered: {current_multiplier:.2f}X (dropped {drop_pct:.1f}% from peak {peak_multiplier:.2f}X)"
+    if code == STOP_TIME:
+        return f"Time stop triggered: held {hold_hours:.1f}h while underwater ({current_multiplier:.2f}X)"
+    if code == STOP_ATR:
+        return f"ATR stop triggered at {current_multiplier:.2f}X (ATR-based stop at {atr_stop_level:.2f}X)"
+    if code == STOP_DISABLED:
+        return "Stop loss disabled"
+    return "No stop loss triggered"
+
+
+@dataclass(frozen=True, slots=True)
 class StopLossResult:
-    """Result of a stop loss evaluation."""
+    """
+    Result of a stop loss evaluation.
+
+    Only the stop code and the numbers behind it are stored; the reason
+    text is formatted when something reads it.
+    """
     should_exit: bool
-    reason: str
+    code: int = STOP_NONE  # STOP_* code of the rule that fired
     exit_percentage: float = 100.0  # Percentage of position to exit
     current_multiplier: float = 1.0
-    stop_type: Optional[StopLossType] = None
+    peak_multiplier: float = 1.0
+    hold_hours: float = 0.0
+    atr_stop_level: float = 0.0
+
+    @property
+    def reason(self) -> str:
+        return _stop_reason(
+            self.code,
+            self.current_multiplier,
+            self.peak_multiplier,
+            self.hold_hours,
+            self.atr_stop_level,
+        )
+
+    @property
+    def stop_type(self) -> Optional[StopLossType]:
+        return _STOP_CODE_TYPES[self.code] if self.code > STOP_NONE else None
+
+
+@dataclass(slots=True)
+class StopLossBatchResult:
+    """
+    Stop loss decisions for many positions, as parallel arrays.
+
+    Results are only built for the rows asked for via result().
+    """
+    stop_codes: np.ndarray  # STOP_* code per position
+    current_multipliers: np.ndarray
+    peak_multipliers: np.ndarray
+    hold_hours: np.ndarray  # 0 where not underwater, as in evaluate()
+    atr_stop_levels: np.ndarray  # ATR level where the ATR stop fired, else 0
+
+    @property
+    def should_exit(self) -> np.ndarray:
+        """Boolean mask of positions whose stop triggered."""
+        return self.stop_codes > STOP_NONE
+
+    @property
+    def exit_indices(self) -> np.ndarray:
+        """Indices of positions whose stop triggered."""
+        return np.flatnonzero(self.stop_codes > STOP_NONE)
+
+    def result(self, index: int) -> StopLossResult:
+        """Build the StopLossResult for one position, as evaluate() would."""
+        code = int(self.stop_codes[index])
+        if code == STOP_DISABLED:
+            return StopLossResult(
+                should_exit=False,
+                code=STOP_DISABLED,
+                current_multiplier=float(self.current_multipliers[index]),
+            )
+        return StopLossResult(
+            should_exit=code != STOP_NONE,
+            code=code,
+            current_multiplier=float(self.current_multipliers[index]),
+            peak_multiplier=float(self.peak_multipliers[index]),
+            hold_hours=float(self.hold_hours[index]),
+            atr_stop_level=float(self.atr_stop_levels[index]),
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class PositionSizeResult:
     """Result of position size calculation."""
     size_sol: float
@@ -123,7 +301,7 @@ class PositionSizeResult:
     volatility_factor: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PortfolioRiskMetrics:
     """Current portfolio risk metrics."""
     total_positions: int = 0
@@ -140,8 +318,11 @@ class PortfolioRiskMetrics:
 class StopLossManager:
     """Manages stop loss logic for positions."""
 
+    _CONFIG_FIELDS = frozenset(f.name for f in fields(StopLossConfig))
+
     def __init__(self, config: StopLossConfig):
         self._config = config
+        self._refresh_levels()
 
     @property
     def config(self) -> StopLossConfig:
@@ -150,8 +331,22 @@ class StopLossManager:
     def update_config(self, **kwargs) -> None:
         """Update stop loss configuration."""
         for key, value in kwargs.items():
-            if hasattr(self._config, key):
+            if key in self._CONFIG_FIELDS:
                 setattr(self._config, key, value)
+            else:
+                logger.warning(f"Ignoring unknown {type(self).__name__} config key: {key}")
+        self._refresh_levels()
+
+    def _refresh_levels(self) -> None:
+        """Precompute the config-derived stop levels used on every check."""
+        # The fixed stop is the only rule gated on stop_loss_type; trailing,
+        # time and ATR stops always apply as overlays
+        self._fixed_enabled = self._config.stop_loss_type == StopLossType.FIXED_PERCENTAGE
+        self._fixed_stop_level = float(1.0 - self._config.fixed_percentage)
+        self._trail_activation = float(self._config.trailing_activation)
+        self._trail_retention = float(1.0 - self._config.trailing_percentage)
+        self._time_limit_hours = float(self._config.time_limit_hours)
+        self._atr_mult = float(self._config.atr_multiplier)
 
     def evaluate(
         self,
@@ -175,7 +370,7 @@ class StopLossManager:
         if not self._config.enabled:
             return StopLossResult(
                 should_exit=False,
-                reason="Stop loss disabled",
+                code=STOP_DISABLED,
                 current_multiplier=current_multiplier,
             )
 
@@ -183,118 +378,133 @@ class StopLossManager:
         if peak_multiplier is None:
             peak_multiplier = getattr(position, 'peak_multiplier', current_multiplier)
 
-        # Check each stop loss type
-        result = self._check_fixed_stop(current_multiplier)
-        if result.should_exit:
-            return result
-
-        result = self._check_trailing_stop(current_multiplier, peak_multiplier)
-        if result.should_exit:
-            return result
-
-        result = self._check_time_stop(position, current_multiplier)
-        if result.should_exit:
-            return result
-
-        if atr is not None:
-            result = self._check_atr_stop(current_multiplier, atr)
-            if result.should_exit:
-                return result
+        # The time stop only applies underwater, so skip the clock read otherwise
+        hold_hours = position.holding_duration if current_multiplier < 1.0 else 0.0
+        code, level = _eval_stops(
+            float(current_multiplier),
+            float(peak_multiplier),
+            float(hold_hours),
+            np.nan if atr is None else float(atr),
+            self._fixed_enabled,
+            self._fixed_stop_level,
+            self._trail_activation,
+            self._trail_retention,
+            self._time_limit_hours,
+            self._atr_mult,
+        )
 
         return StopLossResult(
-            should_exit=False,
-            reason="No stop loss triggered",
+            should_exit=code != STOP_NONE,
+            code=code,
             current_multiplier=current_multiplier,
+            peak_multiplier=peak_multiplier,
+            hold_hours=hold_hours,
+            # level is whichever stop fired; only an ATR level belongs here
+            atr_stop_level=level if code == STOP_ATR else 0.0,
         )
 
-    def _check_fixed_stop(self, current_multiplier: float) -> StopLossResult:
-        """Check fixed percentage stop loss."""
-        if self._config.stop_loss_type != StopLossType.FIXED_PERCENTAGE:
-            return StopLossResult(should_exit=False, reason="", current_multiplier=current_multiplier)
-
-        stop_level = 1.0 - self._config.fixed_percentage
+    def evaluate_batch(
+        self,
+        current_multipliers: Sequence[float],
+        peak_multipliers: Sequence[float],
+        hold_hours: Sequence[float],
+        atrs: Optional[Sequence[float]] = None,
+    ) -> StopLossBatchResult:
+        """
+        Evaluate stop losses for many positions in one vectorized pass.
 
-        if current_multiplier <= stop_level:
-            loss_pct = (1.0 - current_multiplier) * 100
-            return StopLossResult(
-                should_exit=True,
-                reason=f"Fixed stop loss triggered at {current_multiplier:.2f}X ({loss_pct:.1f}% loss)",
-                current_multiplier=current_multiplier,
-                stop_type=StopLossType.FIXED_PERCENTAGE,
-            )
+        Applies the same rules and priority as evaluate().
 
-        return StopLossResult(should_exit=False, reason="", current_multiplier=current_multiplier)
+        Args:
+            current_multipliers: Current multiplier per position
+            peak_multipliers: Peak multiplier per position
+            hold_hours: Hours held per position
+            atrs: ATR per position (NaN to skip the ATR stop), or None
 
-    def _check_trailing_stop(
-        self,
-        current_multiplier: float,
-        peak_multiplier: float,
-    ) -> StopLossResult:
-        """Check trailing stop loss."""
-        # Only activate trailing stop if we've reached activation level
-        if peak_multiplier < self._config.trailing_activation:
-            return StopLossResult(should_exit=False, reason="", current_multiplier=current_multiplier)
+        Returns:
+            StopLossBatchResult with one stop code per position
+        """
+        current = np.asarray(current_multipliers, dtype=np.float64)
+        peak = np.asarray(peak_multipliers, dtype=np.float64)
+        hours = np.asarray(hold_hours, dtype=np.float64)
+        if atrs is None:
+            atr_levels = np.full_like(current, np.nan)
+        else:
+            atr_levels = 1.0 - np.asarray(atrs, dtype=np.float64) * self._atr_mult
 
-        # Calculate trailing stop level
-        trail_level = peak_multiplier * (1.0 - self._config.trailing_percentage)
+        # evaluate() only reports hold time while underwater
+        hours = np.where(current < 1.0, hours, 0.0)
 
-        if current_multiplier <= trail_level:
-            drop_pct = ((peak_multiplier - current_multiplier) / peak_multiplier) * 100
-            return StopLossResult(
-                should_exit=True,
-                reason=f"Trailing stop triggered: {current_multiplier:.2f}X (dropped {drop_pct:.1f}% from peak {peak_multiplier:.2f}X)",
-                current_multiplier=current_multiplier,
-                stop_type=StopLossType.TRAILING,
+        codes = np.zeros(len(current), dtype=np.int8)
+        if not self._config.enabled:
+            codes.fill(STOP_DISABLED)
+        else:
+            fixed_level = self._fixed_stop_level if self._fixed_enabled else -np.inf
+            trail_levels = np.where(
+                peak >= self._trail_activation, peak * self._trail_retention, -np.inf
+            )
+            atr_active = np.nan_to_num(atr_levels, nan=-np.inf)
+            time_hit = (hours >= self._time_limit_hours) & (current < 1.0)
+
+            # One comparison against the highest active level covers three rules
+            stop_levels = np.maximum(np.maximum(trail_levels, atr_active), fixed_level)
+            hit = np.flatnonzero((current <= stop_levels) | time_hit)
+
+            # np.select takes the first matching condition, i.e. evaluate()'s order
+            cur = current[hit]
+            codes[hit] = np.select(
+                [cur <= fixed_level, cur <= trail_levels[hit], time_hit[hit]],
+                [STOP_FIXED, STOP_TRAILING, STOP_TIME],
+                default=STOP_ATR,
             )
 
-        return StopLossResult(should_exit=False, reason="", current_multiplier=current_multiplier)
+        return StopLossBatchResult(
+            stop_codes=codes,
+            current_multipliers=current,
+            peak_multipliers=peak,
+            hold_hours=hours,
+            atr_stop_levels=np.where(codes == STOP_ATR, atr_levels, 0.0),
+        )
 
-    def _check_time_stop(
-        self,
-        position: "Position",
-        current_multiplier: float,
-    ) -> StopLossResult:
-        """Check time-based stop loss."""
-        hold_hours = position.holding_duration
 
-        if hold_hours >= self._config.time_limit_hours and current_multiplier < 1.0:
-            return StopLossResult(
-                should_exit=True,
-                reason=f"Time stop triggered: held {hold_hours:.1f}h while underwater ({current_multiplier:.2f}X)",
-                current_multiplier=current_multiplier,
-                stop_type=StopLossType.TIME_BASED,
-            )
+# Index of the 1.0 factor in PositionSizer's volatility factor table
+_NEUTRAL_VOL_BUCKET = 1
 
-        return StopLossResult(should_exit=False, reason="", current_multiplier=current_multiplier)
 
-    def _check_atr_stop(
-        self,
-        current_multiplier: float,
-        atr: float,
-    ) -> StopLossResult:
-        """Check ATR-based stop loss."""
-        # ATR stop: entry - (ATR * multiplier) as a multiplier
-        # This requires entry price context, simplified here
-        atr_stop_distance = atr * self._config.atr_multiplier
-        atr_stop_level = 1.0 - atr_stop_distance
+@lru_cache(maxsize=256)
+def _quality_multiplier(score: int, min_multiplier: float, max_multiplier: float) -> float:
+    """Size multiplier for a whole-point quality score (0-100)."""
+    # Linear interpolation between min and max multipliers
+    return min_multiplier + (score / 100) * (max_multiplier - min_multiplier)
 
-        if current_multiplier <= atr_stop_level:
-            return StopLossResult(
-                should_exit=True,
-                reason=f"ATR stop triggered at {current_multiplier:.2f}X (ATR-based stop at {atr_stop_level:.2f}X)",
-                current_multiplier=current_multiplier,
-                stop_type=StopLossType.ATR_BASED,
-            )
 
-        return StopLossResult(should_exit=False, reason="", current_multiplier=current_multiplier)
+@lru_cache(maxsize=128)
+def _kelly_factor(win_rate_pct: int) -> float:
+    """Kelly Criterion-inspired sizing factor for a whole-percent win rate."""
+    # Simplified Kelly: f = (bp - q) / b
+    # Where b = win/loss ratio (assume 2:1), p = win rate, q = 1-p
+    b = 2.0  # Expected win/loss ratio
+    p = win_rate_pct / 100
+    q = 1 - p
+
+    kelly = (b * p - q) / b
+
+    # Use fractional Kelly (25%) for safety
+    fractional_kelly = kelly * 0.25
+
+    # Clamp to reasonable range
+    return max(0.5, min(1.5, 1.0 + fractional_kelly))
 
 
 class PositionSizer:
     """Calculates optimal position sizes based on risk parameters."""
 
+    _CONFIG_FIELDS = frozenset(f.name for f in fields(PositionSizingConfig))
+
     def __init__(self, config: PositionSizingConfig, capital: float = 10.0):
         self._config = config
         self._capital = capital
+        self._refresh_vol_factors()
 
     @property
     def config(self) -> PositionSizingConfig:
@@ -312,8 +522,18 @@ class PositionSizer:
     def update_config(self, **kwargs) -> None:
         """Update position sizing configuration."""
         for key, value in kwargs.items():
-            if hasattr(self._config, key):
+            if key in self._CONFIG_FIELDS:
                 setattr(self._config, key, value)
+            else:
+                logger.warning(f"Ignoring unknown {type(self).__name__} config key: {key}")
+        self._refresh_vol_factors()
+
+    def _refresh_vol_factors(self) -> None:
+        """Precompute the size factor for each volatility bucket."""
+        self._vol_factors = np.array(
+            [1.25, 1.0, 0.75, self._config.high_volatility_reduction],
+            dtype=np.float64,
+        )
 
     def calculate_size(
         self,
@@ -387,43 +607,78 @@ class PositionSizer:
 
     def _calculate_quality_multiplier(self, score: float) -> float:
         """Calculate size multiplier based on signal quality score (0-100)."""
-        # Linear interpolation between min and max multipliers
-        normalized = max(0, min(100, score)) / 100
-        mult_range = self._config.max_size_multiplier - self._config.min_size_multiplier
-        return self._config.min_size_multiplier + (normalized * mult_range)
+        # Scores are bucketed to whole points so results can be cached
+        return _quality_multiplier(
+            round(max(0, min(100, score))),
+            self._config.min_size_multiplier,
+            self._config.max_size_multiplier,
+        )
 
     def _calculate_volatility_factor(self, volatility: float) -> float:
         """Calculate size factor based on volatility."""
-        # High volatility (>20%) reduces size, low volatility (<5%) increases
-        if volatility > 0.20:
-            return self._config.high_volatility_reduction
-        elif volatility > 0.10:
-            return 0.75
-        elif volatility < 0.05:
-            return 1.25
-        else:
-            return 1.0
+        # High volatility (>20%) reduces size, low volatility (<5%) increases.
+        # The bucket index is a sum of comparisons rather than an if/elif ladder.
+        # NaN/inf fail every comparison or pass them all, so non-finite
+        # readings go to the neutral 1.0 bucket rather than resizing.
+        if not math.isfinite(volatility):
+            return float(self._vol_factors[_NEUTRAL_VOL_BUCKET])
+        bucket = (volatility >= 0.05) + (volatility > 0.10) + (volatility > 0.20)
+        return float(self._vol_factors[bucket])
+
+    def calculate_volatility_factors(self, volatilities: Sequence[float]) -> np.ndarray:
+        """
+        Size factors for many volatility readings at once.
+
+        Args:
+            volatilities: Volatility measures (e.g., ATR as percentage)
+
+        Returns:
+            Array of factors, as _calculate_volatility_factor per element
+        """
+        vol = np.asarray(volatilities, dtype=np.float64)
+        bucket = (vol >= 0.05).astype(np.intp) + (vol > 0.10) + (vol > 0.20)
+        bucket[~np.isfinite(vol)] = _NEUTRAL_VOL_BUCKET
+        return self._vol_factors[bucket]
 
     def _calculate_kelly_factor(self, win_rate: float) -> float:
         """Calculate Kelly Criterion-inspired sizing factor."""
-        # Simplified Kelly: f = (bp - q) / b
-        # Where b = win/loss ratio (assume 2:1), p = win rate, q = 1-p
-        b = 2.0  # Expected win/loss ratio
-        p = win_rate
-        q = 1 - p
+        # Win rates are bucketed to whole percentage points so results can be cached.
+        # NaN gets the neutral 1.0; the factor is already clamped outside [-1, 2],
+        # so clipping there keeps infinities bucketable without changing results.
+        if math.isnan(win_rate):
+            return 1.0
+        return _kelly_factor(round(min(max(win_rate, -1.0), 2.0) * 100))
 
-        kelly = (b * p - q) / b
 
-        # Use fractional Kelly (25%) for safety
-        fractional_kelly = kelly * 0.25
+# Circuit breaker trigger codes
+TRIGGER_DAILY_LOSS = 0
+TRIGGER_CONSECUTIVE_LOSSES = 1
+TRIGGER_ROLLING_DRAWDOWN = 2
 
-        # Clamp to reasonable range
-        return max(0.5, min(1.5, 1.0 + fractional_kelly))
+
+class TriggerReason(NamedTuple):
+    """Why a circuit breaker fired; formatted into text only when shown."""
+    code: int
+    value: float  # Daily PnL, loss count or drawdown, depending on code
+    limit: float
+    window: int = 0  # Rolling window length for TRIGGER_ROLLING_DRAWDOWN
+
+    def __str__(self) -> str:
+        if self.code == TRIGGER_DAILY_LOSS:
+            return f"Daily loss limit reached: {self.value:.4f} SOL (limit: -{self.limit:.4f})"
+        if self.code == TRIGGER_CONSECUTIVE_LOSSES:
+            return f"Consecutive loss limit reached: {self.value:.0f} losses"
+        return (
+            f"Rolling drawdown limit reached: {self.value:.4f} SOL below the "
+            f"{self.window}-trade high (limit: {self.limit:.4f})"
+        )
 
 
 class CircuitBreaker:
     """Manages circuit breakers to halt trading during adverse conditions."""
 
+    _CONFIG_FIELDS = frozenset(f.name for f in fields(CircuitBreakerConfig))
+
     def __init__(self, config: CircuitBreakerConfig, capital: float = 10.0):
         self._config = config
         self._capital = capital
@@ -438,9 +693,17 @@ class CircuitBreaker:
         self._consecutive_losses: int = 0
         self._last_trade_profitable: Optional[bool] = None
 
-        # Circuit breaker state
+        # Rolling drawdown tracking: cumulative PnL plus a monotonic deque of
+        # (trade index, cumulative PnL) whose head is the window's high
+        self._trade_count: int = 0
+        self._cumulative_pnl: float = 0.0
+        self._window_max: deque[Tuple[int, float]] = deque([(0, 0.0)])
+
+        # Circuit breaker state. The cooldown is checked against a monotonic
+        # deadline; the wall-clock time is only kept for display.
         self._is_triggered: bool = False
-        self._trigger_reason: Optional[str] = None
+        self._trigger_reason: Optional[TriggerReason] = None
+        self._cooldown_deadline: Optional[float] = None
         self._cooldown_until: Optional[datetime] = None
 
     @property
@@ -454,14 +717,15 @@ class CircuitBreaker:
             return False
 
         # Check if cooldown has expired
-        if self._cooldown_until and datetime.now(timezone.utc) >= self._cooldown_until:
+        if self._cooldown_deadline is not None and time.monotonic() >= self._cooldown_deadline:
             self._reset()
 
         return self._is_triggered
 
     @property
     def trigger_reason(self) -> Optional[str]:
-        return self._trigger_reason
+        """Why the breaker fired, formatted on access."""
+        return str(self._trigger_reason) if self._trigger_reason is not None else None
 
     @property
     def cooldown_until(self) -> Optional[datetime]:
@@ -475,8 +739,10 @@ class CircuitBreaker:
     def update_config(self, **kwargs) -> None:
         """Update circuit breaker configuration."""
         for key, value in kwargs.items():
-            if hasattr(self._config, key):
+            if key in self._CONFIG_FIELDS:
                 setattr(self._config, key, value)
+            else:
+                logger.warning(f"Ignoring unknown {type(self).__name__} config key: {key}")
 
     def record_trade(self, pnl: float) -> bool:
         """
@@ -492,7 +758,8 @@ class CircuitBreaker:
             return False
 
         # Reset daily tracking if new day
-        self._check_day_reset()
+        now = datetime.now(timezone.utc)
+        self._check_day_reset(now)
 
         # Update daily PnL
         self._daily_pnl += pnl
@@ -505,8 +772,11 @@ class CircuitBreaker:
             self._consecutive_losses += 1
         self._last_trade_profitable = is_profitable
 
+        if self._config.rolling_window > 0:
+            self._update_window_max(pnl)
+
         # Check circuit breaker conditions
-        return self._check_triggers()
+        return self._check_triggers(now)
 
     def can_trade(self) -> Tuple[bool, Optional[str]]:
         """
@@ -519,15 +789,14 @@ class CircuitBreaker:
             return True, None
 
         # Check cooldown
-        if self._cooldown_until:
-            if datetime.now(timezone.utc) < self._cooldown_until:
-                remaining = (self._cooldown_until - datetime.now(timezone.utc)).total_seconds() / 60
-                return False, f"Circuit breaker cooldown: {remaining:.0f}m remaining"
-            else:
-                self._reset()
+        if self._cooldown_deadline is not None:
+            remaining = self._cooldown_deadline - time.monotonic()
+            if remaining > 0:
+                return False, f"Circuit breaker cooldown: {remaining / 60:.0f}m remaining"
+            self._reset()
 
         if self._is_triggered:
-            return False, self._trigger_reason
+            return False, self.trigger_reason
 
         return True, None
 
@@ -543,44 +812,84 @@ class CircuitBreaker:
             "consecutive_losses": self._consecutive_losses,
             "consecutive_limit": self._config.consecutive_loss_limit,
             "is_triggered": self._is_triggered,
-            "trigger_reason": self._trigger_reason,
+            "trigger_reason": self.trigger_reason,
             "cooldown_until": self._cooldown_until.isoformat() if self._cooldown_until else None,
         }
 
-    def _check_triggers(self) -> bool:
+    def _check_triggers(self, now: Optional[datetime] = None) -> bool:
         """Check all circuit breaker conditions."""
         # Daily loss limit
         daily_limit = self._capital * self._config.daily_loss_limit_pct
         if self._daily_pnl <= -daily_limit:
-            self._trigger(f"Daily loss limit reached: {self._daily_pnl:.4f} SOL (limit: -{daily_limit:.4f})")
+            self._trigger(TriggerReason(TRIGGER_DAILY_LOSS, self._daily_pnl, daily_limit), now)
             return True
 
         # Consecutive losses
         if self._consecutive_losses >= self._config.consecutive_loss_limit:
-            self._trigger(f"Consecutive loss limit reached: {self._consecutive_losses} losses")
+            self._trigger(
+                TriggerReason(
+                    TRIGGER_CONSECUTIVE_LOSSES,
+                    self._consecutive_losses,
+                    self._config.consecutive_loss_limit,
+                ),
+                now,
+            )
             return True
 
+        # Rolling drawdown from the recent cumulative PnL high
+        if self._config.rolling_window > 0:
+            drawdown_limit = self._capital * self._config.rolling_drawdown_limit_pct
+            drawdown = self._window_max[0][1] - self._cumulative_pnl
+            if drawdown > drawdown_limit:
+                self._trigger(
+                    TriggerReason(
+                        TRIGGER_ROLLING_DRAWDOWN,
+                        drawdown,
+                        drawdown_limit,
+                        self._config.rolling_window,
+                    ),
+                    now,
+                )
+                return True
+
         return False
 
-    def _trigger(self, reason: str) -> None:
+    def _update_window_max(self, pnl: float) -> None:
+        """Add a trade to the cumulative PnL and slide the window's high (O(1) amortized)."""
+        self._trade_count += 1
+        self._cumulative_pnl += pnl
+        window = self._window_max
+
+        # Older points that can never be the max again are dropped from the tail
+        while window and window[-1][1] <= self._cumulative_pnl:
+            window.pop()
+        window.append((self._trade_count, self._cumulative_pnl))
+
+        # Points that slid out of the window are dropped from the head
+        while window[0][0] <= self._trade_count - self._config.rolling_window:
+            window.popleft()
+
+    def _trigger(self, reason: TriggerReason, now: Optional[datetime] = None) -> None:
         """Trigger the circuit breaker."""
+        cooldown = timedelta(minutes=self._config.cooldown_minutes)
         self._is_triggered = True
         self._trigger_reason = reason
-        self._cooldown_until = datetime.now(timezone.utc) + timedelta(
-            minutes=self._config.cooldown_minutes
-        )
-        logger.warning(f"Circuit breaker triggered: {reason}")
+        self._cooldown_deadline = time.monotonic() + cooldown.total_seconds()
+        self._cooldown_until = (now or datetime.now(timezone.utc)) + cooldown
+        logger.warning("Circuit breaker triggered: %s", reason)
 
     def _reset(self) -> None:
         """Reset circuit breaker state."""
         self._is_triggered = False
         self._trigger_reason = None
+        self._cooldown_deadline = None
         self._cooldown_until = None
         logger.info("Circuit breaker reset")
 
-    def _check_day_reset(self) -> None:
+    def _check_day_reset(self, now: Optional[datetime] = None) -> None:
         """Reset daily tracking if it's a new day."""
-        now = datetime.now(timezone.utc)
+        if now is None:
+            now = datetime.now(timezone.utc)
         today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
 
         if today_start > self._day_start:
@@ -589,14 +898,57 @@ class CircuitBreaker:
             logger.info("Daily PnL tracking reset for new day")
 
 
+# Starting row capacity of RiskManager's position arrays (doubles as needed)
+_INITIAL_CAPACITY = 16
+
+# Fixed part of RiskManager.format_status, filled in with one format_map call
+_STATUS_TEMPLATE = (
+    "📊 **Risk Management Status**\n"
+    "\n"
+    "💰 Capital: {capital:.2f} SOL\n"
+    "📈 Total Exposure: {exposure:.4f} SOL\n"
+    "🔥 Portfolio Heat: {heat:.1%} (max {max_heat:.0%})\n"
+    "📉 Daily PnL: {daily_pnl:+.4f} SOL\n"
+    "\n"
+    "🛑 **Stop Loss Settings**\n"
+    "  • Enabled: {sl_enabled}\n"
+    "  • Type: {sl_type}\n"
+    "  • Fixed %: {sl_fixed:.0%}\n"
+    "  • Trailing: {sl_trailing:.0%} (after {sl_activation}X)\n"
+    "\n"
+    "⚡ **Circuit Breaker**\n"
+    "  • Status: {cb_status}"
+)
+
+
 class RiskManager:
     """
     Central risk management coordinator.
 
     Combines stop loss, position sizing, and circuit breaker functionality.
+
+    The portfolio circuit breaker sees every trade. When strategies are
+    given, each also gets its own breaker sized to its capital allocation,
+    so one strategy's losses halt that strategy without being smeared into
+    (or masked by) the others.
     """
 
-    def __init__(self, config: Optional[RiskConfig] = None, capital: float = 10.0):
+    def __init__(
+        self,
+        config: Optional[RiskConfig] = None,
+        capital: float = 10.0,
+        strategy_ids: Optional[Sequence[str]] = None,
+        allocations: Optional[dict[str, float]] = None,
+    ):
+        """
+        Initialize the risk manager.
+
+        Args:
+            config: Risk configuration (defaults if None)
+            capital: Trading capital in SOL
+            strategy_ids: Strategies that get their own circuit breaker
+            allocations: Fraction of capital per strategy (equal split if None)
+        """
         self._config = config or RiskConfig()
         self._capital = capital
 
@@ -605,9 +957,24 @@ class RiskManager:
         self._position_sizer = PositionSizer(self._config.position_sizing, capital)
         self._circuit_breaker = CircuitBreaker(self._config.circuit_breaker, capital)
 
-        # Portfolio tracking
+        # Per-strategy breakers share the circuit breaker config
+        strategy_ids = list(strategy_ids or [])
+        if allocations is None:
+            allocations = {sid: 1.0 / len(strategy_ids) for sid in strategy_ids}
+        self._allocations: dict[str, float] = {sid: allocations[sid] for sid in strategy_ids}
+        self._circuit_breakers: dict[str, CircuitBreaker] = {
+            sid: CircuitBreaker(self._config.circuit_breaker, capital * allocation)
+            for sid, allocation in self._allocations.items()
+        }
+
+        # Portfolio tracking: the object list plus parallel arrays (row i
+        # describes _open_positions[i]) so portfolio queries are array ops
         self._open_positions: List["Position"] = []
+        self._sizes = np.zeros(_INITIAL_CAPACITY)
+        self._open_times = np.zeros(_INITIAL_CAPACITY)
+        self._is_open = np.zeros(_INITIAL_CAPACITY, dtype=bool)
         self._total_exposure: float = 0.0
+        self._refresh_heat_limit()
 
     @property
     def config(self) -> RiskConfig:
@@ -625,42 +992,153 @@ class RiskManager:
     def circuit_breaker(self) -> CircuitBreaker:
         return self._circuit_breaker
 
+    @property
+    def circuit_breakers(self) -> dict[str, CircuitBreaker]:
+        """Per-strategy circuit breakers, keyed by strategy id."""
+        return self._circuit_breakers
+
+    def _strategy_breaker(self, strategy_id: str) -> CircuitBreaker:
+        """Look up a strategy's circuit breaker."""
+        try:
+            return self._circuit_breakers[strategy_id]
+        except KeyError:
+            raise ValueError(f"Unknown strategy: {strategy_id}") from None
+
     def set_capital(self, capital: float) -> None:
         """Update capital across all components."""
         if capital > 0:
             self._capital = capital
             self._position_sizer.set_capital(capital)
             self._circuit_breaker.set_capital(capital)
+            for sid, breaker in self._circuit_breakers.items():
+                breaker.set_capital(capital * self._allocations[sid])
+            self._refresh_heat_limit()
 
     def update_positions(self, positions: List["Position"]) -> None:
-        """Update tracked open positions."""
-        self._open_positions = positions
-        self._total_exposure = sum(p.buy_amount_sol for p in positions if p.is_open or p.is_partially_sold)
+        """
+        Replace tracked open positions and recompute exposure from scratch.
 
-    def can_open_position(self, proposed_size: float) -> Tuple[bool, Optional[str]]:
+        Use on startup or to reconcile; on_position_opened/closed keep the
+        totals current between reconciliations.
+        """
+        self._open_positions = []
+        for position in positions:
+            self._append_position(position)
+        self._refresh_exposure()
+
+    def on_position_opened(self, position: "Position") -> None:
+        """Track a newly opened position."""
+        self._append_position(position)
+        self._total_exposure += position.buy_amount_sol
+
+    def on_position_closed(self, position: "Position") -> None:
+        """Stop tracking a fully closed position."""
+        try:
+            index = self._open_positions.index(position)
+        except ValueError:
+            return
+        del self._open_positions[index]
+        # Shift the tail down so rows stay aligned with the list
+        count = len(self._open_positions)
+        for array in (self._sizes, self._open_times, self._is_open):
+            array[index:count] = array[index + 1:count + 1]
+        self._refresh_exposure()
+
+    def _append_position(self, position: "Position") -> None:
+        """Add a position to the list and its row to the arrays."""
+        index = len(self._open_positions)
+        if index == len(self._sizes):
+            capacity = 2 * index
+            self._sizes = np.resize(self._sizes, capacity)
+            self._open_times = np.resize(self._open_times, capacity)
+            self._is_open = np.resize(self._is_open, capacity)
+        self._open_positions.append(position)
+        self._sizes[index] = position.buy_amount_sol
+        self._open_times[index] = position.buy_time.timestamp()
+        self._is_open[index] = position.is_open or position.is_partially_sold
+
+    def _refresh_exposure(self) -> None:
+        """Recompute total exposure from the tracked rows."""
+        count = len(self._open_positions)
+        self._total_exposure = float(self._sizes[:count][self._is_open[:count]].sum())
+
+    def _holding_hours(self, now: Optional[float] = None) -> np.ndarray:
+        """Holding duration in hours for each tracked position."""
+        if now is None:
+            now = time.time()
+        count = len(self._open_positions)
+        return (now - self._open_times[:count]) / 3600.0
+
+    def _refresh_heat_limit(self) -> None:
+        """
+        Recompute the portfolio heat limit in SOL.
+
+        Call after any change to capital or max_portfolio_heat.
+        """
+        if self._capital > 0:
+            self._heat_limit_sol = self._capital * self._config.max_portfolio_heat
+        else:
+            self._heat_limit_sol = float("inf")
+
+    def can_open_position(
+        self,
+        proposed_size: float,
+        strategy_id: Optional[str] = None,
+    ) -> Tuple[bool, Optional[str]]:
         """
         Check if a new position can be opened.
 
         Args:
             proposed_size: Size of proposed position in SOL
+            strategy_id: Strategy opening the position, if any
 
         Returns:
             Tuple of (can_open, reason if not)
         """
-        # Check circuit breaker
+        # Check circuit breakers: portfolio-wide, then the strategy's own
         can_trade, reason = self._circuit_breaker.can_trade()
         if not can_trade:
             return False, reason
-
-        # Check portfolio heat
-        current_heat = self._total_exposure / self._capital if self._capital > 0 else 0
-        new_heat = (self._total_exposure + proposed_size) / self._capital if self._capital > 0 else 0
-
-        if new_heat > self._config.max_portfolio_heat:
+        if strategy_id is not None:
+            can_trade, reason = self._strategy_breaker(strategy_id).can_trade()
+            if not can_trade:
+                return False, f"[{strategy_id}] {reason}"
+
+        # Check portfolio heat; the percentages are only worked out on rejection
+        if self._total_exposure + proposed_size > self._heat_limit_sol:
+            current_heat = self._total_exposure / self._capital
+            new_heat = (self._total_exposure + proposed_size) / self._capital
             return False, f"Portfolio heat limit: current {current_heat:.1%}, would be {new_heat:.1%} (max {self._config.max_portfolio_heat:.0%})"
 
         return True, None
 
+    def evaluate_open_positions(
+        self,
+        current_multipliers: Optional[Sequence[float]] = None,
+        atrs: Optional[Sequence[float]] = None,
+    ) -> List[Tuple["Position", StopLossResult]]:
+        """
+        Evaluate stop losses for all tracked positions at once.
+
+        Args:
+            current_multipliers: Current multiplier per tracked position
+                (each position's last_multiplier if None)
+            atrs: ATR per tracked position (NaN to skip), or None
+
+        Returns:
+            (position, result) for each position whose stop triggered
+        """
+        positions = self._open_positions
+        if current_multipliers is None:
+            current_multipliers = [p.last_multiplier for p in positions]
+        batch = self._stop_loss.evaluate_batch(
+            current_multipliers,
+            [p.peak_multiplier for p in positions],
+            self._holding_hours(),
+            atrs,
+        )
+        return [(positions[i], batch.result(i)) for i in batch.exit_indices]
+
     def should_force_exit(self, position: "Position") -> Tuple[bool, Optional[str]]:
         """
         Check if a position should be force-exited due to time limit.
@@ -676,6 +1154,19 @@ class RiskManager:
             return True, f"Max hold time reached: {hold_hours:.1f}h (limit: {self._config.max_hold_time_hours}h)"
         return False, None
 
+    def force_exits_batch(self, now: Optional[float] = None) -> np.ndarray:
+        """
+        Check every tracked position against the max hold time at once.
+
+        Args:
+            now: Current UNIX time in seconds (time.time() if None)
+
+        Returns:
+            Boolean mask over tracked positions; reasons for the True rows
+            can be had from should_force_exit()
+        """
+        return self._holding_hours(now) >= self._config.max_hold_time_hours
+
     def evaluate_stop_loss(
         self,
         position: "Position",
@@ -703,17 +1194,21 @@ class RiskManager:
         """
         return self._position_sizer.calculate_size(signal_score, volatility, win_rate)
 
-    def record_trade_result(self, pnl: float) -> bool:
+    def record_trade_result(self, pnl: float, strategy_id: Optional[str] = None) -> bool:
         """
         Record a trade result for circuit breaker tracking.
 
         Args:
             pnl: Profit/loss in SOL
+            strategy_id: Strategy that made the trade, if any
 
         Returns:
-            True if circuit breaker triggered
+            True if the portfolio or strategy circuit breaker triggered
         """
-        return self._circuit_breaker.record_trade(pnl)
+        triggered = self._circuit_breaker.record_trade(pnl)
+        if strategy_id is not None:
+            triggered = self._strategy_breaker(strategy_id).record_trade(pnl) or triggered
+        return triggered
 
     def get_portfolio_metrics(self) -> PortfolioRiskMetrics:
         """Get comprehensive portfolio risk metrics."""
@@ -734,30 +1229,27 @@ class RiskManager:
     def format_status(self) -> str:
         """Format risk metrics as a human-readable status string."""
         metrics = self.get_portfolio_metrics()
-
-        lines = [
-            "📊 **Risk Management Status**",
-            "",
-            f"💰 Capital: {self._capital:.2f} SOL",
-            f"📈 Total Exposure: {metrics.total_exposure_sol:.4f} SOL",
-            f"🔥 Portfolio Heat: {metrics.portfolio_heat:.1%} (max {self._config.max_portfolio_heat:.0%})",
-            f"📉 Daily PnL: {metrics.daily_realized_pnl:+.4f} SOL",
-            "",
-            "🛑 **Stop Loss Settings**",
-            f"  • Enabled: {'✅' if self._config.stop_loss.enabled else '❌'}",
-            f"  • Type: {self._config.stop_loss.stop_loss_type.value}",
-            f"  • Fixed %: {self._config.stop_loss.fixed_percentage:.0%}",
-            f"  • Trailing: {self._config.stop_loss.trailing_percentage:.0%} (after {self._config.stop_loss.trailing_activation}X)",
-            "",
-            "⚡ **Circuit Breaker**",
-            f"  • Status: {'🔴 ACTIVE' if metrics.circuit_breaker_active else '🟢 OK'}",
-        ]
+        stop_loss = self._config.stop_loss
+
+        status = _STATUS_TEMPLATE.format_map({
+            "capital": self._capital,
+            "exposure": metrics.total_exposure_sol,
+            "heat": metrics.portfolio_heat,
+            "max_heat": self._config.max_portfolio_heat,
+            "daily_pnl": metrics.daily_realized_pnl,
+            "sl_enabled": "✅" if stop_loss.enabled else "❌",
+            "sl_type": stop_loss.stop_loss_type.value,
+            "sl_fixed": stop_loss.fixed_percentage,
+            "sl_trailing": stop_loss.trailing_percentage,
+            "sl_activation": stop_loss.trailing_activation,
+            "cb_status": "🔴 ACTIVE" if metrics.circuit_breaker_active else "🟢 OK",
+        })
 
         if metrics.circuit_breaker_active:
-            lines.append(f"  • Reason: {metrics.circuit_breaker_reason}")
+            status += f"\n  • Reason: {metrics.circuit_breaker_reason}"
             if metrics.cooldown_until:
-                lines.append(f"  • Cooldown until: {metrics.cooldown_until.strftime('%H:%M:%S UTC')}")
+                status += f"\n  • Cooldown until: {metrics.cooldown_until:%H:%M:%S UTC}"
         else:
-            lines.append(f"  • Consecutive Losses: {metrics.consecutive_losses}/{self._config.circuit_breaker.consecutive_loss_limit}")
+            status += f"\n  • Consecutive Losses: {metrics.consecutive_losses}/{self._config.circuit_breaker.consecutive_loss_limit}"
 
-        return "\n".join(lines)
+        return status
@@ -8,9 +8,13 @@ to query historical signal data from "From The Trenches - VOLUME + SM" channel.
 from __future__ import annotations
 
 import asyncio
+import heapq
 import json
 import logging
+import math
 import re
+import time
+from collections import Counter, defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
 from typing import Any, Optional
@@ -20,7 +24,7 @@ import asyncpg
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class TokenSignal:
     """Represents a token signal from the channel."""
     
@@ -31,16 +35,19 @@ class TokenSignal:
     token_address: str
     initial_fdv: Optional[float] = None
     
+    def __post_init__(self) -> None:
+        # Naive timestamps are UTC; normalize once so reads never branch
+        if self.timestamp.tzinfo is None:
+            self.timestamp = self.timestamp.replace(tzinfo=timezone.utc)
+    
     @property
     def age_hours(self) -> float:
         """Get signal age in hours."""
-        now = datetime.now(timezone.utc)
-        if self.timestamp.tzinfo is None:
-            ts = self.timestamp.replace(tzinfo=timezone.utc)
-        else:
-            ts = self.timestamp
-        delta = now - ts
-        return delta.total_seconds() / 3600
+        return self.age_hours_from(datetime.now(timezone.utc))
+    
+    def age_hours_from(self, now: datetime) -> float:
+        """Get signal age in hours at a given (UTC-aware) reference time."""
+        return (now - self.timestamp).total_seconds() / 3600
     
     @property
     def age_days(self) -> float:
@@ -48,7 +55,7 @@ class TokenSignal:
         return self.age_hours / 24
 
 
-@dataclass
+@dataclass(slots=True)
 class ProfitAlert:
     """Represents a profit alert for a signal."""
     
@@ -59,14 +66,24 @@ class ProfitAlert:
     multiplier: float
     initial_fdv: Optional[float] = None
     current_fdv: Optional[float] = None
+    
+    def __post_init__(self) -> None:
+        if self.timestamp.tzinfo is None:
+            self.timestamp = self.timestamp.replace(tzinfo=timezone.utc)
 
 
-@dataclass
+@dataclass(slots=True)
 class SignalWithPnL:
-    """Signal combined with its PnL data from profit alerts."""
+    """
+    Signal combined with its PnL data from profit alerts.
+    
+    profit_alerts are kept oldest first. max_multiplier is computed on
+    first access, so profit_alerts should be complete before it is read.
+    """
     
     signal: TokenSignal
     profit_alerts: list[ProfitAlert] = field(default_factory=list)
+    _max_multiplier: Optional[float] = field(default=None, init=False, repr=False, compare=False)
     
     @property
     def has_profit(self) -> bool:
@@ -75,9 +92,9 @@ class SignalWithPnL:
     @property
     def max_multiplier(self) -> float:
         """Maximum multiplier achieved."""
-        if not self.profit_alerts:
-            return 0.0
-        return max(a.multiplier for a in self.profit_alerts)
+        if self._max_multiplier is None:
+            self._max_multiplier = max((a.multiplier for a in self.profit_alerts), default=0.0)
+        return self._max_multiplier
     
     @property
     def reached_2x(self) -> bool:
@@ -96,11 +113,10 @@ class SignalWithPnL:
         """Get most recent multiplier."""
         if not self.profit_alerts:
             return None
-        sorted_alerts = sorted(self.profit_alerts, key=lambda a: a.timestamp, reverse=True)
-        return sorted_alerts[0].multiplier
+        return self.profit_alerts[-1].multiplier
 
 
-@dataclass
+@dataclass(slots=True)
 class PnLStats:
     """PnL statistics for a period."""
     
@@ -122,6 +138,17 @@ class PnLStats:
     loser_signals: list[SignalWithPnL] = field(default_factory=list)  # Signals with no profit alerts
 
 
+# Message parsing patterns, compiled once at import
+_SYMBOL_RE = re.compile(r'Token:\s*-?\s*\$(\w+)')
+_ADDRESS_RE = re.compile(r'[`├└]\s*([1-9A-HJ-NP-Za-km-z]{32,44})')
+_FDV_RE = re.compile(r'FDV[`:\s]*\$?([\d.]+)\s*K', re.IGNORECASE)
+_SIMPLE_MULT_RE = re.compile(r'^([\d.]+)\s*X\s+profit\s+alert', re.IGNORECASE)
+_MARKDOWN_MULT_RE = re.compile(r'\*\*?([\d.]+)\s*X\*?\*?', re.IGNORECASE)
+_LABELLED_MULT_RE = re.compile(r'Multiplier[:\s`]*([\d.]+)\s*X', re.IGNORECASE)
+_INITIAL_FDV_RE = re.compile(r'Initial FDV[:\s`]*\*?\*?\$?([\d.]+)\s*([KMB])?', re.IGNORECASE)
+_CURRENT_FDV_RE = re.compile(r'Current FDV[:\s`]*\*?\*?\$?([\d.]+)\s*([KMB])?', re.IGNORECASE)
+
+
 def parse_signal_message(raw_text: str) -> tuple[Optional[str], Optional[str], Optional[float]]:
     """
     Parse a signal message to extract token info.
@@ -132,18 +159,23 @@ def parse_signal_message(raw_text: str) -> tuple[Optional[str], Optional[str], O
     address = None
     fdv = None
     
+    # Cheap substring checks skip regexes that cannot match
+    has_fdv = 'fdv' in raw_text.lower()
+    
     # Extract token symbol: Token: - $SYMBOL or Token: $SYMBOL
-    symbol_match = re.search(r'Token:\s*-?\s*\$(\w+)', raw_text)
+    symbol_match = _SYMBOL_RE.search(raw_text) if 'Token:' in raw_text else None
     if symbol_match:
         symbol = symbol_match.group(1)
     
-    # Extract token address (Solana base58 - typically 32-44 chars)
-    address_match = re.search(r'[`├└]\s*([1-9A-HJ-NP-Za-km-z]{32,44})', raw_text)
+    # Extract token address (Solana base58 - typically 32-44 chars); it always
+    # follows a backtick or tree glyph, so skip the regex without one
+    has_anchor = '`' in raw_text or '└' in raw_text or '├' in raw_text
+    address_match = _ADDRESS_RE.search(raw_text) if has_anchor else None
     if address_match:
         address = address_match.group(1)
     
     # Extract FDV: FDV: $XXK or $XX.XK or $XXXK
-    fdv_match = re.search(r'FDV[`:\s]*\$?([\d.]+)\s*K', raw_text, re.IGNORECASE)
+    fdv_match = _FDV_RE.search(raw_text) if has_fdv else None
     if fdv_match:
         try:
             fdv = float(fdv_match.group(1)) * 1000
@@ -164,8 +196,13 @@ def parse_profit_alert(raw_text: str) -> Optional[float]:
     - "**2X**", "**3X**" (markdown format)
     - "Multiplier: 6.00X" (detailed format)
     """
+    # Every format needs an X, so skip the regexes when there is none
+    if 'X' not in raw_text and 'x' not in raw_text:
+        return None
+    lowered = raw_text.lower()
+    
     # NEW: Simple format like "3.0X profit alert" or "48.0X profit alert"
-    simple_match = re.search(r'^([\d.]+)\s*X\s+profit\s+alert', raw_text, re.IGNORECASE)
+    simple_match = _SIMPLE_MULT_RE.search(raw_text) if 'profit' in lowered else None
     if simple_match:
         try:
             return float(simple_match.group(1))
@@ -173,7 +210,7 @@ def parse_profit_alert(raw_text: str) -> Optional[float]:
             pass
     
     # Match patterns like: **2X**, **3X**, **6X**, **10X**, **1.5X**
-    multiplier_match = re.search(r'\*\*?([\d.]+)\s*X\*?\*?', raw_text, re.IGNORECASE)
+    multiplier_match = _MARKDOWN_MULT_RE.search(raw_text) if '*' in raw_text else None
     if multiplier_match:
         try:
             return float(multiplier_match.group(1))
@@ -181,7 +218,7 @@ def parse_profit_alert(raw_text: str) -> Optional[float]:
             pass
     
     # Alternative pattern: Multiplier: 6.00X
-    multiplier_match2 = re.search(r'Multiplier[:\s`]*([\d.]+)\s*X', raw_text, re.IGNORECASE)
+    multiplier_match2 = _LABELLED_MULT_RE.search(raw_text) if 'multiplier' in lowered else None
     if multiplier_match2:
         try:
             return float(multiplier_match2.group(1))
@@ -196,8 +233,12 @@ def parse_fdv_from_profit_alert(raw_text: str) -> tuple[Optional[float], Optiona
     initial_fdv = None
     current_fdv = None
     
+    lowered = raw_text.lower()
+    if 'fdv' not in lowered:
+        return initial_fdv, current_fdv
+    
     # Initial FDV
-    initial_match = re.search(r'Initial FDV[:\s`]*\*?\*?\$?([\d.]+)\s*([KMB])?', raw_text, re.IGNORECASE)
+    initial_match = _INITIAL_FDV_RE.search(raw_text) if 'initial fdv' in lowered else None
     if initial_match:
         try:
             val = float(initial_match.group(1))
@@ -215,7 +256,7 @@ def parse_fdv_from_profit_alert(raw_text: str) -> tuple[Optional[float], Optiona
             pass
     
     # Current FDV
-    current_match = re.search(r'Current FDV[:\s`]*\*?\*?\$?([\d.]+)\s*([KMB])?', raw_text, re.IGNORECASE)
+    current_match = _CURRENT_FDV_RE.search(raw_text) if 'current fdv' in lowered else None
     if current_match:
         try:
             val = float(current_match.group(1))
@@ -235,6 +276,325 @@ def parse_fdv_from_profit_alert(raw_text: str) -> tuple[Optional[float], Optiona
     return initial_fdv, current_fdv
 
 
+# Classifies a raw_telegram_messages row; keep in sync with init-db.sql
+_MESSAGE_KIND_SQL = (
+    "CASE WHEN raw_text LIKE '%APE SIGNAL DETECTED%' THEN 'signal' "
+    "WHEN raw_text ILIKE '%profit alert%' THEN 'profit_alert' END"
+)
+
+# Converts a legacy TEXT raw_json value for the JSONB migration. Older
+# versions wrote raw_json with an f-string, which emitted bare nan/inf for
+# non-finite multipliers; those become null, and anything still unparseable
+# becomes NULL instead of aborting the ALTER. Session-local (pg_temp), so the
+# migration leaves no function behind.
+_TRY_JSONB_FUNCTION_SQL = r"""
+    CREATE OR REPLACE FUNCTION pg_temp.try_jsonb(value text) RETURNS jsonb
+    LANGUAGE plpgsql IMMUTABLE AS $$
+    BEGIN
+        RETURN value::jsonb;
+    EXCEPTION WHEN others THEN
+        BEGIN
+            RETURN regexp_replace(value, '-?\m(nan|inf(inity)?)\M', 'null', 'gi')::jsonb;
+        EXCEPTION WHEN others THEN
+            RETURN NULL;
+        END;
+    END
+    $$
+"""
+
+# reply_to_msg_id as a bigint, NULL unless it is a plain integer: a failing
+# cast in a generated column would reject other writers' rows outright.
+# Keep in sync with init-db.sql
+_REPLY_TO_SQL = (
+    "CASE WHEN raw_json->>'reply_to_msg_id' ~ '^[0-9]{1,18}$' "
+    "THEN (raw_json->>'reply_to_msg_id')::bigint END"
+)
+
+
+def _sql_multiplier(pattern: str) -> str:
+    """SQL for a profit alert multiplier captured by pattern, NULL if not a number."""
+    captured = f"substring(raw_text from '{pattern}')"
+    return rf"CASE WHEN {captured} ~ '^([0-9]+\.?[0-9]*|\.[0-9]+)$' THEN {captured}::float8 END"
+
+
+_SQL_SIMPLE_MULT = _sql_multiplier(r'(?i)^([0-9.]+)\s*X\s+profit\s+alert')
+_SQL_MARKDOWN_MULT = _sql_multiplier(r'(?i)\*\*?([0-9.]+)\s*X\*?\*?')
+_SQL_LABELLED_MULT = _sql_multiplier(r'(?i)Multiplier[:\s`]*([0-9.]+)\s*X')
+
+# PnL statistics computed entirely in PostgreSQL. Rows without parsed columns
+# fall back to regexes mirroring _ADDRESS_RE and the parse_profit_alert
+# patterns (tried in the same order) so the numbers match what
+# get_signals_in_period parses. best keeps each signal's highest alert.
+_PNL_CTES = rf"""
+    WITH sigs AS (
+        SELECT DISTINCT ON (telegram_message_id)
+               id, telegram_message_id, message_timestamp,
+               parsed_token_symbol, parsed_token_address, parsed_initial_fdv,
+               CASE WHEN parsed_token_address IS NULL THEN raw_text END AS raw_text
+        FROM raw_telegram_messages
+        WHERE chat_title = $1
+        AND message_kind = 'signal'
+        AND ($2::timestamptz IS NULL OR message_timestamp >= $2)
+        AND (parsed_token_address IS NOT NULL
+             OR raw_text ~ '[`├└]\s*[1-9A-HJ-NP-Za-km-z]{{32,44}}')
+        ORDER BY telegram_message_id, message_timestamp
+    ), alerts AS (
+        SELECT id, telegram_message_id, message_timestamp,
+               parsed_reply_to AS reply_to,
+               COALESCE(
+                   parsed_multiplier,
+                   {_SQL_SIMPLE_MULT},
+                   {_SQL_MARKDOWN_MULT},
+                   {_SQL_LABELLED_MULT}
+               ) AS multiplier,
+               parsed_initial_fdv, parsed_current_fdv,
+               CASE WHEN parsed_multiplier IS NULL THEN raw_text END AS raw_text
+        FROM raw_telegram_messages
+        WHERE chat_title = $1
+        AND message_kind = 'profit_alert'
+        AND parsed_reply_to IN (SELECT telegram_message_id FROM sigs)
+    ), best AS (
+        SELECT DISTINCT ON (reply_to) *
+        FROM alerts
+        WHERE multiplier > 0
+        ORDER BY reply_to, multiplier DESC, message_timestamp
+    )
+"""
+
+_PNL_SUMMARY_QUERY = _PNL_CTES + """
+    SELECT COUNT(*) AS total,
+           COUNT(b.multiplier) AS with_profit,
+           COUNT(*) FILTER (WHERE b.multiplier >= 2) AS reached_2x,
+           AVG(b.multiplier) AS avg_mult,
+           MAX(b.multiplier) AS best_mult,
+           MIN(b.multiplier) AS worst_mult,
+           AVG(COALESCE((b.multiplier - 1) * 100, -100)) AS avg_pnl,
+           MIN(s.message_timestamp) AS start_date,
+           MAX(s.message_timestamp) AS end_date
+    FROM sigs s
+    LEFT JOIN best b ON b.reply_to = s.telegram_message_id
+"""
+
+# The 15 best and worst signals by their highest alert, and the 15 most
+# recent signals without one, each row carrying only that best alert
+_PNL_PERFORMERS_QUERY = _PNL_CTES + """
+    , ranked AS (
+        SELECT s.id, s.telegram_message_id, s.message_timestamp,
+               s.parsed_token_symbol, s.parsed_token_address, s.parsed_initial_fdv,
+               s.raw_text,
+               b.id AS alert_id,
+               b.telegram_message_id AS alert_message_id,
+               b.message_timestamp AS alert_timestamp,
+               b.reply_to,
+               b.multiplier AS alert_multiplier,
+               b.parsed_initial_fdv AS alert_initial_fdv,
+               b.parsed_current_fdv AS alert_current_fdv,
+               b.raw_text AS alert_text
+        FROM sigs s
+        LEFT JOIN best b ON b.reply_to = s.telegram_message_id
+    )
+    (SELECT 'top' AS rank_list, * FROM ranked
+     WHERE alert_id IS NOT NULL ORDER BY alert_multiplier DESC LIMIT 15)
+    UNION ALL
+    (SELECT 'worst' AS rank_list, * FROM ranked
+     WHERE alert_id IS NOT NULL ORDER BY alert_multiplier ASC LIMIT 15)
+    UNION ALL
+    (SELECT 'loser' AS rank_list, * FROM ranked
+     WHERE alert_id IS NULL ORDER BY message_timestamp DESC LIMIT 15)
+"""
+
+
+# Signals joined to the profit alerts replying to them, in one round-trip;
+# a signal with no alerts comes back once with NULLs. Message bodies are only
+# sent for rows without parsed columns, the ones readers still parse. Hot
+# query texts live at module level so every call sends identical SQL, which
+# asyncpg's per-connection statement cache prepares once and reuses.
+_SIGNALS_WITH_ALERTS_SQL = '''
+    SELECT s.id, s.telegram_message_id, s.message_timestamp,
+           s.parsed_token_symbol, s.parsed_token_address, s.parsed_initial_fdv,
+           CASE WHEN s.parsed_token_address IS NULL THEN s.raw_text END AS raw_text,
+           a.id AS alert_id,
+           a.telegram_message_id AS alert_message_id,
+           CASE WHEN a.parsed_multiplier IS NULL THEN a.raw_text END AS alert_text,
+           a.message_timestamp AS alert_timestamp,
+           a.parsed_reply_to AS reply_to,
+           a.parsed_multiplier AS alert_multiplier,
+           a.parsed_initial_fdv AS alert_initial_fdv,
+           a.parsed_current_fdv AS alert_current_fdv
+    FROM raw_telegram_messages s
+    LEFT JOIN raw_telegram_messages a
+        ON a.chat_title = s.chat_title
+        AND a.parsed_reply_to = s.telegram_message_id
+        AND a.message_kind = 'profit_alert'
+    WHERE s.chat_title = $1
+    AND s.message_kind = 'signal'
+    AND ($2::timestamptz IS NULL OR s.message_timestamp >= $2)
+    ORDER BY s.message_timestamp DESC, a.message_timestamp
+'''
+
+_SIGNAL_COUNTS_SQL = '''
+    SELECT COUNT(*) FILTER (WHERE message_kind = 'signal') AS total_signals,
+           COUNT(*) FILTER (WHERE message_kind = 'profit_alert') AS total_profit_alerts
+    FROM raw_telegram_messages
+    WHERE chat_title = $1
+'''
+
+# Single-statement inserts that skip messages already stored for the channel
+# (the WHERE NOT EXISTS) and lose no race against a concurrent identical
+# insert (ON CONFLICT); they return 1 when a row was written, NULL otherwise.
+# Fields the bot doesn't have (chat id, sender) keep their placeholder values.
+_INSERT_SIGNAL_SQL = '''
+    INSERT INTO raw_telegram_messages (
+        telegram_message_id,
+        telegram_chat_id,
+        chat_title,
+        raw_text,
+        message_timestamp,
+        sender_id,
+        sender_username,
+        source_bot,
+        is_parsed,
+        parsed_token_symbol,
+        parsed_token_address,
+        parsed_initial_fdv,
+        ingested_at
+    )
+    SELECT $1::bigint, 0, $2::text, $3::text, $4::timestamptz, 0, 'channel', 'trenches_sync', FALSE,
+           $5::text, $6::text, $7::float8, NOW()
+    WHERE NOT EXISTS (
+        SELECT 1 FROM raw_telegram_messages
+        WHERE chat_title = $2 AND telegram_message_id = $1
+    )
+    ON CONFLICT DO NOTHING
+    RETURNING 1
+'''
+
+_INSERT_PROFIT_ALERT_SQL = '''
+    INSERT INTO raw_telegram_messages (
+        telegram_message_id,
+        telegram_chat_id,
+        chat_title,
+        raw_text,
+        message_timestamp,
+        raw_json,
+        sender_id,
+        sender_username,
+        source_bot,
+        is_parsed,
+        parsed_multiplier,
+        parsed_initial_fdv,
+        parsed_current_fdv,
+        ingested_at
+    )
+    SELECT $1::bigint, 0, $2::text, $3::text, $4::timestamptz, $5::jsonb, 0, 'channel', 'trenches_sync', FALSE,
+           $6::float8, $7::float8, $8::float8, NOW()
+    WHERE NOT EXISTS (
+        SELECT 1 FROM raw_telegram_messages
+        WHERE chat_title = $2 AND telegram_message_id = $1
+    )
+    ON CONFLICT DO NOTHING
+    RETURNING 1
+'''
+
+# Bulk variants of the inserts above: the batch is bound as one array per
+# column and unnested server-side, so a backfill writes thousands of rows in a
+# single round-trip and gets back how many were new.
+_BULK_INSERT_SIGNALS_SQL = '''
+    WITH inserted AS (
+        INSERT INTO raw_telegram_messages (
+            telegram_message_id,
+            telegram_chat_id,
+            chat_title,
+            raw_text,
+            message_timestamp,
+            sender_id,
+            sender_username,
+            source_bot,
+            is_parsed,
+            parsed_token_symbol,
+            parsed_token_address,
+            parsed_initial_fdv,
+            ingested_at
+        )
+        SELECT m.message_id, 0, $1, m.raw_text, m.message_timestamp, 0, 'channel', 'trenches_sync', FALSE,
+               m.symbol, m.address, m.fdv, NOW()
+        FROM unnest($2::bigint[], $3::text[], $4::timestamptz[], $5::text[], $6::text[], $7::float8[])
+            AS m(message_id, raw_text, message_timestamp, symbol, address, fdv)
+        WHERE NOT EXISTS (
+            SELECT 1 FROM raw_telegram_messages r
+            WHERE r.chat_title = $1 AND r.telegram_message_id = m.message_id
+        )
+        ON CONFLICT DO NOTHING
+        RETURNING 1
+    )
+    SELECT count(*) FROM inserted
+'''
+
+_BULK_INSERT_PROFIT_ALERTS_SQL = '''
+    WITH inserted AS (
+        INSERT INTO raw_telegram_messages (
+            telegram_message_id,
+            telegram_chat_id,
+            chat_title,
+            raw_text,
+            message_timestamp,
+            raw_json,
+            sender_id,
+            sender_username,
+            source_bot,
+            is_parsed,
+            parsed_multiplier,
+            parsed_initial_fdv,
+            parsed_current_fdv,
+            ingested_at
+        )
+        SELECT m.message_id, 0, $1, m.raw_text, m.message_timestamp, m.raw_json::jsonb, 0, 'channel', 'trenches_sync', FALSE,
+               m.multiplier, m.initial_fdv, m.current_fdv, NOW()
+        FROM unnest($2::bigint[], $3::text[], $4::timestamptz[], $5::text[], $6::float8[], $7::float8[], $8::float8[])
+            AS m(message_id, raw_text, message_timestamp, raw_json, multiplier, initial_fdv, current_fdv)
+        WHERE NOT EXISTS (
+            SELECT 1 FROM raw_telegram_messages r
+            WHERE r.chat_title = $1 AND r.telegram_message_id = m.message_id
+        )
+        ON CONFLICT DO NOTHING
+        RETURNING 1
+    )
+    SELECT count(*) FROM inserted
+'''
+
+
+def _profit_alert_json(reply_to_msg_id: int, multiplier: float) -> str:
+    """
+    Build the raw_json stored with a profit alert (parsed_reply_to is generated from it).
+    
+    A non-finite multiplier is stored as null, since JSONB rejects NaN/Infinity.
+    """
+    return json.dumps({
+        "reply_to_msg_id": reply_to_msg_id,
+        "multiplier": multiplier if math.isfinite(multiplier) else None,
+    })
+
+
+def _signal_from_row(row) -> Optional[TokenSignal]:
+    """Build a signal from a query row, None if it has no token address."""
+    # Parsed columns are NULL for rows from other writers
+    address = row['parsed_token_address']
+    if address is not None:
+        symbol, fdv = row['parsed_token_symbol'], row['parsed_initial_fdv']
+    else:
+        symbol, address, fdv = parse_signal_message(row['raw_text'])
+    if not address:
+        return None
+    return TokenSignal(
+        db_id=row['id'],
+        telegram_msg_id=row['telegram_message_id'],
+        timestamp=row['message_timestamp'],
+        token_symbol=symbol or "UNKNOWN",
+        token_address=address,
+        initial_fdv=fdv,
+    )
+
+
 class SignalDatabase:
     """
     Database interface for querying signal PnL data.
@@ -245,32 +605,73 @@ class SignalDatabase:
     
     CHANNEL_NAME = "From The Trenches - VOLUME + SM"
     
-    def __init__(self, dsn: str) -> None:
+    # How long calculate_pnl_stats results are reused per period
+    STATS_CACHE_TTL_SECONDS = 60.0
+    
+    # Rows fetched per round-trip when streaming large result sets
+    CURSOR_PREFETCH = 500
+    
+    # Rows written per statement by the bulk inserts
+    BULK_INSERT_BATCH_SIZE = 5000
+    
+    def __init__(
+        self,
+        dsn: str,
+        min_pool_size: int = 10,
+        max_pool_size: int = 10,
+        statement_cache_size: int = 200,
+        command_timeout: float = 30.0,
+    ) -> None:
         """
         Initialize database connection.
         
         Args:
             dsn: PostgreSQL connection string
+            min_pool_size: Connections opened up front (equal to max_pool_size
+                preallocates the whole pool)
+            max_pool_size: Upper bound on pooled connections
+            statement_cache_size: Prepared statements cached per connection
+            command_timeout: Default per-query timeout in seconds
         """
         self._dsn = dsn
+        self._min_pool_size = min_pool_size
+        self._max_pool_size = max_pool_size
+        self._statement_cache_size = statement_cache_size
+        self._command_timeout = command_timeout
         self._pool: Optional[asyncpg.Pool] = None
+        self._stats_cache: dict[tuple[Optional[int], bool], tuple[float, PnLStats]] = {}
     
     async def connect(self) -> bool:
-        """Establish connection pool."""
+        """
+        Establish connection pool and migrate the schema via ensure_indexes.
+        
+        Every read query relies on the columns ensure_indexes adds, so a
+        failed migration fails the connection instead of leaving queries to
+        come back empty.
+        """
         if self._pool is not None:
             return True
         
         try:
             self._pool = await asyncpg.create_pool(
                 self._dsn,
-                min_size=1,
-                max_size=5,
+                min_size=self._min_pool_size,
+                max_size=self._max_pool_size,
+                max_inactive_connection_lifetime=300,
+                statement_cache_size=self._statement_cache_size,
+                command_timeout=self._command_timeout,
             )
-            logger.info("Connected to signal database")
-            return True
         except Exception as e:
             logger.error(f"Failed to connect to signal database: {e}")
             return False
+        
+        if not await self.ensure_indexes():
+            logger.error("Signal database schema is out of date and could not be migrated")
+            await self.disconnect()
+            return False
+        
+        logger.info("Connected to signal database")
+        return True
     
     async def disconnect(self) -> None:
         """Close connection pool."""
@@ -297,94 +698,58 @@ class SignalDatabase:
         
         try:
             async with self._pool.acquire() as conn:
-                # Build date filter
-                date_filter = ""
+                # Cutoff is bound as $2 (NULL for all time) so one prepared
+                # statement serves every period
+                cutoff = None
                 if days is not None:
                     cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-                    date_filter = f"AND message_timestamp >= '{cutoff.isoformat()}'"
-                
-                # Get signals
-                signals_query = f'''
-                    SELECT id, telegram_message_id, raw_text, message_timestamp
-                    FROM raw_telegram_messages
-                    WHERE chat_title = $1
-                    AND raw_text LIKE '%APE SIGNAL DETECTED%'
-                    {date_filter}
-                    ORDER BY message_timestamp DESC
-                '''
-                
-                signals = await conn.fetch(signals_query, self.CHANNEL_NAME)
                 
-                if not signals:
-                    return []
-                
-                # Build signal map
+                # Group joined rows back into signals in a single pass,
+                # streaming them through a server-side cursor so the full
+                # result set is never held at once; each signal's alerts
+                # arrive oldest first
                 signal_map: dict[int, TokenSignal] = {}
-                for s in signals:
-                    symbol, address, fdv = parse_signal_message(s['raw_text'])
-                    if not address:
-                        continue
-                    
-                    signal = TokenSignal(
-                        db_id=s['id'],
-                        telegram_msg_id=s['telegram_message_id'],
-                        timestamp=s['message_timestamp'],
-                        token_symbol=symbol or "UNKNOWN",
-                        token_address=address,
-                        initial_fdv=fdv,
-                    )
-                    signal_map[s['telegram_message_id']] = signal
-                
-                # Get profit alerts (use ILIKE for case-insensitive match)
-                alerts_query = '''
-                    SELECT id, telegram_message_id, raw_text, message_timestamp, raw_json
-                    FROM raw_telegram_messages
-                    WHERE chat_title = $1
-                    AND raw_text ILIKE '%profit alert%'
-                '''
-                
-                alerts = await conn.fetch(alerts_query, self.CHANNEL_NAME)
-                
-                # Build profit map
-                profit_map: dict[int, list[ProfitAlert]] = {}
-                for a in alerts:
-                    try:
-                        raw_json = a['raw_json']
-                        # Handle JSONB (returned as dict by asyncpg) or TEXT (string)
-                        if raw_json is None:
-                            json_data = {}
-                        elif isinstance(raw_json, dict):
-                            # asyncpg returns JSONB as dict directly
-                            json_data = raw_json
+                profit_map: defaultdict[int, list[ProfitAlert]] = defaultdict(list)
+                parsed_signals: set[int] = set()
+                seen_alerts: set[int] = set()
+                async with conn.transaction():
+                    async for row in conn.cursor(
+                        _SIGNALS_WITH_ALERTS_SQL, self.CHANNEL_NAME, cutoff,
+                        prefetch=self.CURSOR_PREFETCH,
+                    ):
+                        if row['id'] not in parsed_signals:
+                            parsed_signals.add(row['id'])
+                            signal = _signal_from_row(row)
+                            if signal:
+                                signal_map[row['telegram_message_id']] = signal
+                        
+                        alert_id = row['alert_id']
+                        if alert_id is None or alert_id in seen_alerts:
+                            continue
+                        seen_alerts.add(alert_id)
+                        
+                        multiplier = row['alert_multiplier']
+                        parsed = multiplier is not None
+                        if not parsed:
+                            multiplier = parse_profit_alert(row['alert_text'])
+                        if not multiplier:
+                            continue
+                        
+                        if parsed:
+                            initial_fdv, current_fdv = row['alert_initial_fdv'], row['alert_current_fdv']
                         else:
-                            # Fallback: parse as JSON string
-                            json_data = json.loads(raw_json)
-                    except (json.JSONDecodeError, TypeError):
-                        continue
-
-                    reply_to = json_data.get('reply_to_msg_id')
-                    if not reply_to:
-                        continue
-                    
-                    multiplier = parse_profit_alert(a['raw_text'])
-                    if not multiplier:
-                        continue
-                    
-                    initial_fdv, current_fdv = parse_fdv_from_profit_alert(a['raw_text'])
-                    
-                    alert = ProfitAlert(
-                        db_id=a['id'],
-                        telegram_msg_id=a['telegram_message_id'],
-                        reply_to_msg_id=reply_to,
-                        timestamp=a['message_timestamp'],
-                        multiplier=multiplier,
-                        initial_fdv=initial_fdv,
-                        current_fdv=current_fdv,
-                    )
-                    
-                    if reply_to not in profit_map:
-                        profit_map[reply_to] = []
-                    profit_map[reply_to].append(alert)
+                            initial_fdv, current_fdv = parse_fdv_from_profit_alert(row['alert_text'])
+                        
+                        reply_to = row['reply_to']
+                        profit_map[reply_to].append(ProfitAlert(
+                            db_id=alert_id,
+                            telegram_msg_id=row['alert_message_id'],
+                            reply_to_msg_id=reply_to,
+                            timestamp=row['alert_timestamp'],
+                            multiplier=multiplier,
+                            initial_fdv=initial_fdv,
+                            current_fdv=current_fdv,
+                        ))
                 
                 # Combine signals with profits
                 results = []
@@ -401,74 +766,99 @@ class SignalDatabase:
     async def calculate_pnl_stats(
         self,
         days: Optional[int] = None,
+        include_performers: bool = True,
     ) -> PnLStats:
         """
         Calculate PnL statistics for a period.
         
         Args:
             days: Number of days to look back, None for all time
+            include_performers: Also fill the top/worst/loser signal lists,
+                each signal carrying only its highest profit alert
             
         Returns:
             PnLStats object with statistics
         """
-        signals = await self.get_signals_in_period(days)
+        key = (days, include_performers)
+        cached = self._stats_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < self.STATS_CACHE_TTL_SECONDS:
+            return cached[1]
         
+        stats = await self._fetch_pnl_stats(days, include_performers)
+        # Empty stats may just mean the query failed, so don't hold on to them
+        if stats.total_signals:
+            self._stats_cache[key] = (time.monotonic(), stats)
+        return stats
+    
+    async def _fetch_pnl_stats(self, days: Optional[int], include_performers: bool) -> PnLStats:
+        """Calculate PnL statistics in the database (uncached)."""
         period_label = f"Last {days} Day{'s' if days != 1 else ''}" if days else "All Time"
         
-        if not signals:
+        if not self._pool:
+            logger.error("Database not connected")
             return PnLStats(period_label=period_label)
         
-        # Calculate stats
-        total = len(signals)
-        with_profit = [s for s in signals if s.has_profit]
-        reached_2x = [s for s in signals if s.reached_2x]
-        losers = [s for s in signals if not s.has_profit]
-        
-        multipliers = [s.max_multiplier for s in with_profit if s.max_multiplier > 0]
-        
-        win_rate = (len(with_profit) / total * 100) if total > 0 else 0
-        win_rate_2x = (len(reached_2x) / total * 100) if total > 0 else 0
-        avg_mult = sum(multipliers) / len(multipliers) if multipliers else 0
-        best_mult = max(multipliers) if multipliers else 0
-        worst_mult = min(multipliers) if multipliers else 0
+        cutoff = None
+        if days is not None:
+            cutoff = datetime.now(timezone.utc) - timedelta(days=days)
         
-        # Calculate total PnL
-        # Winners: (multiplier - 1) * 100%
-        # Losers: -100%
-        total_pnl = sum(s.pnl_percent for s in signals) / total if total > 0 else 0
-        
-        # Get top and worst performers (show 15 each)
-        sorted_by_mult = sorted(with_profit, key=lambda s: s.max_multiplier, reverse=True)
-        top_performers = sorted_by_mult[:15]
-        
-        sorted_by_mult_asc = sorted(with_profit, key=lambda s: s.max_multiplier)
-        worst_performers = sorted_by_mult_asc[:15]
+        try:
+            async with self._pool.acquire() as conn:
+                row = await conn.fetchrow(_PNL_SUMMARY_QUERY, self.CHANNEL_NAME, cutoff)
+                ranked = []
+                if include_performers and row and row['total']:
+                    ranked = await conn.fetch(_PNL_PERFORMERS_QUERY, self.CHANNEL_NAME, cutoff)
+        except Exception as e:
+            logger.error(f"Failed to query PnL summary: {e}")
+            return PnLStats(period_label=period_label)
         
-        # Get loser signals (sorted by timestamp, most recent first)
-        loser_signals = sorted(losers, key=lambda s: s.signal.timestamp, reverse=True)[:15]
+        total = row['total'] if row else 0
+        if not total:
+            return PnLStats(period_label=period_label)
         
-        # Date range
-        timestamps = [s.signal.timestamp for s in signals]
-        start_date = min(timestamps) if timestamps else None
-        end_date = max(timestamps) if timestamps else None
+        performers: dict[str, list[SignalWithPnL]] = {"top": [], "worst": [], "loser": []}
+        for ranked_row in ranked:
+            signal = _signal_from_row(ranked_row)
+            if not signal:
+                continue
+            alerts = []
+            if ranked_row['alert_id'] is not None:
+                if ranked_row['alert_text'] is None:
+                    initial_fdv = ranked_row['alert_initial_fdv']
+                    current_fdv = ranked_row['alert_current_fdv']
+                else:
+                    initial_fdv, current_fdv = parse_fdv_from_profit_alert(ranked_row['alert_text'])
+                alerts.append(ProfitAlert(
+                    db_id=ranked_row['alert_id'],
+                    telegram_msg_id=ranked_row['alert_message_id'],
+                    reply_to_msg_id=ranked_row['reply_to'],
+                    timestamp=ranked_row['alert_timestamp'],
+                    multiplier=ranked_row['alert_multiplier'],
+                    initial_fdv=initial_fdv,
+                    current_fdv=current_fdv,
+                ))
+            performers[ranked_row['rank_list']].append(
+                SignalWithPnL(signal=signal, profit_alerts=alerts)
+            )
         
+        with_profit = row['with_profit']
         return PnLStats(
             total_signals=total,
-            signals_with_profit=len(with_profit),
-            signals_reached_2x=len(reached_2x),
-            losing_signals=len(losers),
-            win_rate=win_rate,
-            win_rate_2x=win_rate_2x,
-            avg_multiplier=avg_mult,
-            best_multiplier=best_mult,
-            worst_multiplier=worst_mult,
-            total_pnl_percent=total_pnl,
+            signals_with_profit=with_profit,
+            signals_reached_2x=row['reached_2x'],
+            losing_signals=total - with_profit,
+            win_rate=with_profit / total * 100,
+            win_rate_2x=row['reached_2x'] / total * 100,
+            avg_multiplier=row['avg_mult'] or 0,
+            best_multiplier=row['best_mult'] or 0,
+            worst_multiplier=row['worst_mult'] or 0,
+            total_pnl_percent=row['avg_pnl'],
             period_label=period_label,
-            start_date=start_date,
-            end_date=end_date,
-            top_performers=top_performers,
-            worst_performers=worst_performers,
-            loser_signals=loser_signals,
+            start_date=row['start_date'],
+            end_date=row['end_date'],
+            top_performers=performers["top"],
+            worst_performers=performers["worst"],
+            loser_signals=performers["loser"],
         )
     
     async def get_signal_count(self) -> dict[str, int]:
@@ -477,23 +867,13 @@ class SignalDatabase:
             return {"total": 0, "with_profit": 0}
         
         try:
+            # Both counts in one pass over the channel's messages
             async with self._pool.acquire() as conn:
-                total = await conn.fetchval('''
-                    SELECT COUNT(*) FROM raw_telegram_messages
-                    WHERE chat_title = $1
-                    AND raw_text LIKE '%APE SIGNAL DETECTED%'
-                ''', self.CHANNEL_NAME)
-                
-                alerts = await conn.fetchval('''
-                    SELECT COUNT(*) FROM raw_telegram_messages
-                    WHERE chat_title = $1
-                    AND raw_text ILIKE '%profit alert%'
-                ''', self.CHANNEL_NAME)
-                
-                return {
-                    "total_signals": total or 0,
-                    "total_profit_alerts": alerts or 0,
-                }
+                row = await conn.fetchrow(_SIGNAL_COUNTS_SQL, self.CHANNEL_NAME)
+            return {
+                "total_signals": row['total_signals'] or 0,
+                "total_profit_alerts": row['total_profit_alerts'] or 0,
+            }
         except Exception as e:
             logger.error(f"Failed to get signal count: {e}")
             return {"total_signals": 0, "total_profit_alerts": 0}
@@ -517,18 +897,17 @@ class SignalDatabase:
     async def insert_signal(
         self,
         message_id: int,
-        token_symbol: str,
-        token_address: str,
         signal_time: datetime,
         raw_text: str,
     ) -> bool:
         """
         Insert a new signal into the database.
         
+        The token symbol and address are parsed from raw_text, the same
+        way readers parse stored messages.
+        
         Args:
             message_id: Telegram message ID
-            token_symbol: Token symbol
-            token_address: Token address
             signal_time: Signal timestamp
             raw_text: Raw message text
             
@@ -540,41 +919,21 @@ class SignalDatabase:
         
         try:
             async with self._pool.acquire() as conn:
-                # Check if already exists
-                exists = await conn.fetchval('''
-                    SELECT 1 FROM raw_telegram_messages
-                    WHERE chat_title = $1 AND telegram_message_id = $2
-                ''', self.CHANNEL_NAME, message_id)
-                
-                if exists:
-                    return False
-                
-                # Insert the message
-                await conn.execute('''
-                    INSERT INTO raw_telegram_messages (
-                        telegram_message_id,
-                        telegram_chat_id,
-                        chat_title,
-                        raw_text,
-                        message_timestamp,
-                        sender_id,
-                        sender_username,
-                        source_bot,
-                        is_parsed,
-                        ingested_at
-                    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, NOW())
-                ''', 
+                # Insert the message, with the fields readers would parse
+                # from raw_text stored alongside it; one round-trip that
+                # returns NULL when the message is already stored
+                inserted = await conn.fetchval(
+                    _INSERT_SIGNAL_SQL,
                     message_id,
-                    0,  # telegram_chat_id - we don't have it
                     self.CHANNEL_NAME,
                     raw_text,
                     signal_time,
-                    0,  # sender_id
-                    'channel',  # sender_username
-                    'trenches_sync',  # source_bot
-                    False,  # is_parsed
+                    *parse_signal_message(raw_text),
                 )
+                if not inserted:
+                    return False
                 
+                self._stats_cache.clear()
                 return True
                 
         except Exception as e:
@@ -607,51 +966,101 @@ class SignalDatabase:
         
         try:
             async with self._pool.acquire() as conn:
-                # Check if already exists
-                exists = await conn.fetchval('''
-                    SELECT 1 FROM raw_telegram_messages
-                    WHERE chat_title = $1 AND telegram_message_id = $2
-                ''', self.CHANNEL_NAME, message_id)
-                
-                if exists:
-                    return False
-                
-                # Insert the message
-                # Note: reply_to_msg_id is stored in raw_json since there's no dedicated column
-                raw_json = f'{{"reply_to_msg_id": {reply_to_msg_id}, "multiplier": {multiplier}}}'
-                
-                await conn.execute('''
-                    INSERT INTO raw_telegram_messages (
-                        telegram_message_id,
-                        telegram_chat_id,
-                        chat_title,
-                        raw_text,
-                        raw_json,
-                        message_timestamp,
-                        sender_id,
-                        sender_username,
-                        source_bot,
-                        is_parsed,
-                        ingested_at
-                    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, NOW())
-                ''', 
+                inserted = await conn.fetchval(
+                    _INSERT_PROFIT_ALERT_SQL,
                     message_id,
-                    0,  # telegram_chat_id
                     self.CHANNEL_NAME,
                     raw_text,
-                    raw_json,
                     alert_time,
-                    0,  # sender_id
-                    'channel',  # sender_username
-                    'trenches_sync',  # source_bot
-                    False,  # is_parsed
+                    _profit_alert_json(reply_to_msg_id, multiplier),
+                    parse_profit_alert(raw_text),
+                    *parse_fdv_from_profit_alert(raw_text),
                 )
+                if not inserted:
+                    return False
                 
+                self._stats_cache.clear()
                 return True
                 
         except Exception as e:
             logger.error(f"Failed to insert profit alert: {e}")
             return False
+    
+    async def insert_signals_bulk(
+        self,
+        signals: list[tuple[int, datetime, str]],
+    ) -> Optional[int]:
+        """
+        Insert many signals, skipping ones already stored.
+        
+        Args:
+            signals: (message_id, signal_time, raw_text) per signal
+            
+        Returns:
+            Number of signals inserted, or None if the insert failed and
+            nothing was written
+        """
+        records = [
+            (message_id, raw_text, signal_time, *parse_signal_message(raw_text))
+            for message_id, signal_time, raw_text in signals
+        ]
+        return await self._insert_bulk(_BULK_INSERT_SIGNALS_SQL, records, "signals")
+    
+    async def insert_profit_alerts_bulk(
+        self,
+        alerts: list[tuple[int, int, float, datetime, str]],
+    ) -> Optional[int]:
+        """
+        Insert many profit alerts, skipping ones already stored.
+        
+        Args:
+            alerts: (message_id, reply_to_msg_id, multiplier, alert_time, raw_text) per alert
+            
+        Returns:
+            Number of profit alerts inserted, or None if the insert failed
+            and nothing was written
+        """
+        records = [
+            (
+                message_id,
+                raw_text,
+                alert_time,
+                _profit_alert_json(reply_to_msg_id, multiplier),
+                parse_profit_alert(raw_text),
+                *parse_fdv_from_profit_alert(raw_text),
+            )
+            for message_id, reply_to_msg_id, multiplier, alert_time, raw_text in alerts
+        ]
+        return await self._insert_bulk(_BULK_INSERT_PROFIT_ALERTS_SQL, records, "profit alerts")
+    
+    async def _insert_bulk(self, query: str, records: list[tuple], kind: str) -> Optional[int]:
+        """
+        Run a bulk insert query over records in batches, one array per column.
+        
+        All batches share one transaction, so a failure writes nothing and
+        returns None; callers must not advance their sync cursor past it.
+        """
+        if not records:
+            return 0
+        if not self._pool:
+            return None
+        
+        inserted = 0
+        try:
+            async with self._pool.acquire() as conn:
+                async with conn.transaction():
+                    for start in range(0, len(records), self.BULK_INSERT_BATCH_SIZE):
+                        batch = records[start:start + self.BULK_INSERT_BATCH_SIZE]
+                        inserted += await conn.fetchval(
+                            query, self.CHANNEL_NAME, *(list(column) for column in zip(*batch))
+                        )
+        except Exception as e:
+            logger.error(f"Failed to bulk insert {kind}: {e}")
+            return None
+        
+        if inserted:
+            self._stats_cache.clear()
+        return inserted
 
     # =========================================================================
     # Channel State / Cursor Management (Production-Grade Pattern)
@@ -772,6 +1181,73 @@ class SignalDatabase:
             logger.error(f"Failed to ensure channel_state table: {e}")
             return False
 
+    async def ensure_indexes(self) -> bool:
+        """
+        Ensure the derived columns and indexes used by the signal queries exist.
+        Called by connect() to handle databases created by older versions.
+        
+        Needs ownership of raw_telegram_messages. On an older database the
+        first run converts raw_json and adds the STORED generated columns,
+        each of which rewrites the whole table under an ACCESS EXCLUSIVE
+        lock, blocking every reader and writer until it finishes; run it
+        in a quiet period on large tables. Later runs are no-ops.
+        """
+        if not self._pool:
+            return False
+        
+        try:
+            async with self._pool.acquire() as conn:
+                # Classify messages once on write so reads filter on an
+                # indexed column instead of scanning raw_text with LIKE
+                await conn.execute(f'''
+                    ALTER TABLE raw_telegram_messages
+                    ADD COLUMN IF NOT EXISTS message_kind TEXT
+                    GENERATED ALWAYS AS ({_MESSAGE_KIND_SQL}) STORED
+                ''')
+                await conn.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_raw_telegram_kind
+                    ON raw_telegram_messages (chat_title, message_kind, message_timestamp DESC)
+                ''')
+                # Parsed message fields, written on insert so reads skip
+                # the regexes; NULL for rows inserted by other writers
+                await conn.execute('''
+                    ALTER TABLE raw_telegram_messages
+                    ADD COLUMN IF NOT EXISTS parsed_token_symbol TEXT,
+                    ADD COLUMN IF NOT EXISTS parsed_token_address TEXT,
+                    ADD COLUMN IF NOT EXISTS parsed_initial_fdv DOUBLE PRECISION,
+                    ADD COLUMN IF NOT EXISTS parsed_current_fdv DOUBLE PRECISION,
+                    ADD COLUMN IF NOT EXISTS parsed_multiplier DOUBLE PRECISION
+                ''')
+                # Databases created by older versions may still store raw_json
+                # as TEXT, which the ->> in parsed_reply_to can't read
+                raw_json_type = await conn.fetchval('''
+                    SELECT data_type FROM information_schema.columns
+                    WHERE table_name = 'raw_telegram_messages' AND column_name = 'raw_json'
+                ''')
+                if raw_json_type == 'text':
+                    await conn.execute(_TRY_JSONB_FUNCTION_SQL)
+                    await conn.execute('''
+                        ALTER TABLE raw_telegram_messages
+                        ALTER COLUMN raw_json TYPE JSONB USING pg_temp.try_jsonb(raw_json)
+                    ''')
+                # Generated, so alerts from any writer can be joined on it
+                await conn.execute(f'''
+                    ALTER TABLE raw_telegram_messages
+                    ADD COLUMN IF NOT EXISTS parsed_reply_to BIGINT
+                    GENERATED ALWAYS AS ({_REPLY_TO_SQL}) STORED
+                ''')
+                # Matches the profit alert -> signal join in get_signals_in_period;
+                # partial, so only profit alerts are indexed
+                await conn.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_raw_telegram_alert_reply_to
+                    ON raw_telegram_messages (chat_title, parsed_reply_to)
+                    WHERE message_kind = 'profit_alert'
+                ''')
+                return True
+        except Exception as e:
+            logger.error(f"Failed to ensure signal indexes: {e}")
+            return False
+
     async def get_signals_for_real_pnl(
         self, 
         days: Optional[int] = None
@@ -790,26 +1266,18 @@ class SignalDatabase:
         
         try:
             async with self._pool.acquire() as conn:
+                cutoff = None
                 if days:
                     cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-                    rows = await conn.fetch('''
-                        SELECT id, telegram_message_id, message_timestamp, raw_text
-                        FROM raw_telegram_messages
-                        WHERE chat_title = $1
-                        AND source_bot = 'trenches_sync'
-                        AND raw_json IS NULL
-                        AND message_timestamp >= $2
-                        ORDER BY message_timestamp DESC
-                    ''', self.CHANNEL_NAME, cutoff)
-                else:
-                    rows = await conn.fetch('''
-                        SELECT id, telegram_message_id, message_timestamp, raw_text
-                        FROM raw_telegram_messages
-                        WHERE chat_title = $1
-                        AND source_bot = 'trenches_sync'
-                        AND raw_json IS NULL
-                        ORDER BY message_timestamp DESC
-                    ''', self.CHANNEL_NAME)
+                rows = await conn.fetch('''
+                    SELECT id, telegram_message_id, message_timestamp, raw_text
+                    FROM raw_telegram_messages
+                    WHERE chat_title = $1
+                    AND source_bot = 'trenches_sync'
+                    AND raw_json IS NULL
+                    AND ($2::timestamptz IS NULL OR message_timestamp >= $2)
+                    ORDER BY message_timestamp DESC
+                ''', self.CHANNEL_NAME, cutoff)
                 
                 signals = []
                 for row in rows:
@@ -849,7 +1317,7 @@ class SignalDatabase:
         return await self.get_signals_in_period(days)
 
 
-@dataclass
+@dataclass(slots=True)
 class RealPnLResult:
     """Result of a real-time PnL calculation for a single token."""
     
@@ -877,7 +1345,7 @@ class RealPnLResult:
         return "🔴"
 
 
-@dataclass
+@dataclass(slots=True)
 class RealPnLStats:
     """Aggregated real-time PnL statistics."""
     
@@ -899,7 +1367,7 @@ class RealPnLStats:
     rugged_tokens: list[RealPnLResult] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class CompareResult:
     """Comparison result for a single token - signal PnL vs real PnL."""
     
@@ -948,7 +1416,7 @@ class CompareResult:
         return "🔴"
 
 
-@dataclass
+@dataclass(slots=True)
 class CompareStats:
     """Aggregated comparison statistics."""
     
@@ -968,55 +1436,184 @@ class CompareStats:
     rugged_count: int = 0
 
 
-async def fetch_token_price_dexscreener(token_address: str) -> dict:
+# Concurrent DexScreener requests while pricing a batch of signals; kept low
+# since the token endpoint is rate limited per minute
+DEXSCREENER_MAX_CONCURRENCY = 5
+
+# Addresses DexScreener accepts in one comma-separated tokens request
+DEXSCREENER_BATCH_SIZE = 30
+
+DEXSCREENER_TOKENS_URL = "https://api.dexscreener.com/latest/dex/tokens/"
+
+# Price data is reused within the same PRICE_CACHE_INTERVAL-second window, so
+# back-to-back PnL and comparison runs share one DexScreener lookup per token
+PRICE_CACHE_INTERVAL = 60
+
+# (token_address, interval bucket) -> price data from _price_from_pairs
+_price_cache: dict[tuple[str, int], dict] = {}
+
+
+def _price_cache_bucket() -> int:
+    """Current price cache bucket, evicting entries from earlier buckets."""
+    bucket = int(time.time()) // PRICE_CACHE_INTERVAL
+    stale = [key for key in _price_cache if key[1] != bucket]
+    for key in stale:
+        del _price_cache[key]
+    return bucket
+
+
+def _price_from_pairs(pairs: list[dict]) -> dict:
+    """Summarise a token's DexScreener pairs using its most liquid pair."""
+    if not pairs:
+        return {"error": "No trading pairs found", "is_rugged": True}
+    
+    # Get the pair with highest liquidity
+    best_pair = max(pairs, key=lambda p: float(p.get("liquidity", {}).get("usd", 0) or 0))
+    
+    price_usd = float(best_pair.get("priceUsd", 0) or 0)
+    mcap = float(best_pair.get("marketCap", 0) or best_pair.get("fdv", 0) or 0)
+    liquidity = float(best_pair.get("liquidity", {}).get("usd", 0) or 0)
+    
+    # Check if rugged (very low liquidity or price)
+    is_rugged = liquidity < 100 or mcap < 1000
+    
+    return {
+        "price_usd": price_usd,
+        "mcap": mcap,
+        "liquidity": liquidity,
+        "is_rugged": is_rugged,
+        "pair_address": best_pair.get("pairAddress"),
+        "dex": best_pair.get("dexId"),
+    }
+
+
+async def fetch_token_price_dexscreener(token_address: str, client=None) -> dict:
     """
     Fetch current token price and market cap from DexScreener.
     
     Args:
         token_address: Solana token address
+        client: Optional shared httpx.AsyncClient; a one-off client is used if omitted
         
     Returns:
         Dict with price, mcap, liquidity info
     """
+    prices = await fetch_token_prices_batch([token_address], client)
+    return prices[token_address]
+
+
+async def fetch_token_prices_batch(token_addresses: list[str], client=None) -> dict[str, dict]:
+    """
+    Fetch current prices for up to DEXSCREENER_BATCH_SIZE tokens in one request.
+    
+    Tokens already priced in the current PRICE_CACHE_INTERVAL window are
+    answered from memory and left out of the request.
+    
+    Args:
+        token_addresses: Solana token addresses
+        client: Optional shared httpx.AsyncClient; a one-off client is used if omitted
+        
+    Returns:
+        Dict mapping each address to its price data, as from fetch_token_price_dexscreener
+    """
     import httpx
     
+    bucket = _price_cache_bucket()
+    prices = {
+        address: _price_cache[(address, bucket)]
+        for address in token_addresses
+        if (address, bucket) in _price_cache
+    }
+    missing = [address for address in token_addresses if address not in prices]
+    if not missing:
+        return prices
+    
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            url = f"https://api.dexscreener.com/latest/dex/tokens/{token_address}"
+        url = DEXSCREENER_TOKENS_URL + ",".join(missing)
+        if client is None:
+            async with httpx.AsyncClient(timeout=10.0) as own_client:
+                response = await own_client.get(url)
+        else:
             response = await client.get(url)
-            
-            if response.status_code != 200:
-                return {"error": f"API error: {response.status_code}"}
-            
-            data = response.json()
-            pairs = data.get("pairs", [])
-            
-            if not pairs:
-                return {"error": "No trading pairs found", "is_rugged": True}
-            
-            # Get the pair with highest liquidity
-            best_pair = max(pairs, key=lambda p: float(p.get("liquidity", {}).get("usd", 0) or 0))
-            
-            price_usd = float(best_pair.get("priceUsd", 0) or 0)
-            mcap = float(best_pair.get("marketCap", 0) or best_pair.get("fdv", 0) or 0)
-            liquidity = float(best_pair.get("liquidity", {}).get("usd", 0) or 0)
-            
-            # Check if rugged (very low liquidity or price)
-            is_rugged = liquidity < 100 or mcap < 1000
-            
-            return {
-                "price_usd": price_usd,
-                "mcap": mcap,
-                "liquidity": liquidity,
-                "is_rugged": is_rugged,
-                "pair_address": best_pair.get("pairAddress"),
-                "dex": best_pair.get("dexId"),
-            }
+        
+        if response.status_code != 200:
+            error = {"error": f"API error: {response.status_code}"}
+            return {**prices, **{address: error for address in missing}}
+        
+        data = response.json()
+        
+        # A pair belongs to whichever requested token it trades, base or quote
+        pairs_by_token: dict[str, list[dict]] = {address: [] for address in missing}
+        for pair in data.get("pairs") or []:
+            for side in ("baseToken", "quoteToken"):
+                address = (pair.get(side) or {}).get("address")
+                if address in pairs_by_token:
+                    pairs_by_token[address].append(pair)
+        
+        # Only answers from DexScreener are cached; request failures are retried
+        for address, pairs in pairs_by_token.items():
+            prices[address] = _price_cache[(address, bucket)] = _price_from_pairs(pairs)
+        return prices
             
     except httpx.TimeoutException:
-        return {"error": "Timeout fetching price"}
+        error = {"error": "Timeout fetching price"}
     except Exception as e:
-        return {"error": str(e)}
+        error = {"error": str(e)}
+    return {**prices, **{address: error for address in missing}}
+
+
+async def _fetch_token_prices(
+    token_addresses: list[str],
+    progress_callback=None,
+) -> list[dict]:
+    """
+    Fetch DexScreener price data for many tokens.
+    
+    Unique addresses are requested DEXSCREENER_BATCH_SIZE at a time over one
+    HTTP/2 client, with at most DEXSCREENER_MAX_CONCURRENCY requests in
+    flight; progress_callback(done, total) is called as batches complete.
+    
+    Returns:
+        Price data dicts in the same order as token_addresses
+    """
+    import httpx
+    
+    total = len(token_addresses)
+    unique = list(dict.fromkeys(token_addresses))
+    batches = [
+        unique[start:start + DEXSCREENER_BATCH_SIZE]
+        for start in range(0, len(unique), DEXSCREENER_BATCH_SIZE)
+    ]
+    positions = Counter(token_addresses)
+    prices: dict[str, dict] = {}
+    semaphore = asyncio.Semaphore(DEXSCREENER_MAX_CONCURRENCY)
+    
+    async with httpx.AsyncClient(
+        http2=True,
+        timeout=10.0,
+        limits=httpx.Limits(
+            max_keepalive_connections=DEXSCREENER_MAX_CONCURRENCY,
+            max_connections=DEXSCREENER_MAX_CONCURRENCY,
+        ),
+    ) as client:
+        async def fetch_one(batch: list[str]) -> dict[str, dict]:
+            async with semaphore:
+                return await fetch_token_prices_batch(batch, client)
+        
+        tasks = [asyncio.create_task(fetch_one(batch)) for batch in batches]
+        try:
+            done = 0
+            for next_result in asyncio.as_completed(tasks):
+                batch_prices = await next_result
+                prices.update(batch_prices)
+                done += sum(positions[address] for address in batch_prices)
+                if progress_callback:
+                    await progress_callback(done, total)
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    return [prices[address] for address in token_addresses]
 
 
 async def calculate_real_pnl(
@@ -1036,14 +1633,12 @@ async def calculate_real_pnl(
     results = []
     total = len(signals)
     
-    for i, signal in enumerate(signals):
-        # Progress update
-        if progress_callback and (i + 1) % 10 == 0:
-            await progress_callback(i + 1, total)
-        
-        # Fetch current price
-        price_data = await fetch_token_price_dexscreener(signal.token_address)
-        
+    # Fetch current prices
+    prices = await _fetch_token_prices(
+        [signal.token_address for signal in signals], progress_callback
+    )
+    
+    for signal, price_data in zip(signals, prices):
         result = RealPnLResult(signal=signal)
         
         if "error" in price_data:
@@ -1061,9 +1656,6 @@ async def calculate_real_pnl(
                 result.pnl_percent = (result.multiplier - 1) * 100
         
         results.append(result)
-        
-        # Small delay to avoid rate limiting
-        await asyncio.sleep(0.1)
     
     # Calculate aggregated stats
     successful = [r for r in results if r.multiplier is not None]
@@ -1073,10 +1665,9 @@ async def calculate_real_pnl(
     winners = [r for r in successful if r.multiplier and r.multiplier >= 1]
     losers = [r for r in successful if r.multiplier and r.multiplier < 1]
     
-    # Sort for top/worst performers
-    sorted_by_mult = sorted(successful, key=lambda r: r.multiplier or 0, reverse=True)
-    top_performers = sorted_by_mult[:15]
-    worst_performers = sorted_by_mult[-15:][::-1] if len(sorted_by_mult) > 15 else sorted_by_mult[::-1]
+    # Top/worst performers without sorting every result
+    top_performers = heapq.nlargest(15, successful, key=lambda r: r.multiplier or 0)
+    worst_performers = heapq.nsmallest(15, successful, key=lambda r: r.multiplier or 0)
     
     # Date range
     timestamps = [s.signal.timestamp for s in results]
@@ -1119,11 +1710,12 @@ async def calculate_comparison(
     results = []
     total = len(signals_with_pnl)
     
-    for i, swp in enumerate(signals_with_pnl):
-        # Progress update
-        if progress_callback and (i + 1) % 10 == 0:
-            await progress_callback(i + 1, total)
-        
+    # Real PnL from DexScreener
+    prices = await _fetch_token_prices(
+        [swp.signal.token_address for swp in signals_with_pnl], progress_callback
+    )
+    
+    for swp, price_data in zip(signals_with_pnl, prices):
         signal = swp.signal
         
         # Create comparison result
@@ -1135,9 +1727,6 @@ async def calculate_comparison(
             result.signal_multiplier = swp.max_multiplier
             result.signal_pnl_percent = swp.pnl_percent
         
-        # Real PnL from DexScreener
-        price_data = await fetch_token_price_dexscreener(signal.token_address)
-        
         if "error" not in price_data:
             current_mcap = price_data.get("mcap")
             result.is_rugged = price_data.get("is_rugged", False)
@@ -1149,9 +1738,6 @@ async def calculate_comparison(
             result.is_rugged = price_data.get("is_rugged", False)
         
         results.append(result)
-        
-        # Small delay to avoid rate limiting
-        await asyncio.sleep(0.1)
     
     # Sort by best multiplier (highest first)
     sorted_results = sorted(results, key=lambda r: r.best_multiplier, reverse=True)
@@ -8,14 +8,17 @@ to calculate historical PnL for different time periods.
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
+import os
+import time
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Any, Optional
 
 import httpx
+import numpy as np
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +27,12 @@ DEFAULT_SIGNAL_HISTORY_FILE = "signal_history.json"
 # DexScreener API for price data
 DEXSCREENER_API = "https://api.dexscreener.com/latest/dex/tokens/{}"
 
+# Prices fetched within the same PRICE_CACHE_INTERVAL-second window are reused
+PRICE_CACHE_INTERVAL = 60
+
+# Changes are written to disk at most once per this many seconds
+SAVE_DEBOUNCE_SECONDS = 2.0
+
 
 @dataclass
 class SignalRecord:
@@ -124,6 +133,12 @@ class SignalHistory:
         self._signals: dict[str, SignalRecord] = {}  # token_address -> SignalRecord
         self._lock = asyncio.Lock()
         self._http_client: Optional[httpx.AsyncClient] = None
+        # (token_address, interval bucket) -> (price_sol, price_usd)
+        self._price_cache: dict[tuple[str, int], tuple[float, float]] = {}
+        # Set when signals change; the saver task writes them out in the background
+        self._dirty = asyncio.Event()
+        self._saver_task: Optional[asyncio.Task] = None
+        self._pending_write: Optional[asyncio.Future] = None
     
     @property
     def signals(self) -> dict[str, SignalRecord]:
@@ -137,21 +152,74 @@ class SignalHistory:
         return self._http_client
     
     async def close(self) -> None:
-        """Close HTTP client."""
+        """Close HTTP client and flush unsaved changes."""
+        if self._saver_task:
+            self._saver_task.cancel()
+            try:
+                await self._saver_task
+            except asyncio.CancelledError:
+                pass
+            self._saver_task = None
+        if self._pending_write:
+            # Let a write already handed to a thread finish before flushing
+            await asyncio.gather(self._pending_write, return_exceptions=True)
+            self._pending_write = None
+        if self._dirty.is_set():
+            self._dirty.clear()
+            self.save()
+        
         if self._http_client:
             await self._http_client.aclose()
             self._http_client = None
     
+    def _mark_dirty(self) -> None:
+        """Schedule a background save, starting the saver task if needed."""
+        self._dirty.set()
+        if self._saver_task is None or self._saver_task.done():
+            self._saver_task = asyncio.create_task(self._saver())
+    
+    async def _saver(self) -> None:
+        """Write changes to disk, coalescing bursts into one write per debounce window."""
+        while True:
+            await self._dirty.wait()
+            await asyncio.sleep(SAVE_DEBOUNCE_SECONDS)
+            self._dirty.clear()
+            try:
+                # Encode on the loop so the records can't change mid-dump
+                payload = self._encode()
+                self._pending_write = asyncio.ensure_future(
+                    asyncio.to_thread(self._write_file, self._history_file, payload)
+                )
+                # Shielded so close() can wait for the write instead of racing it
+                await asyncio.shield(self._pending_write)
+            except Exception as e:
+                logger.error(f"Failed to save signal history: {e}")
+    
+    def _cached_price(self, token_address: str) -> Optional[tuple[float, float]]:
+        """Price fetched in the current cache interval, evicting older ones."""
+        bucket = int(time.time()) // PRICE_CACHE_INTERVAL
+        stale = [key for key in self._price_cache if key[1] != bucket]
+        for key in stale:
+            del self._price_cache[key]
+        return self._price_cache.get((token_address, bucket))
+    
     async def fetch_token_price(self, token_address: str) -> tuple[Optional[float], Optional[float]]:
         """
         Fetch current token price from DexScreener.
         
+        Successful lookups are cached for the rest of the current
+        PRICE_CACHE_INTERVAL window.
+        
         Args:
             token_address: Solana token mint address
             
         Returns:
             Tuple of (price_in_sol, price_in_usd) or (None, None) if failed
         """
+        cached = self._cached_price(token_address)
+        if cached is not None:
+            return cached
+        
         try:
             client = await self._get_http_client()
             url = DEXSCREENER_API.format(token_address)
@@ -176,13 +244,16 @@ class SignalHistory:
             if sol_pair:
                 price_sol = float(sol_pair.get("priceNative", 0))
                 price_usd = float(sol_pair.get("priceUsd", 0))
-                return price_sol, price_usd
+            else:
+                # Fallback to first pair and convert
+                first_pair = pairs[0]
+                price_usd = float(first_pair.get("priceUsd", 0))
+                # Approximate SOL price (assume ~$200 SOL)
+                price_sol = price_usd / 200 if price_usd else None
             
-            # Fallback to first pair and convert
-            first_pair = pairs[0]
-            price_usd = float(first_pair.get("priceUsd", 0))
-            # Approximate SOL price (assume ~$200 SOL)
-            price_sol = price_usd / 200 if price_usd else None
+            if price_sol is not None:
+                bucket = int(time.time()) // PRICE_CACHE_INTERVAL
+                self._price_cache[(token_address, bucket)] = (price_sol, price_usd)
             return price_sol, price_usd
             
         except Exception as e:
@@ -234,7 +305,7 @@ class SignalHistory:
             )
             
             self._signals[token_address] = record
-            self.save()
+            self._mark_dirty()
             
             logger.info(f"Signal recorded: ${token_symbol} @ {price_sol:.10f} SOL")
             return record
@@ -256,6 +327,7 @@ class SignalHistory:
             if addr not in self._signals:
                 continue
             
+            cached = self._cached_price(addr) is not None
             price_sol, price_usd = await self.fetch_token_price(addr)
             
             if price_sol is not None:
@@ -266,10 +338,11 @@ class SignalHistory:
                     updated += 1
             
             # Small delay to avoid rate limiting
-            await asyncio.sleep(0.2)
+            if not cached:
+                await asyncio.sleep(0.2)
         
         if updated > 0:
-            self.save()
+            self._mark_dirty()
         
         return updated
     
@@ -322,20 +395,11 @@ class SignalHistory:
                 "total_pnl_percent": 0.0,
             }
         
-        multipliers = []
-        winners = 0
-        losers = 0
-        
-        for s in signals:
-            mult = s.multiplier
-            if mult is not None and mult > 0:
-                multipliers.append(mult)
-                if mult >= 1.0:
-                    winners += 1
-                else:
-                    losers += 1
+        entry, current = self._price_arrays(signals)
+        priced = (entry > 0) & (current > 0)
+        multipliers = current[priced] / entry[priced]
         
-        if not multipliers:
+        if not multipliers.size:
             return {
                 "total_signals": len(signals),
                 "winners": 0,
@@ -348,34 +412,69 @@ class SignalHistory:
                 "signals_with_price": 0,
             }
         
-        avg_mult = sum(multipliers) / len(multipliers)
-        best_mult = max(multipliers)
-        worst_mult = min(multipliers)
-        
-        # Calculate total PnL as if equal weight invested
-        total_pnl = sum((m - 1) for m in multipliers) / len(multipliers) * 100
+        winners = int(np.count_nonzero(multipliers >= 1.0))
+        avg_mult = float(multipliers.mean())
         
         return {
             "total_signals": len(signals),
-            "signals_with_price": len(multipliers),
+            "signals_with_price": int(multipliers.size),
             "winners": winners,
-            "losers": losers,
-            "win_rate": winners / len(multipliers) * 100 if multipliers else 0,
+            "losers": int(multipliers.size) - winners,
+            "win_rate": winners / multipliers.size * 100,
             "avg_multiplier": avg_mult,
-            "best_multiplier": best_mult,
-            "worst_multiplier": worst_mult,
-            "total_pnl_percent": total_pnl,
+            "best_multiplier": float(multipliers.max()),
+            "worst_multiplier": float(multipliers.min()),
+            # Total PnL as if equal weight invested
+            "total_pnl_percent": (avg_mult - 1) * 100,
         }
     
+    @staticmethod
+    def _price_arrays(signals: list[SignalRecord]) -> tuple[np.ndarray, np.ndarray]:
+        """Entry and current SOL prices as arrays, with missing prices as 0."""
+        count = len(signals)
+        entry = np.fromiter((s.entry_price_sol for s in signals), dtype=np.float64, count=count)
+        current = np.fromiter(
+            (s.current_price_sol or 0.0 for s in signals), dtype=np.float64, count=count
+        )
+        return entry, current
+    
+    def _rank_performers(
+        self,
+        signals: list[SignalRecord],
+        n: int,
+        best: bool,
+    ) -> list[SignalRecord]:
+        """N signals with the highest (best) or lowest multipliers, in rank order."""
+        if n <= 0:
+            return []
+        
+        entry, current = self._price_arrays(signals)
+        # Same signals SignalRecord.multiplier gives a value for
+        priced = np.flatnonzero((entry > 0) & (current != 0))
+        keys = current[priced] / entry[priced]
+        if best:
+            keys = -keys
+        
+        if n < keys.size:
+            # Find the n-th smallest key in O(N) and keep everything below it,
+            # topping up with the earliest signals tied at it, so ties at the
+            # cutoff resolve in list order as a stable sort would
+            cutoff = np.partition(keys, n - 1)[n - 1]
+            below = np.flatnonzero(keys < cutoff)
+            tied = np.flatnonzero(keys == cutoff)[:n - below.size]
+            chosen = np.concatenate([below, tied])
+            chosen = chosen[np.argsort(keys[chosen], kind="stable")]
+        else:
+            chosen = np.argsort(keys, kind="stable")
+        return [signals[i] for i in priced[chosen]]
+    
     def get_top_performers(
         self,
         signals: list[SignalRecord],
         n: int = 5,
     ) -> list[SignalRecord]:
         """Get top N performing signals."""
-        with_mult = [(s, s.multiplier) for s in signals if s.multiplier is not None]
-        with_mult.sort(key=lambda x: x[1], reverse=True)
-        return [s for s, _ in with_mult[:n]]
+        return self._rank_performers(signals, n, best=True)
     
     def get_worst_performers(
         self,
@@ -383,26 +482,31 @@ class SignalHistory:
         n: int = 5,
     ) -> list[SignalRecord]:
         """Get worst N performing signals."""
-        with_mult = [(s, s.multiplier) for s in signals if s.multiplier is not None]
-        with_mult.sort(key=lambda x: x[1])
-        return [s for s, _ in with_mult[:n]]
+        return self._rank_performers(signals, n, best=False)
+    
+    def _encode(self) -> bytes:
+        """Serialise the signal history for writing."""
+        # orjson serialises the records and their datetimes directly, in
+        # the same layout as SignalRecord.to_dict so load can use from_dict
+        data = {
+            "signals": self._signals,
+            "last_updated": datetime.now(timezone.utc),
+        }
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NAIVE_UTC)
+    
+    @staticmethod
+    def _write_file(path: Path, payload: bytes) -> None:
+        """Write the file atomically via a temp file and rename."""
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, path)
     
     def save(self, filepath: Optional[Path] = None) -> None:
         """Save signal history to file."""
         save_path = filepath or self._history_file
         
         try:
-            data = {
-                "signals": {
-                    addr: record.to_dict()
-                    for addr, record in self._signals.items()
-                },
-                "last_updated": datetime.now(timezone.utc).isoformat(),
-            }
-            
-            with open(save_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
-                
+            self._write_file(save_path, self._encode())
         except Exception as e:
             logger.error(f"Failed to save signal history: {e}")
     
@@ -415,8 +519,7 @@ class SignalHistory:
             return False
         
         try:
-            with open(load_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = orjson.loads(load_path.read_bytes())
             
             self._signals = {
                 addr: SignalRecord.from_dict(record_data)
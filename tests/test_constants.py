@@ -85,6 +85,13 @@ class TestRegexPatterns:
         match = pattern.search("Token: - $SOLANA")
         assert match.group(1) == "SOLANA"
     
+    def test_token_symbol_pattern_allows_long_symbols(self):
+        """Test symbols of any length are captured whole."""
+        symbol = "LONG" * 10
+        match = re.search(TOKEN_SYMBOL_PATTERN, f"Token: - ${symbol} ")
+        
+        assert match.group(1) == symbol
+    
     def test_token_address_pattern_valid(self):
         """Test token address pattern is valid regex."""
         pattern = re.compile(TOKEN_ADDRESS_PATTERN)
@@ -117,6 +124,18 @@ class TestRegexPatterns:
         # Extract value
         match = pattern.search("**5.5X**")
         assert float(match.group(1)) == 5.5
+    
+    def test_token_address_pattern_rejects_overlong_runs(self):
+        """Test address pattern does not match a prefix of a longer run."""
+        pattern = re.compile(TOKEN_ADDRESS_PATTERN)
+        
+        assert pattern.search("└ " + "A" * 45) is None
+    
+    def test_patterns_on_long_non_matching_text(self):
+        """Test patterns reject long adversarial messages without matching."""
+        assert re.search(TOKEN_SYMBOL_PATTERN, "Token:" + " " * 20000) is None
+        assert re.search(MULTIPLIER_PATTERN, "1" * 20000) is None
+        assert re.search(TOKEN_ADDRESS_PATTERN, "`" + " " * 20000) is None
 
 
 class TestLoggingConstants:
@@ -65,6 +65,14 @@ class TestBuySignalParser:
         assert result is not None
         assert result.token_symbol == "UNKNOWN"
     
+    def test_parse_reuses_symbol_strings(self, sample_buy_message):
+        """Test repeated signals for the same token share one symbol string."""
+        first = self.parser.parse(1, sample_buy_message)
+        second = self.parser.parse(2, sample_buy_message.replace("$TRUMP", "$trump"))
+        
+        assert first.token_symbol == "TRUMP"
+        assert second.token_symbol is first.token_symbol
+    
     def test_validates_solana_address(self):
         """Test that invalid addresses are rejected."""
         # Address with invalid characters (contains 0, O, I, l)
@@ -157,6 +165,15 @@ class TestMessageParser:
         assert result.buy_signal is None
         assert result.profit_alert is None
     
+    def test_parse_reuses_empty_result(self):
+        """Test that messages without signals share one immutable result."""
+        first = self.parser.parse(1, "Hello world")
+        second = self.parser.parse(2, "Another message")
+        
+        assert first is second
+        with pytest.raises(AttributeError):
+            first.buy_signal = None
+    
     def test_get_parser_returns_singleton(self):
         """Test that get_parser returns the same instance."""
         parser1 = get_parser()
@@ -2,16 +2,21 @@
 Tests for the price_history module.
 """
 
+import asyncio
+import orjson
 import pytest
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from src.price_history import (
     Candle,
+    CandleFrame,
     PriceHistory,
     PriceHistoryFetcher,
     make_naive,
     RATE_LIMIT_DELAY,
+    _retry_after_seconds,
+    get_price_fetcher,
 )
 
 
@@ -59,6 +64,17 @@ class TestCandle:
         assert sample_candle.close == 0.0012
         assert sample_candle.volume == 10000.0
     
+    def test_datetime_timestamp_stored_as_unix_seconds(self, sample_candle):
+        """Test a datetime timestamp is converted to unix seconds."""
+        assert sample_candle.timestamp == 1737720000
+        assert sample_candle.datetime == datetime(2025, 1, 24, 12, 0, 0)
+    
+    def test_candle_is_immutable(self, sample_candle):
+        """Test candles are frozen and carry no instance dict."""
+        with pytest.raises(AttributeError):
+            sample_candle.close = 1.0
+        assert not hasattr(sample_candle, "__dict__")
+    
     def test_timestamp_unix(self, sample_candle):
         """Test timestamp_unix property."""
         unix_ts = sample_candle.timestamp_unix
@@ -67,6 +83,72 @@ class TestCandle:
         assert unix_ts > 0
 
 
+class TestCandleFrame:
+    """Tests for the columnar CandleFrame."""
+    
+    def test_from_rows_sorts_by_timestamp(self):
+        """Test rows are stored in timestamp order."""
+        frame = CandleFrame.from_rows([
+            (1737720900, 2.0, 2.5, 1.5, 2.2, 20.0),
+            (1737720000, 1.0, 1.5, 0.5, 1.2, 10.0),
+        ])
+        
+        assert len(frame) == 2
+        assert frame.ts.tolist() == [1737720000, 1737720900]
+        assert frame.close.tolist() == [1.2, 2.2]
+    
+    def test_from_rows_reverses_newest_first_rows(self):
+        """Test newest-first API order is flipped without a full sort."""
+        rows = [(1737720000 + 900 * i, 1.0, 1.5, 0.5, float(i), 10.0) for i in range(5)]
+        frame = CandleFrame.from_rows(list(reversed(rows)))
+        
+        assert frame.ts.tolist() == sorted(frame.ts.tolist())
+        assert frame.close.tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+        assert frame.ts.flags["C_CONTIGUOUS"]
+    
+    def test_from_rows_drops_invalid_rows(self):
+        """Test short and non-numeric rows are skipped."""
+        frame = CandleFrame.from_rows([
+            [1737720000, "1.0", "1.5", "0.5", "1.2", "10.0"],
+            [1737720900, "bad", 2.5, 1.5, 2.2, 20.0],
+            [1737721800, None, 2.5, 1.5, 2.2, 20.0],
+            [1737722700, 3.0],
+        ])
+        
+        assert frame.ts.tolist() == [1737720000]
+        assert frame.high.tolist() == [1.5]
+    
+    def test_getitem_returns_candle(self):
+        """Test indexing materializes a Candle with a naive UTC timestamp."""
+        frame = CandleFrame.from_rows([(1737720000, 1.0, 1.5, 0.5, 1.2, 10.0)])
+        candle = frame[0]
+        
+        assert isinstance(candle, Candle)
+        assert candle.timestamp == 1737720000
+        assert candle.datetime == datetime(2025, 1, 24, 12, 0, 0)
+        assert candle.high == 1.5
+    
+    def test_datetimes_bulk_conversion(self):
+        """Test timestamps convert to naive UTC datetimes in bulk."""
+        frame = CandleFrame.from_rows([
+            (1737720000, 1.0, 1.5, 0.5, 1.2, 10.0),
+            (1737720900, 2.0, 2.5, 1.5, 2.2, 20.0),
+        ])
+        
+        assert frame.datetimes() == [
+            datetime(2025, 1, 24, 12, 0, 0),
+            datetime(2025, 1, 24, 12, 15, 0),
+        ]
+        assert frame.datetimes([1]) == [frame.datetime_at(1)]
+    
+    def test_empty_frame(self):
+        """Test an empty frame is falsy and has no rows."""
+        frame = CandleFrame.empty()
+        
+        assert not frame
+        assert list(frame) == []
+
+
 class TestPriceHistory:
     """Tests for PriceHistory dataclass."""
     
@@ -230,6 +312,38 @@ class TestPriceHistorySimulations:
         assert reason == "trailing_stop"
         assert mult is not None
     
+    def test_simulate_trailing_stop_exit_price(self, trending_down_candles):
+        """Test trailing stop exits at the stop implied by the running peak."""
+        history = PriceHistory(
+            token_address="test",
+            candles=list(reversed(trending_down_candles)),
+        )
+        
+        mult, reason, exit_time = history.simulate_trailing_stop(
+            entry_time=datetime(2025, 1, 24, 10, 0, 0),
+            entry_price=0.001,
+            trailing_pct=0.30,
+        )
+        
+        # Peak 0.0015 -> stop 0.00105, hit by the 11:00 candle low
+        assert reason == "trailing_stop"
+        assert mult == pytest.approx(1.05)
+        assert exit_time == datetime(2025, 1, 24, 11, 0, 0)
+    
+    def test_simulate_trailing_stop_still_open(self, trending_up_candles):
+        """Test trailing stop reports still_open when nothing triggers."""
+        history = PriceHistory(token_address="test", candles=trending_up_candles)
+        
+        mult, reason, exit_time = history.simulate_trailing_stop(
+            entry_time=datetime(2025, 1, 24, 10, 0, 0),
+            entry_price=0.001,
+            trailing_pct=0.50,
+        )
+        
+        assert reason == "still_open"
+        assert mult == pytest.approx(2.4)
+        assert exit_time == datetime(2025, 1, 24, 13, 0, 0)
+    
     def test_simulate_trailing_stop_time_exit(self, trending_up_candles):
         """Test trailing stop with time limit exit."""
         history = PriceHistory(
@@ -326,6 +440,95 @@ class TestPriceHistorySimulations:
         assert len(exits) >= 1
         assert mult > 0
 
+    def test_simulate_tiered_exit_all_tiers_then_trailing(self, trending_down_candles):
+        """Test trailing stop closes the remainder once every tier is hit."""
+        history = PriceHistory(token_address="test", candles=trending_down_candles)
+        
+        mult, reason, exits = history.simulate_tiered_exit(
+            entry_time=datetime(2025, 1, 24, 10, 0, 0),
+            entry_price=0.001,
+            tiers=[(1.2, 0.5)],
+            trailing_pct=0.30,
+        )
+        
+        # 1.2X tier at 10:00, then 30% trail from the 0.0015 peak hits at 11:00
+        assert reason == "trailing_stop"
+        assert [e[1] for e in exits] == [0.5, 0.5]
+        assert exits[0][2] == datetime(2025, 1, 24, 10, 0, 0)
+        assert exits[1][0] == pytest.approx(1.05)
+        assert exits[1][2] == datetime(2025, 1, 24, 11, 0, 0)
+        assert mult == pytest.approx(0.5 * 1.2 + 0.5 * 1.05)
+    
+    def test_simulate_tiered_exit_all_tiers_hit(self, trending_up_candles):
+        """Test the reason is all_tiers_hit once every tier has filled."""
+        history = PriceHistory(token_address="test", candles=trending_up_candles)
+        
+        mult, reason, exits = history.simulate_tiered_exit(
+            entry_time=datetime(2025, 1, 24, 10, 0, 0),
+            entry_price=0.001,
+            tiers=[(1.2, 0.5), (1.5, 0.5)],
+        )
+        
+        assert reason == "all_tiers_hit"
+        assert [e[0] for e in exits] == [1.2, 1.5]
+        assert mult == pytest.approx(1.35)
+    
+    def test_simulate_tiered_exit_time_exit_sells_remainder_once(self, trending_up_candles):
+        """Test a time exit closes the remaining position exactly once."""
+        history = PriceHistory(token_address="test", candles=trending_up_candles)
+        
+        mult, reason, exits = history.simulate_tiered_exit(
+            entry_time=datetime(2025, 1, 24, 10, 0, 0),
+            entry_price=0.001,
+            tiers=[(1.5, 0.5), (3.0, 0.5)],
+            max_hold_hours=2,
+        )
+        
+        assert sum(pct for _, pct, _ in exits) == pytest.approx(1.0)
+        assert exits[-1][2] == datetime(2025, 1, 24, 13, 0, 0)
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_simulate_all_matches_individual_simulations(self, seed):
+        """Test the fused simulation agrees with the three separate ones."""
+        import numpy as np
+        
+        rng = np.random.default_rng(seed)
+        base_time = datetime(2025, 1, 24, 10, 0, 0)
+        closes = np.exp(np.cumsum(rng.normal(0, 0.08, 300))) * 0.001
+        candles = [
+            Candle(base_time + timedelta(minutes=15 * i), c, c * 1.05, c * 0.95, c, 100.0)
+            for i, c in enumerate(closes)
+        ]
+        history = PriceHistory(token_address="test", candles=candles)
+        entry_time = base_time + timedelta(hours=2)
+        entry_price = history.get_price_at(entry_time)
+        tiers = [(1.5, 0.5), (2.5, 0.5)]
+        
+        fused = history.simulate_all(
+            entry_time, entry_price,
+            trailing_pct=0.2, target_mult=1.8, stop_loss_mult=0.6,
+            tiers=tiers, tier_trailing_pct=0.25, max_hold_hours=48,
+        )
+        
+        assert fused["trailing_stop"] == history.simulate_trailing_stop(
+            entry_time, entry_price, trailing_pct=0.2, max_hold_hours=48
+        )
+        assert fused["fixed_exit"] == history.simulate_fixed_exit(
+            entry_time, entry_price, target_mult=1.8, stop_loss_mult=0.6, max_hold_hours=48
+        )
+        assert fused["tiered_exit"] == history.simulate_tiered_exit(
+            entry_time, entry_price, tiers=tiers, trailing_pct=0.25, max_hold_hours=48
+        )
+    
+    def test_simulate_all_no_data(self):
+        """Test the fused simulation reports no_data for every strategy."""
+        history = PriceHistory(token_address="test")
+        
+        fused = history.simulate_all(datetime(2025, 1, 24, 10, 0, 0), 0.001)
+        
+        assert fused["trailing_stop"] == (None, "no_data", None)
+        assert fused["tiered_exit"] == (1.0, "no_data", [])
+
 
 class TestPriceHistoryFetcher:
     """Tests for PriceHistoryFetcher class."""
@@ -345,6 +548,16 @@ class TestPriceHistoryFetcher:
         # Cleanup
         await client.aclose()
     
+    @pytest.mark.asyncio
+    async def test_get_client_configures_pool(self, fetcher):
+        """Test the HTTP client is created with HTTP/2 and pool limits."""
+        with patch("src.price_history.httpx.AsyncClient") as mock_client_cls:
+            await fetcher._get_client()
+        
+        kwargs = mock_client_cls.call_args.kwargs
+        assert kwargs["http2"] is True
+        assert kwargs["limits"].max_connections == 50
+    
     @pytest.mark.asyncio
     async def test_get_client_reuses_client(self, fetcher):
         """Test that _get_client reuses existing client."""
@@ -387,6 +600,48 @@ class TestPriceHistoryFetcher:
         # Should not delay significantly
         assert elapsed < 0.1
     
+    @pytest.mark.asyncio
+    async def test_rate_limit_spaces_concurrent_callers(self, fetcher):
+        """Test concurrent callers reserve distinct request slots."""
+        import time
+        
+        fetcher._last_request_time = time.time() - 100
+        
+        with patch("src.price_history.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            await asyncio.gather(fetcher._rate_limit(), fetcher._rate_limit())
+        
+        # The first call goes immediately, the second waits one full slot
+        assert mock_sleep.await_count == 1
+        assert mock_sleep.await_args.args[0] == pytest.approx(RATE_LIMIT_DELAY, abs=0.1)
+    
+    @pytest.mark.asyncio
+    async def test_fetch_multiple_runs_concurrently(self, fetcher):
+        """Test fetch_multiple overlaps fetches and keeps input order."""
+        in_flight = 0
+        max_in_flight = 0
+        
+        async def fake_fetch(address, timeframe_minutes=15, limit=1000):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01 if address == "a" else 0)
+            in_flight -= 1
+            return None if address == "c" else PriceHistory(token_address=address)
+        
+        progress = []
+        
+        async def on_progress(current, total):
+            progress.append((current, total))
+        
+        with patch.object(fetcher, "fetch_ohlcv", side_effect=fake_fetch):
+            results = await fetcher.fetch_multiple(
+                ["a", "b", "c"], progress_callback=on_progress
+            )
+        
+        assert list(results) == ["a", "b"]
+        assert max_in_flight > 1
+        assert progress == [(1, 3), (2, 3), (3, 3)]
+    
     @pytest.mark.asyncio
     async def test_get_pool_address_uses_cache(self, fetcher):
         """Test that pool address is cached."""
@@ -402,12 +657,12 @@ class TestPriceHistoryFetcher:
         """Test pool address API call."""
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response.content = orjson.dumps({
             "data": [{
                 "id": "solana_test_pool",
                 "attributes": {"address": "pool_address_123"}
             }]
-        }
+        })
         
         with patch.object(fetcher, '_get_client') as mock_get_client:
             mock_client = AsyncMock()
@@ -420,6 +675,152 @@ class TestPriceHistoryFetcher:
                 # Result depends on actual implementation
                 assert result is not None or result is None  # Just verify no crash
 
+    @pytest.mark.asyncio
+    async def test_fetch_ohlcv_builds_sorted_frame(self, fetcher):
+        """Test OHLCV rows are parsed into a sorted CandleFrame."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = orjson.dumps({
+            "data": {"attributes": {"ohlcv_list": [
+                [1737720900, 2.0, 2.5, 1.5, 2.2, 20.0],
+                [1737720000, 1.0, 1.5, 0.5, 1.2, 10.0],
+                [1737721800, 3.0],  # malformed row is skipped
+            ]}}
+        })
+        
+        mock_client = AsyncMock()
+        mock_client.get = AsyncMock(return_value=mock_response)
+        
+        with patch.object(fetcher, '_get_client', AsyncMock(return_value=mock_client)), \
+             patch.object(fetcher, '_rate_limit', new_callable=AsyncMock):
+            history = await fetcher.fetch_ohlcv("token", pool_address="pool")
+        
+        assert history is not None
+        assert len(history.candles) == 2
+        assert history.candles.ts.tolist() == [1737720000, 1737720900]
+        assert history.get_price_at(datetime(2025, 1, 24, 12, 5, 0)) == 1.2
+
+    @pytest.mark.asyncio
+    async def test_request_retries_after_429(self, fetcher):
+        """Test a 429 is retried and pushes the shared schedule back."""
+        import time
+        
+        limited = MagicMock()
+        limited.status_code = 429
+        limited.headers = {"Retry-After": "30"}
+        ok = MagicMock()
+        ok.status_code = 200
+        
+        mock_client = AsyncMock()
+        mock_client.get = AsyncMock(side_effect=[limited, ok])
+        
+        with patch.object(fetcher, '_get_client', AsyncMock(return_value=mock_client)), \
+             patch.object(fetcher, '_rate_limit', new_callable=AsyncMock) as mock_rate_limit:
+            response = await fetcher._request_with_retry("https://example.test")
+        
+        assert response is ok
+        assert mock_rate_limit.await_count == 2
+        assert fetcher._last_request_time >= time.time() + 30 - RATE_LIMIT_DELAY - 1
+    
+    @pytest.mark.asyncio
+    async def test_request_gives_up_after_max_retries(self, fetcher):
+        """Test the last 429 is returned once retries run out."""
+        limited = MagicMock()
+        limited.status_code = 429
+        limited.headers = {}
+        
+        mock_client = AsyncMock()
+        mock_client.get = AsyncMock(return_value=limited)
+        
+        with patch.object(fetcher, '_get_client', AsyncMock(return_value=mock_client)), \
+             patch.object(fetcher, '_rate_limit', new_callable=AsyncMock):
+            response = await fetcher._request_with_retry("https://example.test", max_retries=2)
+        
+        assert response is limited
+        assert mock_client.get.await_count == 3
+    
+    def test_retry_after_parsing(self):
+        """Test Retry-After accepts seconds and HTTP-dates, else backs off."""
+        assert _retry_after_seconds("7", 0) == 7.0
+        assert _retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT", 0) == 0.0
+        assert _retry_after_seconds(None, 0) == 1.0
+        assert _retry_after_seconds("soon", 2) == 4.0
+    
+    @pytest.mark.asyncio
+    async def test_fetch_ohlcv_uses_disk_cache(self, tmp_path):
+        """Test a repeated fetch is served from the on-disk cache."""
+        fetcher = PriceHistoryFetcher(cache_dir=tmp_path)
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = orjson.dumps({
+            "data": {"attributes": {"ohlcv_list": [
+                [1737720000, 1.0, 1.5, 0.5, 1.2, 10.0],
+            ]}}
+        })
+        mock_client = AsyncMock()
+        mock_client.get = AsyncMock(return_value=mock_response)
+        
+        with patch.object(fetcher, '_get_client', AsyncMock(return_value=mock_client)), \
+             patch.object(fetcher, '_rate_limit', new_callable=AsyncMock):
+            first = await fetcher.fetch_ohlcv("token", pool_address="pool")
+            second = await fetcher.fetch_ohlcv("token", pool_address="pool")
+        
+        assert mock_client.get.await_count == 1
+        assert second.candles.ts.tolist() == first.candles.ts.tolist()
+        assert second.candles.close.tolist() == [1.2]
+    
+    @pytest.mark.asyncio
+    async def test_pool_cache_persists_across_fetchers(self, tmp_path):
+        """Test pool lookups are saved on close and reloaded."""
+        fetcher = PriceHistoryFetcher(cache_dir=tmp_path)
+        fetcher._pool_cache["token"] = "pool"
+        await fetcher.close()
+        
+        reloaded = PriceHistoryFetcher(cache_dir=tmp_path)
+        
+        assert await reloaded.get_pool_address("token") == "pool"
+    
+    @pytest.mark.asyncio
+    async def test_fetch_multiple_saves_new_pool_lookups(self, tmp_path):
+        """Test pools resolved by fetch_multiple are saved without closing the fetcher."""
+        fetcher = PriceHistoryFetcher(cache_dir=tmp_path)
+        response = MagicMock(status_code=200)
+        response.content = orjson.dumps({"data": [{"attributes": {"address": "pool"}}]})
+        mock_client = AsyncMock()
+        mock_client.get = AsyncMock(return_value=response)
+        
+        async def fake_fetch(address, timeframe_minutes=15, limit=1000):
+            await fetcher.get_pool_address(address)
+            return None
+        
+        with patch.object(fetcher, "_get_client", AsyncMock(return_value=mock_client)), \
+                patch.object(fetcher, "_rate_limit", new_callable=AsyncMock), \
+                patch.object(fetcher, "fetch_ohlcv", side_effect=fake_fetch):
+            await fetcher.fetch_multiple(["token"])
+        
+        reloaded = PriceHistoryFetcher(cache_dir=tmp_path)
+        assert reloaded._pool_cache == {"token": "pool"}
+
+    def test_get_price_fetcher_is_per_event_loop(self):
+        """Test each event loop gets its own fetcher sharing pool lookups."""
+        async def get():
+            return get_price_fetcher(), get_price_fetcher()
+        
+        first, same = asyncio.run(get())
+        second, _ = asyncio.run(get())
+        
+        assert first is same
+        assert second is not first
+        assert second._pool_cache is first._pool_cache
+    
+    @pytest.mark.asyncio
+    async def test_fetcher_context_manager_closes_client(self):
+        """Test leaving the async context closes the HTTP client."""
+        async with PriceHistoryFetcher() as fetcher:
+            await fetcher._get_client()
+        
+        assert fetcher._client is None
+
 
 class TestPriceHistoryEdgeCases:
     """Edge case tests for price history."""
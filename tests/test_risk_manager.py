@@ -8,9 +8,12 @@ Covers:
 - Portfolio risk tracking
 """
 
+import time
+
+import numpy as np
 import pytest
 from datetime import datetime, timezone, timedelta
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, PropertyMock, patch
 
 from src.risk_manager import (
     StopLossType,
@@ -25,6 +28,15 @@ from src.risk_manager import (
     StopLossResult,
     PositionSizeResult,
     PortfolioRiskMetrics,
+    STOP_DISABLED,
+    STOP_NONE,
+    STOP_FIXED,
+    STOP_TRAILING,
+    STOP_TIME,
+    STOP_ATR,
+    _eval_stops,
+    TriggerReason,
+    TRIGGER_CONSECUTIVE_LOSSES,
 )
 from src.models import Position, PositionStatus
 
@@ -115,6 +127,22 @@ class TestStopLossManager:
         assert result.should_exit is True
         assert result.stop_type == StopLossType.FIXED_PERCENTAGE
         assert "fixed stop loss" in result.reason.lower()
+        # The fixed level is not an ATR stop level
+        assert result.atr_stop_level == 0.0
+
+    def test_result_formats_reason_from_stored_values(self):
+        """Test results keep only the stop code and numbers behind the reason."""
+        result = StopLossResult(
+            should_exit=True,
+            code=STOP_TRAILING,
+            current_multiplier=1.6,
+            peak_multiplier=2.0,
+        )
+
+        assert result.stop_type == StopLossType.TRAILING
+        assert result.reason == "Trailing stop triggered: 1.60X (dropped 20.0% from peak 2.00X)"
+        assert StopLossResult(should_exit=False).stop_type is None
+        assert StopLossResult(should_exit=False, code=STOP_DISABLED).stop_type is None
 
     def test_fixed_stop_loss_no_trigger(self, default_stop_loss_config, sample_position):
         """Test fixed stop loss doesn't trigger above threshold."""
@@ -204,6 +232,115 @@ class TestStopLossManager:
 
         assert result.should_exit is False
 
+    @pytest.mark.parametrize("enabled", [True, False])
+    def test_evaluate_batch_matches_evaluate(self, default_stop_loss_config, enabled):
+        """Test batch results agree field by field with per-position evaluation."""
+        default_stop_loss_config.enabled = enabled
+        manager = StopLossManager(default_stop_loss_config)
+        cases = [
+            # (current, peak, hours held, atr)
+            (0.74, 1.0, 2, None),     # fixed
+            (1.5, 2.0, 2, None),      # trailing
+            (0.9, 1.0, 25, None),     # time
+            (0.78, 1.0, 2, 0.1),      # atr
+            (1.2, 1.3, 30, 0.05),     # nothing
+            (0.7, 2.0, 30, 0.2),      # fixed wins over the rest
+        ]
+
+        batch = manager.evaluate_batch(
+            [c[0] for c in cases],
+            [c[1] for c in cases],
+            [c[2] for c in cases],
+            [float("nan") if c[3] is None else c[3] for c in cases],
+        )
+
+        for i, (current, peak, hours, atr) in enumerate(cases):
+            position = Position(
+                token_address="TokenAddress123456789012345678901234567890",
+                token_symbol="TEST",
+                buy_time=datetime.now(timezone.utc) - timedelta(hours=hours),
+                buy_amount_sol=0.1,
+                signal_msg_id=12345,
+            )
+            expected = manager.evaluate(position, current, peak, atr)
+            result = batch.result(i)
+            assert result.should_exit is expected.should_exit
+            assert result.code == expected.code
+            assert result.reason == expected.reason
+            assert result.current_multiplier == expected.current_multiplier
+            assert result.peak_multiplier == expected.peak_multiplier
+            assert result.hold_hours == pytest.approx(expected.hold_hours, abs=1e-3)
+            assert result.atr_stop_level == pytest.approx(expected.atr_stop_level)
+        assert batch.exit_indices.tolist() == ([0, 1, 2, 3, 5] if enabled else [])
+
+    @pytest.mark.parametrize("stop_loss_type", [StopLossType.FIXED_PERCENTAGE, StopLossType.TRAILING])
+    def test_evaluate_batch_matches_kernel_on_random_inputs(self, default_stop_loss_config, stop_loss_type):
+        """Test the fused batch levels pick the same rule as the scalar kernel."""
+        default_stop_loss_config.stop_loss_type = stop_loss_type
+        manager = StopLossManager(default_stop_loss_config)
+        rng = np.random.default_rng(7)
+        n = 500
+        current = rng.uniform(0.3, 2.5, n)
+        peak = np.maximum(current, rng.uniform(0.5, 4.0, n))
+        hours = rng.uniform(0, 48, n)
+        atrs = np.where(rng.random(n) < 0.3, np.nan, rng.uniform(0, 0.3, n))
+
+        batch = manager.evaluate_batch(current, peak, hours, atrs)
+
+        fixed_enabled = stop_loss_type == StopLossType.FIXED_PERCENTAGE
+        expected = [
+            _eval_stops(c, p, h, a, fixed_enabled, 0.75, 1.5, 0.8, 24.0, 2.0)[0]
+            for c, p, h, a in zip(current, peak, hours, atrs)
+        ]
+        assert batch.stop_codes.tolist() == expected
+
+    def test_evaluate_batch_disabled(self, default_stop_loss_config):
+        """Test disabled stop loss never triggers in batch mode."""
+        default_stop_loss_config.enabled = False
+        manager = StopLossManager(default_stop_loss_config)
+
+        batch = manager.evaluate_batch([0.1, 0.2], [1.0, 3.0], [100, 100])
+
+        assert not batch.should_exit.any()
+
+    def test_eval_stops_kernel(self):
+        """Test the stop kernel returns the first breached rule and its level."""
+        args = (True, 0.75, 1.5, 0.8, 24.0, 2.0)
+
+        assert _eval_stops(0.9, 1.0, 2.0, float("nan"), *args) == (STOP_NONE, 0.0)
+        assert _eval_stops(0.7, 2.0, 30.0, 0.2, *args) == (STOP_FIXED, 0.75)
+        assert _eval_stops(1.5, 2.0, 2.0, float("nan"), *args) == (STOP_TRAILING, pytest.approx(1.6))
+        assert _eval_stops(0.9, 1.0, 25.0, float("nan"), *args) == (STOP_TIME, 1.0)
+        assert _eval_stops(0.78, 1.0, 2.0, 0.1, *args) == (STOP_ATR, pytest.approx(0.8))
+
+    def test_no_exit_result_keeps_current_multiplier(self, default_stop_loss_config, sample_position):
+        """Test the no-exit result reports the evaluated multiplier."""
+        manager = StopLossManager(default_stop_loss_config)
+
+        result = manager.evaluate(sample_position, current_multiplier=0.9)
+
+        assert result.should_exit is False
+        assert result.current_multiplier == 0.9
+
+    def test_stop_loss_result_is_frozen(self, default_stop_loss_config, sample_position):
+        """Test stop loss results are immutable slotted records."""
+        manager = StopLossManager(default_stop_loss_config)
+        result = manager.evaluate(sample_position, current_multiplier=0.5)
+
+        assert not hasattr(result, "__dict__")
+        with pytest.raises(AttributeError):
+            result.should_exit = False
+
+    def test_hold_time_only_read_when_underwater(self, default_stop_loss_config):
+        """Test the position clock is skipped when the time stop can't apply."""
+        manager = StopLossManager(default_stop_loss_config)
+        position = MagicMock()
+        type(position).holding_duration = PropertyMock(side_effect=AssertionError)
+
+        result = manager.evaluate(position, current_multiplier=1.2, peak_multiplier=1.2)
+
+        assert result.should_exit is False
+
     def test_update_config(self, default_stop_loss_config):
         """Test updating stop loss configuration."""
         manager = StopLossManager(default_stop_loss_config)
@@ -213,6 +350,25 @@ class TestStopLossManager:
         assert manager.config.fixed_percentage == 0.30
         assert manager.config.enabled is False
 
+    def test_update_config_ignores_unknown_keys(self, default_stop_loss_config, caplog):
+        """Test unknown config keys are skipped with a warning."""
+        manager = StopLossManager(default_stop_loss_config)
+
+        manager.update_config(fixed_percentage=0.30, not_a_field=1)
+
+        assert manager.config.fixed_percentage == 0.30
+        assert not hasattr(manager.config, "not_a_field")
+        assert "not_a_field" in caplog.text
+
+    def test_update_config_refreshes_stop_levels(self, default_stop_loss_config, sample_position):
+        """Test derived stop levels follow config updates."""
+        manager = StopLossManager(default_stop_loss_config)
+        assert manager.evaluate(sample_position, current_multiplier=0.72).should_exit is True
+
+        manager.update_config(fixed_percentage=0.30)
+
+        assert manager.evaluate(sample_position, current_multiplier=0.72).should_exit is False
+
 
 # ==================== POSITION SIZING TESTS ====================
 
@@ -274,6 +430,48 @@ class TestPositionSizer:
 
         assert result.volatility_factor == 1.25
 
+    def test_volatility_factor_buckets(self, default_sizing_config):
+        """Test bucket boundaries match for scalar and batch lookups."""
+        sizer = PositionSizer(default_sizing_config, capital=10.0)
+        vols = [0.0, 0.049, 0.05, 0.10, 0.15, 0.20, 0.30]
+        expected = [1.25, 1.25, 1.0, 1.0, 0.75, 0.75, 0.5]
+
+        assert [sizer._calculate_volatility_factor(v) for v in vols] == expected
+        assert sizer.calculate_volatility_factors(vols).tolist() == expected
+
+        sizer.update_config(high_volatility_reduction=0.25)
+        assert sizer._calculate_volatility_factor(0.30) == 0.25
+
+    def test_non_finite_volatility_is_neutral(self, default_sizing_config):
+        """Test NaN or infinite volatility never resizes the position."""
+        sizer = PositionSizer(default_sizing_config, capital=10.0)
+        vols = [float("nan"), float("inf"), float("-inf")]
+
+        assert [sizer._calculate_volatility_factor(v) for v in vols] == [1.0, 1.0, 1.0]
+        assert sizer.calculate_volatility_factors(vols + [0.03]).tolist() == [1.0, 1.0, 1.0, 1.25]
+        assert sizer.calculate_size(volatility=float("nan")).volatility_factor == 1.0
+
+    def test_quality_and_kelly_factors_are_bucketed(self, default_sizing_config):
+        """Test cached factors bucket inputs and follow config changes."""
+        sizer = PositionSizer(default_sizing_config, capital=10.0)
+
+        assert sizer._calculate_quality_multiplier(74.6) == sizer._calculate_quality_multiplier(75)
+        assert sizer._calculate_quality_multiplier(150) == pytest.approx(1.5)
+        assert sizer._calculate_kelly_factor(0.601) == sizer._calculate_kelly_factor(0.60)
+        assert sizer._calculate_kelly_factor(0.60) == pytest.approx(1.1)
+
+        sizer.update_config(max_size_multiplier=2.0)
+        assert sizer._calculate_quality_multiplier(100) == pytest.approx(2.0)
+
+    def test_non_finite_win_rate_kelly_factor(self, default_sizing_config):
+        """Test NaN or infinite win rates give a neutral or clamped Kelly factor."""
+        sizer = PositionSizer(default_sizing_config, capital=10.0)
+
+        assert sizer._calculate_kelly_factor(float("nan")) == 1.0
+        assert sizer._calculate_kelly_factor(float("inf")) == pytest.approx(1.5)
+        assert sizer._calculate_kelly_factor(float("-inf")) == pytest.approx(0.5)
+        assert sizer._calculate_kelly_factor(5.0) == pytest.approx(1.5)
+
     def test_size_capped_by_max(self, default_sizing_config):
         """Test position size is capped at maximum."""
         sizer = PositionSizer(default_sizing_config, capital=100.0)
@@ -371,6 +569,37 @@ class TestCircuitBreaker:
 
         assert triggered is False
 
+    def test_trigger_reason_formats_lazily(self, default_circuit_config):
+        """Test trigger reasons are stored as data and formatted as before."""
+        cb = CircuitBreaker(default_circuit_config, capital=10.0)
+
+        cb.record_trade(-0.6)
+
+        assert isinstance(cb._trigger_reason, TriggerReason)
+        assert cb.trigger_reason == "Daily loss limit reached: -0.6000 SOL (limit: -0.5000)"
+        assert str(TriggerReason(TRIGGER_CONSECUTIVE_LOSSES, 5, 5)) == "Consecutive loss limit reached: 5 losses"
+
+    def test_rolling_drawdown_triggers_breaker(self, default_circuit_config):
+        """Test a drop from the recent cumulative PnL high triggers the breaker."""
+        default_circuit_config.rolling_window = 3
+        default_circuit_config.rolling_drawdown_limit_pct = 0.05  # 0.5 SOL
+        cb = CircuitBreaker(default_circuit_config, capital=10.0)
+
+        assert cb.record_trade(1.0) is False
+        assert cb.record_trade(-0.3) is False
+        assert cb.record_trade(-0.3) is True
+        assert "rolling drawdown" in cb.trigger_reason.lower()
+
+    def test_rolling_drawdown_high_slides_out_of_window(self, default_circuit_config):
+        """Test highs older than the window no longer count."""
+        default_circuit_config.rolling_window = 2
+        default_circuit_config.rolling_drawdown_limit_pct = 0.05
+        cb = CircuitBreaker(default_circuit_config, capital=10.0)
+
+        for pnl in (1.0, -0.3, -0.3):
+            assert cb.record_trade(pnl) is False
+        assert cb._window_max[0][1] == pytest.approx(0.7)
+
     def test_can_trade_when_ok(self, default_circuit_config):
         """Test can_trade returns True when circuit breaker not triggered."""
         cb = CircuitBreaker(default_circuit_config, capital=10.0)
@@ -399,12 +628,24 @@ class TestCircuitBreaker:
         cb.record_trade(-0.6)  # Trigger
 
         # Manually expire cooldown
-        cb._cooldown_until = datetime.now(timezone.utc) - timedelta(minutes=1)
+        cb._cooldown_deadline = time.monotonic() - 60
 
         can_trade, reason = cb.can_trade()
 
         assert can_trade is True
 
+    def test_cooldown_uses_monotonic_deadline(self, default_circuit_config):
+        """Test the cooldown follows the monotonic deadline, not the wall clock."""
+        cb = CircuitBreaker(default_circuit_config, capital=10.0)
+        cb.record_trade(-0.6)
+
+        # A wall-clock display time in the past doesn't end the cooldown
+        cb._cooldown_until = datetime.now(timezone.utc) - timedelta(minutes=1)
+        can_trade, reason = cb.can_trade()
+
+        assert can_trade is False
+        assert "60m remaining" in reason
+
     def test_manual_reset(self, default_circuit_config):
         """Test manual reset of circuit breaker."""
         cb = CircuitBreaker(default_circuit_config, capital=10.0)
@@ -418,6 +659,15 @@ class TestCircuitBreaker:
         can_trade, _ = cb.can_trade()
         assert can_trade is True
 
+    def test_day_reset_uses_given_time(self, default_circuit_config):
+        """Test daily PnL resets when the supplied time is on a later day."""
+        cb = CircuitBreaker(default_circuit_config, capital=10.0)
+        cb.record_trade(-0.1)
+
+        cb._check_day_reset(datetime.now(timezone.utc) + timedelta(days=1))
+
+        assert cb.get_metrics()["daily_pnl"] == 0.0
+
     def test_get_metrics(self, default_circuit_config):
         """Test getting circuit breaker metrics."""
         cb = CircuitBreaker(default_circuit_config, capital=10.0)
@@ -505,6 +755,84 @@ class TestRiskManager:
         assert can_open is False
         assert "heat" in reason.lower() or "portfolio" in reason.lower()
 
+    def test_incremental_exposure_tracking(self):
+        """Test open/close events keep exposure in line with a full recompute."""
+        manager = RiskManager(capital=10.0)
+        positions = [
+            Position(
+                token_address=f"Token{i}123456789012345678901234567890",
+                token_symbol=f"T{i}",
+                buy_time=datetime.now(timezone.utc),
+                buy_amount_sol=0.3,
+                signal_msg_id=i,
+            )
+            for i in range(3)
+        ]
+
+        for position in positions:
+            manager.on_position_opened(position)
+        manager.on_position_closed(positions[1])
+        manager.on_position_closed(positions[1])  # already untracked
+
+        metrics = manager.get_portfolio_metrics()
+        assert metrics.total_positions == 2
+        assert metrics.total_exposure_sol == pytest.approx(0.6)
+
+        manager.update_positions([positions[0], positions[2]])
+        assert manager.get_portfolio_metrics().total_exposure_sol == pytest.approx(0.6)
+
+    def test_position_arrays_grow_and_stay_aligned(self):
+        """Test tracked rows follow the position list past initial capacity."""
+        manager = RiskManager(capital=100.0)
+        positions = [
+            Position(
+                token_address=f"Token{i}123456789012345678901234567890",
+                token_symbol=f"T{i}",
+                buy_time=datetime.now(timezone.utc) - timedelta(hours=i),
+                buy_amount_sol=0.1 * (i + 1),
+                signal_msg_id=i,
+            )
+            for i in range(40)
+        ]
+
+        for position in positions:
+            manager.on_position_opened(position)
+        manager.on_position_closed(positions[5])
+
+        remaining = positions[:5] + positions[6:]
+        count = len(remaining)
+        assert manager.get_portfolio_metrics().total_exposure_sol == pytest.approx(
+            sum(p.buy_amount_sol for p in remaining)
+        )
+        np.testing.assert_allclose(
+            manager._sizes[:count], [p.buy_amount_sol for p in remaining]
+        )
+        np.testing.assert_allclose(
+            manager._holding_hours(), [p.holding_duration for p in remaining], atol=1e-3
+        )
+
+    def test_heat_limit_follows_capital_and_exposure(self):
+        """Test the heat check tracks capital and exposure changes."""
+        manager = RiskManager(capital=10.0)  # 1.0 SOL of headroom at 10% heat
+        position = Position(
+            token_address="TokenAddress123456789012345678901234567890",
+            token_symbol="TEST",
+            buy_time=datetime.now(timezone.utc),
+            buy_amount_sol=0.8,
+            signal_msg_id=1,
+        )
+
+        manager.on_position_opened(position)
+        assert manager.can_open_position(0.3)[0] is False
+        assert manager.can_open_position(0.2)[0] is True
+
+        manager.set_capital(20.0)
+        assert manager.can_open_position(1.0)[0] is True
+
+        manager.set_capital(10.0)
+        manager.on_position_closed(position)
+        assert manager.can_open_position(1.0)[0] is True
+
     def test_should_force_exit_time_limit(self):
         """Test force exit for positions exceeding max hold time."""
         config = RiskConfig(max_hold_time_hours=24)
@@ -523,6 +851,46 @@ class TestRiskManager:
         assert should_exit is True
         assert "hold time" in reason.lower()
 
+    def test_force_exits_batch(self):
+        """Test the batch time scan flags the same positions as should_force_exit."""
+        manager = RiskManager(config=RiskConfig(max_hold_time_hours=24), capital=10.0)
+        positions = [
+            Position(
+                token_address=f"Token{i}123456789012345678901234567890",
+                token_symbol=f"T{i}",
+                buy_time=datetime.now(timezone.utc) - timedelta(hours=hours),
+                buy_amount_sol=0.1,
+                signal_msg_id=i,
+            )
+            for i, hours in enumerate([1, 30, 23, 48])
+        ]
+        manager.update_positions(positions)
+
+        mask = manager.force_exits_batch()
+
+        assert mask.tolist() == [False, True, False, True]
+        assert [manager.should_force_exit(p)[0] for p in positions] == mask.tolist()
+
+    def test_evaluate_open_positions(self, sample_position):
+        """Test batch stop loss evaluation over tracked positions."""
+        manager = RiskManager()
+        healthy = Position(
+            token_address="TokenAddress223456789012345678901234567890",
+            token_symbol="OK",
+            buy_time=datetime.now(timezone.utc),
+            buy_amount_sol=0.1,
+            signal_msg_id=2,
+        )
+        manager.update_positions([sample_position, healthy])
+
+        exits = manager.evaluate_open_positions([0.5, 1.1])
+
+        assert len(exits) == 1
+        position, result = exits[0]
+        assert position is sample_position
+        assert result.stop_type == StopLossType.FIXED_PERCENTAGE
+        assert "fixed stop loss" in result.reason.lower()
+
     def test_evaluate_stop_loss_delegates(self, sample_position):
         """Test evaluate_stop_loss delegates to StopLossManager."""
         manager = RiskManager(capital=10.0)
@@ -552,6 +920,27 @@ class TestRiskManager:
         metrics = manager.get_portfolio_metrics()
         assert metrics.daily_realized_pnl == -0.1
 
+    def test_per_strategy_circuit_breakers(self):
+        """Test one strategy's losses halt only that strategy."""
+        manager = RiskManager(capital=10.0, strategy_ids=["a", "b"])
+
+        # 5% daily limit on each strategy's 5 SOL allocation is 0.25 SOL
+        assert manager.record_trade_result(-0.3, strategy_id="a") is True
+
+        assert manager.circuit_breaker.is_triggered is False
+        can_open, reason = manager.can_open_position(0.1, strategy_id="a")
+        assert can_open is False
+        assert reason.startswith("[a]")
+        assert manager.can_open_position(0.1, strategy_id="b")[0] is True
+        assert manager.can_open_position(0.1)[0] is True
+
+    def test_unknown_strategy_rejected(self):
+        """Test unknown strategy ids raise instead of being ignored."""
+        manager = RiskManager(capital=10.0, strategy_ids=["a"])
+
+        with pytest.raises(ValueError):
+            manager.record_trade_result(-0.1, strategy_id="missing")
+
     def test_get_portfolio_metrics(self):
         """Test getting comprehensive portfolio metrics."""
         manager = RiskManager(capital=10.0)
@@ -584,6 +973,21 @@ class TestRiskManager:
         assert "Capital" in status
         assert "Stop Loss" in status
         assert "Circuit Breaker" in status
+        assert "🔥 Portfolio Heat: 0.0% (max 10%)" in status
+        assert status.endswith("  • Consecutive Losses: 0/5")
+
+    def test_format_status_with_active_breaker(self):
+        """Test status includes the trigger reason and cooldown when active."""
+        manager = RiskManager(capital=10.0)
+        for _ in range(5):
+            manager.record_trade_result(-0.01)
+
+        status = manager.format_status()
+
+        assert "🔴 ACTIVE" in status
+        assert "  • Reason: " in status
+        assert "  • Cooldown until: " in status
+        assert status.endswith(" UTC")
 
 
 # ==================== INTEGRATION TESTS ====================
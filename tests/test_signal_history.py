@@ -2,6 +2,8 @@
 Tests for the signal_history module.
 """
 
+import asyncio
+
 import pytest
 from datetime import datetime, timezone, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -238,6 +240,31 @@ class TestSignalHistory:
             
             assert price_sol is None
             assert price_usd is None
+    
+    @pytest.mark.asyncio
+    async def test_fetch_token_price_cached_within_interval(self, history):
+        """Test repeated lookups in one cache interval make a single request."""
+        mock_response = MagicMock()
+        mock_response.json.return_value = {
+            "pairs": [{
+                "quoteToken": {"symbol": "SOL"},
+                "priceNative": "0.001",
+                "priceUsd": "0.15",
+            }]
+        }
+        mock_client = AsyncMock()
+        mock_client.get.return_value = mock_response
+        history._http_client = mock_client
+        
+        with patch("src.signal_history.time.time", return_value=1_000_000.0):
+            first = await history.fetch_token_price("test_address")
+            second = await history.fetch_token_price("test_address")
+        with patch("src.signal_history.time.time", return_value=1_000_060.0):
+            third = await history.fetch_token_price("test_address")
+        
+        assert first == second == third == (0.001, 0.15)
+        assert mock_client.get.await_count == 2
+        assert len(history._price_cache) == 1
 
 
 class TestSignalHistoryPersistence:
@@ -273,6 +300,64 @@ class TestSignalHistoryPersistence:
         assert loaded is not None
         assert loaded.token_symbol == "TEST"
     
+    def test_saved_records_match_to_dict(self, history):
+        """Test saved records keep the to_dict layout and load back intact."""
+        now = datetime.now(timezone.utc)
+        record = SignalRecord(
+            token_address="addr1",
+            token_symbol="TEST",
+            entry_price_sol=0.001,
+            entry_price_usd=0.15,
+            signal_time=now - timedelta(hours=2),
+            message_id=12345,
+            current_price_sol=0.002,
+            current_price_usd=0.3,
+            last_price_update=now,
+        )
+        history._signals["addr1"] = record
+        
+        history.save()
+        
+        data = json.loads(history._history_file.read_text())
+        assert data["signals"]["addr1"] == record.to_dict()
+        
+        history2 = SignalHistory(history_file=history._history_file)
+        assert history2.load()
+        assert history2.signals["addr1"] == record
+    
+    @pytest.mark.asyncio
+    async def test_add_signal_saves_once_per_burst(self, history):
+        """Test a burst of new signals is written to disk in one background save."""
+        history.fetch_token_price = AsyncMock(return_value=(0.001, 0.15))
+        
+        with patch("src.signal_history.SAVE_DEBOUNCE_SECONDS", 0.01), \
+                patch.object(SignalHistory, "_write_file", wraps=SignalHistory._write_file) as write:
+            for i in range(5):
+                await history.add_signal(f"addr{i}", f"T{i}", message_id=i)
+            assert write.call_count == 0
+            
+            await asyncio.sleep(0.05)
+            assert write.call_count == 1
+            
+            await history.close()
+        
+        history2 = SignalHistory(history_file=history._history_file)
+        assert history2.load()
+        assert set(history2.signals) == {f"addr{i}" for i in range(5)}
+    
+    @pytest.mark.asyncio
+    async def test_close_flushes_pending_save(self, history):
+        """Test close writes changes still waiting on the debounce."""
+        history.fetch_token_price = AsyncMock(return_value=(0.001, 0.15))
+        
+        await history.add_signal("addr1", "TEST", message_id=1)
+        assert not history._history_file.exists()
+        
+        await history.close()
+        
+        assert history._history_file.exists()
+        assert history._saver_task is None
+    
     def test_load_nonexistent_file(self, history):
         """Test loading when file doesn't exist."""
         # Should not raise, just log
@@ -287,3 +372,91 @@ class TestSignalHistoryPersistence:
         # Should not raise
         history.load()
         assert len(history.signals) == 0
+
+
+class TestSignalHistoryStats:
+    """Tests for PnL statistics and performer rankings."""
+    
+    @pytest.fixture
+    def signals(self):
+        """Signals with ties, missing prices and a zero entry price."""
+        now = datetime.now(timezone.utc)
+        prices = [
+            (0.001, 0.003), (0.001, 0.0005), (0.002, None), (0.0, 0.01),
+            (0.001, 0.002), (0.002, 0.004), (0.001, 0.001), (0.004, 0.001),
+        ]
+        return [
+            SignalRecord(
+                token_address=f"addr{i}",
+                token_symbol=f"T{i}",
+                entry_price_sol=entry,
+                entry_price_usd=entry * 150,
+                signal_time=now,
+                message_id=i,
+                current_price_sol=current,
+            )
+            for i, (entry, current) in enumerate(prices)
+        ]
+    
+    def test_calculate_pnl_stats(self, signals):
+        """Test stats cover only signals with both prices."""
+        stats = SignalHistory().calculate_pnl_stats(signals)
+        
+        assert stats["total_signals"] == 8
+        assert stats["signals_with_price"] == 6
+        assert stats["winners"] == 4
+        assert stats["losers"] == 2
+        assert stats["win_rate"] == pytest.approx(4 / 6 * 100)
+        assert stats["avg_multiplier"] == pytest.approx(8.75 / 6)
+        assert stats["best_multiplier"] == pytest.approx(3.0)
+        assert stats["worst_multiplier"] == pytest.approx(0.25)
+        assert stats["total_pnl_percent"] == pytest.approx((8.75 / 6 - 1) * 100)
+    
+    def test_calculate_pnl_stats_without_prices(self, signals):
+        """Test signals lacking prices give zeroed stats."""
+        stats = SignalHistory().calculate_pnl_stats(signals[2:4])
+        
+        assert stats["total_signals"] == 2
+        assert stats["signals_with_price"] == 0
+        assert stats["avg_multiplier"] == 0.0
+    
+    @pytest.mark.parametrize("n", [0, 1, 3, 6, 10])
+    def test_performers_match_sorted_multipliers(self, signals, n):
+        """Test rankings match a stable sort on multiplier, ties in list order."""
+        history = SignalHistory()
+        priced = [s for s in signals if s.multiplier is not None]
+        
+        top = sorted(priced, key=lambda s: s.multiplier, reverse=True)[:n]
+        worst = sorted(priced, key=lambda s: s.multiplier)[:n]
+        
+        assert history.get_top_performers(signals, n) == top
+        assert history.get_worst_performers(signals, n) == worst
+    
+    @pytest.mark.parametrize("n", [1, 5, 20, 21, 40])
+    def test_performers_ties_straddling_cutoff(self, n):
+        """Test signals tied at the cutoff are taken in list order."""
+        now = datetime.now(timezone.utc)
+        multipliers = ([2.0] + [1.0] * 20 + [3.0]) * 3
+        signals = [
+            SignalRecord(
+                token_address=f"addr{i}",
+                token_symbol=f"T{i}",
+                entry_price_sol=0.001,
+                entry_price_usd=0.15,
+                signal_time=now,
+                message_id=i,
+                current_price_sol=0.001 * mult,
+            )
+            for i, mult in enumerate(multipliers)
+        ]
+        history = SignalHistory()
+        
+        def ids(records):
+            return [s.message_id for s in records]
+        
+        top = sorted(signals, key=lambda s: s.multiplier, reverse=True)[:n]
+        worst = sorted(signals, key=lambda s: s.multiplier)[:n]
+        
+        assert ids(history.get_top_performers(signals, n)) == ids(top)
+        assert ids(history.get_worst_performers(signals, n)) == ids(worst)
+
@@ -45,7 +45,8 @@ async def verify_messages():
     # Build DSN and load signals from database
     db_dsn = build_database_dsn()
     signal_db = SignalDatabase(db_dsn)
-    await signal_db.connect()
+    if not await signal_db.connect():
+        raise RuntimeError("Could not connect to or migrate the signal database")
     
     # Get signals from last 30 days
     signals = await signal_db.get_signals_in_period(days=30)